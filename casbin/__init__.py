@@ -17,6 +17,9 @@ from .synced_enforcer import SyncedEnforcer
 from .distributed_enforcer import DistributedEnforcer
 from .fast_enforcer import FastEnforcer
 from .async_enforcer import AsyncEnforcer
+from .lazy_domain_enforcer import LazyDomainEnforcer
+from .process_pool_enforcer import ProcessPoolEnforcer
+from .policy_batch import PolicyBatch
 from . import util
 from .persist import *
 from .effect import *
@@ -293,7 +293,7 @@ class AsyncEnforcer(AsyncManagementEnforcer):
                 else:
                     users = rm.get_users(sub)
                     for user in users:
-                        implicit_rule = rule.copy()
+                        implicit_rule = list(rule)
                         implicit_rule[subject_index] = user
                         permissions[tuple(implicit_rule)] = True
 
@@ -320,7 +320,7 @@ class AsyncEnforcer(AsyncManagementEnforcer):
                         continue
                     users = rm.get_users(sub, domain)
                     for user in users:
-                        implicit_rule = rule.copy()
+                        implicit_rule = list(rule)
                         implicit_rule[subject_index] = user
                         permissions[tuple(implicit_rule)] = True
 
@@ -11,14 +11,43 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
+import asyncio
+import contextlib
 import inspect
+import logging
 
 from casbin.core_enforcer import CoreEnforcer
 from casbin.model import Model, FunctionMap
+from casbin.persist import uses_policy_stream
 from casbin.persist.adapters.asyncio import AsyncFileAdapter, AsyncAdapter
 
 
+class _EnforceBatcher:
+    """_EnforceBatcher collects the enforce_async calls of an event loop into batches."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = []
+        self.in_flight = dict()
+        self.handle = None
+        # the batches running in the executor and the policy changes that wait for them or are being made
+        self.running = 0
+        self.changing = 0
+        self.waiters = []
+
+    async def wait_for(self, predicate):
+        while not predicate():
+            waiter = self.loop.create_future()
+            self.waiters.append(waiter)
+            await waiter
+
+    def wake(self):
+        waiters, self.waiters = self.waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
 class AsyncInternalEnforcer(CoreEnforcer):
     """
     AsyncInternalEnforcer = CoreEnforcer + Async Internal API.
@@ -43,61 +72,241 @@ class AsyncInternalEnforcer(CoreEnforcer):
 
         self._initialize()
 
-    async def load_policy(self):
-        """async reloads the policy from file/database."""
-        need_to_rebuild = False
-        new_model = copy.deepcopy(self.model)
-        new_model.clear_policy()
+        self._enforce_executor = None
+        self._enforce_batch_window = 0.001
+        self._enforce_max_batch_size = 1000
+        self._enforce_batcher = None
+
+    def configure_enforce_async(self, executor=None, batch_window=0.001, max_batch_size=1000):
+        """sets how enforce_async evaluates requests. The requests made within batch_window seconds, up to
+        max_batch_size, are evaluated as one batch in the executor, the default executor of the event loop
+        if it is None. With a batch_window of 0 the requests of the same loop iteration are batched.
+        """
+        self._enforce_executor = executor
+        self._enforce_batch_window = batch_window
+        self._enforce_max_batch_size = max_batch_size
+
+    async def enforce_async(self, *rvals):
+        """decides whether a "subject" can access a "object" with the operation "action" without blocking
+        the event loop, input parameters are usually: (sub, obj, act).
+        Concurrent calls are evaluated together by batch_enforce in the executor set by
+        configure_enforce_async, and identical calls that are in flight share one evaluation.
+        The async policy changes of the enforcer wait for the running batches and the batches are not
+        started while a change is made, so a batch sees the policy before or after a change. Changes made
+        with the synchronous methods, like clear_policy or add_function, are not waited for.
+        """
+        loop = asyncio.get_running_loop()
+        batcher = self._get_enforce_batcher()
 
         try:
-            await self.adapter.load_policy(new_model)
-
-            new_model.sort_policies_by_subject_hierarchy()
-
-            new_model.sort_policies_by_priority()
-
-            new_model.print_policy()
+            future = batcher.in_flight.get(rvals)
+            key = rvals
+        except TypeError:
+            # requests with unhashable values, like ABAC dicts, are not shared
+            future = None
+            key = None
+
+        if future is None:
+            future = loop.create_future()
+            if key is not None:
+                batcher.in_flight[key] = future
+            batcher.pending.append((rvals, key, future))
+            if len(batcher.pending) >= self._enforce_max_batch_size:
+                self._flush_enforce_batch(batcher)
+            elif batcher.handle is None:
+                batcher.handle = loop.call_later(self._enforce_batch_window, self._flush_enforce_batch, batcher)
+
+        # cancelling one caller does not cancel the evaluation shared with the others
+        return await asyncio.shield(future)
+
+    async def batch_enforce_async(self, rvals):
+        """batch_enforce in the executor set by configure_enforce_async, without blocking the event loop."""
+        return await self._run_enforce_batch_in_executor(self.batch_enforce, list(rvals))
+
+    def _get_enforce_batcher(self):
+        loop = asyncio.get_running_loop()
+        batcher = self._enforce_batcher
+        if batcher is None or batcher.loop is not loop:
+            batcher = self._enforce_batcher = _EnforceBatcher(loop)
+        return batcher
+
+    async def _run_enforce_batch_in_executor(self, func, *args):
+        """runs func in the executor once no policy change is being made, the changes wait until it is done."""
+        batcher = self._get_enforce_batcher()
+        await batcher.wait_for(lambda: batcher.changing == 0)
+        batcher.running += 1
+
+        def done(_):
+            batcher.running -= 1
+            batcher.wake()
+
+        future = batcher.loop.run_in_executor(self._enforce_executor, func, *args)
+        future.add_done_callback(done)
+        # a cancelled caller does not end the batch, which keeps running in the executor
+        return await asyncio.shield(future)
+
+    @contextlib.asynccontextmanager
+    async def _changing_policy(self):
+        """waits for the enforce batches running in the executor and keeps new ones from starting until
+        the policy is changed.
+        """
+        batcher = self._get_enforce_batcher()
+        batcher.changing += 1
+        try:
+            await batcher.wait_for(lambda: batcher.running == 0)
+            yield
+        finally:
+            batcher.changing -= 1
+            batcher.wake()
+
+    def _flush_enforce_batch(self, batcher):
+        if batcher.handle is not None:
+            batcher.handle.cancel()
+            batcher.handle = None
+        pending, batcher.pending = batcher.pending, []
+        if pending:
+            batcher.loop.create_task(self._run_enforce_batch(batcher, pending))
+
+    async def _run_enforce_batch(self, batcher, pending):
+        requests = [rvals for rvals, _, _ in pending]
+        try:
+            results = await self._run_enforce_batch_in_executor(self._get_batch_results, requests)
+        except Exception as e:
+            results = [(False, e)] * len(pending)
+
+        for (_, key, future), (ok, result) in zip(pending, results):
+            if key is not None and batcher.in_flight.get(key) is future:
+                del batcher.in_flight[key]
+            if future.done():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
 
-            if self.auto_build_role_links:
-                need_to_rebuild = True
-                for rm in self.rm_map.values():
-                    rm.clear()
+    def _get_batch_results(self, requests):
+        """returns (True, result) or (False, exception) for every request, so a bad request only fails itself."""
+        try:
+            return [(True, result) for result in self.batch_enforce(requests)]
+        except Exception:
+            results = []
+            for request in requests:
+                try:
+                    results.append((True, self.enforce(*request)))
+                except Exception as e:
+                    results.append((False, e))
+            return results
+
+    async def load_policy(self, executor=None, chunk_size=10000):
+        """async reloads the policy from file/database.
+        The policy and the role links are built in a new model and new role managers, which replace the
+        current ones once they are complete, so enforce keeps using the previous policy until then.
+        The building runs in the executor if one is given, otherwise the role links are added in chunks
+        of chunk_size rules that yield to the event loop between them. The rules of adapters with an
+        aiter_policy stream are added with their role links batch by batch while they are read.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be at least 1")
+
+        loop = asyncio.get_running_loop()
+        new_model = self.model.copy_without_policy()
+        new_model.clear_policy()
 
-                new_model.build_role_links(self.rm_map)
+        rm_map = None
+        cond_rm_map = None
+        if self.auto_build_role_links:
+            rm_map = {ptype: self._new_role_manager(rm) for ptype, rm in self.rm_map.items()}
+            cond_rm_map = {ptype: self._new_role_manager(rm) for ptype, rm in self.cond_rm_map.items()}
+
+        if uses_policy_stream(self.adapter, "aiter_policy"):
+            self._start_policy_stream(new_model, rm_map, cond_rm_map)
+            async for batch in self.adapter.aiter_policy(chunk_size):
+                self._add_policy_batch(new_model, batch, rm_map, cond_rm_map)
+            await loop.run_in_executor(executor, self._sort_loaded_policy, new_model)
+        elif executor is not None:
+            await self.adapter.load_policy(new_model)
+            await loop.run_in_executor(executor, self._build_loaded_policy, new_model, rm_map, cond_rm_map)
+        else:
+            await self.adapter.load_policy(new_model)
+            # sorting cannot be split in chunks, the new model is not shared yet so it is sorted in a thread
+            await loop.run_in_executor(None, self._sort_loaded_policy, new_model)
+            if rm_map is not None:
+                await self._build_role_links_in_chunks(new_model, rm_map, cond_rm_map, chunk_size)
 
+        async with self._changing_policy():
             self.model = new_model
-
-        except Exception as e:
-            if self.auto_build_role_links and need_to_rebuild:
-                self.build_role_links()
-
-            raise e
+            if rm_map is not None:
+                self.rm_map = rm_map
+                self.cond_rm_map = cond_rm_map
+
+    @staticmethod
+    def _sort_loaded_policy(model):
+        model.compact_policy()
+        model.sort_policies_by_subject_hierarchy()
+        model.sort_policies_by_priority()
+        model.validate_policy()
+        model.print_policy()
+
+    def _build_loaded_policy(self, model, rm_map, cond_rm_map):
+        self._sort_loaded_policy(model)
+        if rm_map is not None:
+            if len(rm_map) != 0:
+                model.build_role_links(rm_map)
+            if len(cond_rm_map) != 0:
+                model.build_conditional_role_links(cond_rm_map)
+
+    async def _build_role_links_in_chunks(self, model, rm_map, cond_rm_map, chunk_size):
+        if "g" not in model.keys():
+            return
+
+        for ptype, ast in model["g"].items():
+            rm = rm_map.get(ptype)
+            cond_rm = cond_rm_map.get(ptype)
+            if rm:
+                ast.rm = rm
+            if cond_rm:
+                ast.cond_rm = cond_rm
+            for i in range(0, len(ast.policy), chunk_size):
+                rules = ast.policy[i : i + chunk_size]
+                if rm:
+                    ast.add_role_links(rm, rules)
+                if cond_rm:
+                    ast.add_conditional_role_links(cond_rm, rules)
+                await asyncio.sleep(0)
+
+            # formatting the roles is as slow as building them, so it is skipped when it is not logged
+            if rm and logging.getLogger("casbin.role").isEnabledFor(logging.INFO):
+                rm.print_roles()
 
     async def load_filtered_policy(self, filter):
         """async reloads a filtered policy from file/database."""
-        self.model.clear_policy()
+        async with self._changing_policy():
+            self.model.clear_policy()
 
-        if not hasattr(self.adapter, "is_filtered"):
-            raise ValueError("filtered policies are not supported by this adapter")
+            if not hasattr(self.adapter, "is_filtered"):
+                raise ValueError("filtered policies are not supported by this adapter")
 
-        await self.adapter.load_filtered_policy(self.model, filter)
+            await self.adapter.load_filtered_policy(self.model, filter)
 
-        self.model.sort_policies_by_priority()
+            self.model.sort_policies_by_priority()
+            self.model.validate_policy()
 
-        self.init_rm_map()
-        self.model.print_policy()
-        if self.auto_build_role_links:
-            self.build_role_links()
+            self.init_rm_map()
+            self.model.print_policy()
+            if self.auto_build_role_links:
+                self.build_role_links()
 
     async def load_increment_filtered_policy(self, filter):
-        """async append a filtered policy from file/database."""
-        if not hasattr(self.adapter, "is_filtered"):
-            raise ValueError("filtered policies are not supported by this adapter")
-
-        await self.adapter.load_filtered_policy(self.model, filter)
-        self.model.print_policy()
-        if self.auto_build_role_links:
-            self.build_role_links()
+        """async append a filtered policy from file/database.
+        Rules that are already loaded are skipped, returns the added rules as {ptype: rules}.
+        """
+        async with self._changing_policy():
+            if not hasattr(self.adapter, "is_filtered"):
+                raise ValueError("filtered policies are not supported by this adapter")
+
+            scratch = self.model.copy_without_policy()
+            await self.adapter.load_filtered_policy(scratch, filter)
+            return self._add_loaded_rules(self._get_loaded_rules(scratch))
 
     async def save_policy(self):
         if self.is_filtered():
@@ -122,14 +122,14 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
         If the rule already exists, the function returns false and the rule will not be added.
         Otherwise, the function returns true by adding the new rule.
         """
+        async with self._changing_policy():
+            if len(params) == 1 and isinstance(params[0], list):
+                str_slice = params[0]
+                rule_added = await self._add_policy("p", ptype, str_slice)
+            else:
+                rule_added = await self._add_policy("p", ptype, list(params))
 
-        if len(params) == 1 and isinstance(params[0], list):
-            str_slice = params[0]
-            rule_added = await self._add_policy("p", ptype, str_slice)
-        else:
-            rule_added = await self._add_policy("p", ptype, list(params))
-
-        return rule_added
+            return rule_added
 
     async def add_named_policies(self, ptype, rules):
         """async adds authorization rules to the current named policy.
@@ -137,7 +137,8 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
         If the rule already exists, the function returns false for the corresponding rule and the rule will not be added.
         Otherwise, the function returns true for the corresponding by adding the new rule.
         """
-        return await self._add_policies("p", ptype, rules)
+        async with self._changing_policy():
+            return await self._add_policies("p", ptype, rules)
 
     async def update_policy(self, old_rule, new_rule):
         """async updates an authorization rule from the current policy."""
@@ -149,11 +150,13 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
 
     async def update_named_policy(self, ptype, old_rule, new_rule):
         """async updates an authorization rule from the current named policy."""
-        return await self._update_policy("p", ptype, old_rule, new_rule)
+        async with self._changing_policy():
+            return await self._update_policy("p", ptype, old_rule, new_rule)
 
     async def update_named_policies(self, ptype, old_rules, new_rules):
         """async updates authorization rules from the current named policy."""
-        return await self._update_policies("p", ptype, old_rules, new_rules)
+        async with self._changing_policy():
+            return await self._update_policies("p", ptype, old_rules, new_rules)
 
     async def update_filtered_policies(self, new_rules, field_index, *field_values):
         """async update_filtered_policies deletes old rules and adds new rules."""
@@ -161,7 +164,8 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
 
     async def update_filtered_named_policies(self, ptype, new_rules, field_index, *field_values):
         """async update_filtered_named_policies deletes old rules and adds new rules."""
-        return await self._update_filtered_policies("p", ptype, new_rules, field_index, *field_values)
+        async with self._changing_policy():
+            return await self._update_filtered_policies("p", ptype, new_rules, field_index, *field_values)
 
     async def remove_policy(self, *params):
         """async removes an authorization rule from the current policy."""
@@ -177,22 +181,24 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
 
     async def remove_named_policy(self, ptype, *params):
         """async removes an authorization rule from the current named policy."""
+        async with self._changing_policy():
+            if len(params) == 1 and isinstance(params[0], list):
+                str_slice = params[0]
+                rule_removed = await self._remove_policy("p", ptype, str_slice)
+            else:
+                rule_removed = await self._remove_policy("p", ptype, list(params))
 
-        if len(params) == 1 and isinstance(params[0], list):
-            str_slice = params[0]
-            rule_removed = await self._remove_policy("p", ptype, str_slice)
-        else:
-            rule_removed = await self._remove_policy("p", ptype, list(params))
-
-        return rule_removed
+            return rule_removed
 
     async def remove_named_policies(self, ptype, rules):
         """async removes authorization rules from the current named policy."""
-        return await self._remove_policies("p", ptype, rules)
+        async with self._changing_policy():
+            return await self._remove_policies("p", ptype, rules)
 
     async def remove_filtered_named_policy(self, ptype, field_index, *field_values):
         """async removes an authorization rule from the current named policy, field filters can be specified."""
-        return await self._remove_filtered_policy("p", ptype, field_index, *field_values)
+        async with self._changing_policy():
+            return await self._remove_filtered_policy("p", ptype, field_index, *field_values)
 
     def has_grouping_policy(self, *params):
         """determines whether a role inheritance rule exists."""
@@ -230,19 +236,19 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
         If the rule already exists, the function returns false and the rule will not be added.
         Otherwise, the function returns true by adding the new rule.
         """
-
-        rules = []
-        if len(params) == 1 and isinstance(params[0], list):
-            str_slice = params[0]
-            rule_added = await self._add_policy("g", ptype, str_slice)
-            rules.append(str_slice)
-        else:
-            rule_added = await self._add_policy("g", ptype, list(params))
-            rules.append(list(params))
-
-        if self.auto_build_role_links:
-            self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_add, "g", ptype, rules)
-        return rule_added
+        async with self._changing_policy():
+            rules = []
+            if len(params) == 1 and isinstance(params[0], list):
+                str_slice = params[0]
+                rule_added = await self._add_policy("g", ptype, str_slice)
+                rules.append(str_slice)
+            else:
+                rule_added = await self._add_policy("g", ptype, list(params))
+                rules.append(list(params))
+
+            if self.auto_build_role_links:
+                self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_add, "g", ptype, rules)
+            return rule_added
 
     async def add_named_grouping_policies(self, ptype, rules):
         """async adds named role inheritance rules to the current policy.
@@ -250,11 +256,12 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
         If the rule already exists, the function returns false for the corresponding policy rule and the rule will not be added.
         Otherwise, the function returns true for the corresponding policy rule by adding the new rule.
         """
-        rules_added = await self._add_policies("g", ptype, rules)
-        if self.auto_build_role_links:
-            self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_add, "g", ptype, rules)
+        async with self._changing_policy():
+            rules_added = await self._add_policies("g", ptype, rules)
+            if self.auto_build_role_links:
+                self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_add, "g", ptype, rules)
 
-        return rules_added
+            return rules_added
 
     async def remove_grouping_policy(self, *params):
         """async removes a role inheritance rule from the current policy."""
@@ -270,39 +277,41 @@ class AsyncManagementEnforcer(AsyncInternalEnforcer):
 
     async def remove_named_grouping_policy(self, ptype, *params):
         """async removes a role inheritance rule from the current named policy."""
-
-        rules = []
-        if len(params) == 1 and isinstance(params[0], list):
-            str_slice = params[0]
-            rule_removed = await self._remove_policy("g", ptype, str_slice)
-            rules.append(str_slice)
-        else:
-            rule_removed = await self._remove_policy("g", ptype, list(params))
-            rules.append(list(params))
-
-        if self.auto_build_role_links and rule_removed:
-            self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rules)
-        return rule_removed
+        async with self._changing_policy():
+            rules = []
+            if len(params) == 1 and isinstance(params[0], list):
+                str_slice = params[0]
+                rule_removed = await self._remove_policy("g", ptype, str_slice)
+                rules.append(str_slice)
+            else:
+                rule_removed = await self._remove_policy("g", ptype, list(params))
+                rules.append(list(params))
+
+            if self.auto_build_role_links and rule_removed:
+                self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rules)
+            return rule_removed
 
     async def remove_named_grouping_policies(self, ptype, rules):
         """async removes role inheritance rules from the current named policy."""
-        rules_removed = await self._remove_policies("g", ptype, rules)
+        async with self._changing_policy():
+            rules_removed = await self._remove_policies("g", ptype, rules)
 
-        if self.auto_build_role_links and rules_removed:
-            self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rules)
+            if self.auto_build_role_links and rules_removed:
+                self.model.build_incremental_role_links(self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rules)
 
-        return rules_removed
+            return rules_removed
 
     async def remove_filtered_named_grouping_policy(self, ptype, field_index, *field_values):
         """async removes a role inheritance rule from the current named policy, field filters can be specified."""
-        rule_removed = await self._remove_filtered_policy_returns_effects("g", ptype, field_index, *field_values)
-
-        if self.auto_build_role_links and rule_removed:
-            self.model.build_incremental_role_links(
-                self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rule_removed
-            )
-        return rule_removed
-
-    def add_function(self, name, func):
-        """adds a customized function."""
-        self.fm.add_function(name, func)
+        async with self._changing_policy():
+            rule_removed = await self._remove_filtered_policy_returns_effects("g", ptype, field_index, *field_values)
+
+            if self.auto_build_role_links and rule_removed:
+                self.model.build_incremental_role_links(
+                    self.rm_map[ptype], PolicyOp.Policy_remove, "g", ptype, rule_removed
+                )
+            return rule_removed
+
+    def add_function(self, name, func, pure=False):
+        """adds a customized function, the results of a pure function are cached for the calls of one enforce."""
+        self.fm.add_function(name, func, pure)
@@ -14,17 +14,119 @@
 
 import copy
 import logging
+import operator
 import re
-
-from casbin.effect import Effector, get_effector, effect_to_bool
-from casbin.model import Model, FunctionMap
-from casbin.persist import Adapter
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from casbin.effect import (
+    AllowAndDenyEffector,
+    AllowOverrideEffector,
+    DenyOverrideEffector,
+    EffectMask,
+    Effector,
+    PriorityEffector,
+    get_effector,
+    effect_to_bool,
+)
+from casbin.model import Model, FunctionMap, StringInterner
+from casbin.model.policy_columnar import (
+    ColumnarPolicy,
+    get_column_conditions,
+    get_exact_match_columns,
+    get_role_condition,
+    is_columnar_supported,
+)
+from casbin.model.policy_index import ExactMatchIndex
+from casbin.model.policy_op import PolicyOp
+from casbin.model.policy_partition import EffectPartition
+from casbin.persist import Adapter, uses_policy_stream
 from casbin.persist.adapters import FileAdapter
+from casbin.persist.adapters.snapshot_adapter import load_policy_snapshot, save_policy_snapshot
 from casbin.rbac import default_role_manager
+from casbin.rbac.default_role_manager import DomainManager, RoleManager
 from casbin.util import generate_g_function, SimpleEval, util, generate_conditional_g_function
 from casbin.util.log import configure_logging, disabled_logging
 
 
+# the effects that make the default effectors decide before all rules are matched
+_DECISIVE_EFFECTS = {
+    AllowOverrideEffector: 1 << Effector.ALLOW,
+    DenyOverrideEffector: 1 << Effector.DENY,
+    AllowAndDenyEffector: 1 << Effector.DENY,
+    PriorityEffector: (1 << Effector.ALLOW) | (1 << Effector.DENY),
+}
+
+
+class _FunctionMemo:
+    """_FunctionMemo caches the results of the functions of the matcher for the calls of one enforce or batch,
+    it counts the calls answered from the cache as hits and the computed ones as misses.
+    """
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def memoize(self, func):
+        """returns a function that caches the results of func for hashable arguments."""
+        cache = dict()
+
+        def memoized(*args):
+            try:
+                result = cache[args]
+            except KeyError:
+                self.misses += 1
+                result = cache[args] = func(*args)
+                return result
+            except TypeError:
+                return func(*args)
+            self.hits += 1
+            return result
+
+        return memoized
+
+
+class _EnforcePlan:
+    """_EnforcePlan is the state of an enforce call that does not depend on the request values."""
+
+    __slots__ = (
+        "rtype",
+        "ptype",
+        "etype",
+        "mtype",
+        "functions",
+        "r_tokens",
+        "p_tokens",
+        "exp_string",
+        "exp_has_eval",
+        "expression",
+        "exact_columns",
+        "domain_columns",
+        "subject_columns",
+        "role_names",
+    )
+
+    def __init__(self):
+        self.rtype = "r"
+        self.ptype = "p"
+        self.etype = "e"
+        self.mtype = "m"
+        self.functions = None
+        self.r_tokens = []
+        self.p_tokens = []
+        self.exp_string = ""
+        self.exp_has_eval = False
+        self.expression = None
+        self.exact_columns = None
+        self.domain_columns = None
+        self.subject_columns = None
+        # (subject, domain) -> the names g(subject, name, domain) is true for, shared by the requests of the plan
+        self.role_names = dict()
+
+
 class EnforceContext:
     """
     EnforceContext is used as the first element of the parameter "rvals" in method "enforce"
@@ -114,6 +216,20 @@ class CoreEnforcer:
         self.auto_save = True
         self.auto_build_role_links = True
         self.auto_notify_watcher = True
+        # ptype -> ColumnarPolicy, None when the columnar prefilter is disabled
+        self._columnar = None
+        # ptype -> EffectPartition
+        self._effect_partitions = dict()
+        self._memo_stats = {"hits": 0, "misses": 0}
+        self._memo_stats_lock = threading.Lock()
+        # ptype -> ExactMatchIndex, None when the lookup of exact match matchers is disabled
+        self._exact_indexes = dict()
+        # ptype -> ExactMatchIndex of the domain field, None when the domain partitions are disabled
+        self._domain_partitions = dict()
+        # ptype -> ExactMatchIndex of the subject field, None when the subject index is disabled
+        self._subject_indexes = dict()
+        # whether load_policy streams the rules of adapters with an iter_policy stream
+        self._policy_stream = False
 
         self.init_rm_map()
 
@@ -217,21 +333,109 @@ class CoreEnforcer:
                         self.cond_rm_map[ptype] = assertion.cond_rm
 
     def load_policy(self):
-        """reloads the policy from file/database."""
+        """reloads the policy from file/database.
+        With enable_policy_stream, the rules of adapters with an iter_policy stream are added to the model and new
+        role managers batch by batch, which replace the current ones once the policy is loaded.
+        """
+        if self._policy_stream and uses_policy_stream(self.adapter):
+            self._reload_policy(self._load_policy_stream, streamed=True)
+        else:
+            self._reload_policy(self.adapter.load_policy)
+
+    def _load_policy_stream(self, model, rm_map, cond_rm_map):
+        self._start_policy_stream(model, rm_map, cond_rm_map)
+        for batch in self.adapter.iter_policy():
+            self._add_policy_batch(model, batch, rm_map, cond_rm_map)
+
+    @staticmethod
+    def _new_role_manager(rm):
+        """returns an empty role manager with the settings of rm."""
+        rm = copy.copy(rm)
+        rm.clear()
+        return rm
+
+    @staticmethod
+    def _start_policy_stream(model, rm_map, cond_rm_map):
+        """makes the grouping assertions of the model use the role managers the stream adds links to."""
+        if rm_map is None or "g" not in model.keys():
+            return
+        for ptype, ast in model["g"].items():
+            if ptype in rm_map:
+                ast.rm = rm_map[ptype]
+            if ptype in cond_rm_map:
+                ast.cond_rm = cond_rm_map[ptype]
+
+    @staticmethod
+    def _add_policy_batch(model, batch, rm_map=None, cond_rm_map=None):
+        """adds a batch of (ptype, rule) tuples streamed by an adapter to the model, and the links of
+        its grouping rules to the role managers if they are given. Rules of unknown ptypes are skipped.
+        """
+        sections = model.model
+        links = dict()
+        for ptype, rule in batch:
+            assertions = sections.get(ptype[:1])
+            assertion = assertions.get(ptype) if assertions is not None else None
+            if assertion is None:
+                continue
+
+            rule = assertion.to_row(rule)
+            assertion.policy.append(rule)
+            if rm_map is not None and ptype[:1] == "g":
+                links.setdefault(ptype, []).append(rule)
+
+        for ptype, rules in links.items():
+            assertion = sections["g"][ptype]
+            if ptype in rm_map:
+                assertion.add_role_links(rm_map[ptype], rules)
+            if ptype in cond_rm_map:
+                assertion.add_conditional_role_links(cond_rm_map[ptype], rules)
+
+    def save_snapshot(self, path):
+        """saves the current policy as a binary snapshot, see SnapshotAdapter."""
+        save_policy_snapshot(self.model, path)
+
+    def load_snapshot(self, path):
+        """replaces the current policy with a binary snapshot written by save_snapshot.
+        The rules are restored in their saved order, so they are not sorted again.
+        """
+        self._reload_policy(lambda model: load_policy_snapshot(model, path), presorted=True)
+
+    def _reload_policy(self, loader, presorted=False, streamed=False):
         need_to_rebuild = False
-        new_model = copy.deepcopy(self.model)
+        # only the policies are replaced, copying the current ones and their role managers is not needed
+        new_model = self.model.copy_without_policy()
         new_model.clear_policy()
 
-        try:
-            self.adapter.load_policy(new_model)
+        rm_map = None
+        cond_rm_map = None
+        if streamed and self.auto_build_role_links:
+            # the loader adds the role links to new role managers while it reads the rules,
+            # they replace the current ones with the model
+            rm_map = {ptype: self._new_role_manager(rm) for ptype, rm in self.rm_map.items()}
+            cond_rm_map = {ptype: self._new_role_manager(rm) for ptype, rm in self.cond_rm_map.items()}
 
-            new_model.sort_policies_by_subject_hierarchy()
+        try:
+            if streamed:
+                loader(new_model, rm_map, cond_rm_map)
+            else:
+                loader(new_model)
+            new_model.compact_policy()
+
+            if presorted:
+                new_model.init_priority_index()
+                for assertion in new_model["p"].values():
+                    if assertion.priority_index != -1:
+                        for i, policy in enumerate(assertion.policy):
+                            assertion.policy_map[",".join(policy)] = i
+            else:
+                new_model.sort_policies_by_subject_hierarchy()
 
-            new_model.sort_policies_by_priority()
+                new_model.sort_policies_by_priority()
 
+            new_model.validate_policy()
             new_model.print_policy()
 
-            if self.auto_build_role_links:
+            if self.auto_build_role_links and not streamed:
                 need_to_rebuild = True
                 for rm in self.rm_map.values():
                     rm.clear()
@@ -244,6 +448,9 @@ class CoreEnforcer:
                     new_model.build_conditional_role_links(self.cond_rm_map)
 
             self.model = new_model
+            if rm_map is not None:
+                self.rm_map = rm_map
+                self.cond_rm_map = cond_rm_map
 
         except Exception as e:
             if self.auto_build_role_links and need_to_rebuild:
@@ -259,8 +466,10 @@ class CoreEnforcer:
             raise ValueError("filtered policies are not supported by this adapter")
 
         self.adapter.load_filtered_policy(self.model, filter)
+        self.model.compact_policy()
 
         self.model.sort_policies_by_priority()
+        self.model.validate_policy()
 
         self.init_rm_map()
         self.model.print_policy()
@@ -268,14 +477,51 @@ class CoreEnforcer:
             self.build_role_links()
 
     def load_increment_filtered_policy(self, filter):
-        """LoadIncrementalFilteredPolicy append a filtered policy from file/database."""
+        """LoadIncrementalFilteredPolicy append a filtered policy from file/database.
+        Rules that are already loaded are skipped, returns the added rules as {ptype: rules}.
+        """
+        return self._add_loaded_rules(self._load_filtered_rules(filter))
+
+    def _load_filtered_rules(self, filter):
+        """loads the rules that match the filter without changing the model, returns {(sec, ptype): rules}."""
         if not hasattr(self.adapter, "is_filtered"):
             raise ValueError("filtered policies are not supported by this adapter")
 
-        self.adapter.load_filtered_policy(self.model, filter)
+        scratch = self.model.copy_without_policy()
+        self.adapter.load_filtered_policy(scratch, filter)
+        return self._get_loaded_rules(scratch)
+
+    @staticmethod
+    def _get_loaded_rules(model):
+        rules = dict()
+        for sec in ["p", "g"]:
+            if sec not in model.keys():
+                continue
+            for ptype, ast in model[sec].items():
+                if ast.policy:
+                    rules[(sec, ptype)] = ast.policy
+        return rules
+
+    def _add_loaded_rules(self, rules):
+        """adds the loaded rules that are not in the model yet together with their role links."""
+        added = dict()
+        for (sec, ptype), new_rules in rules.items():
+            effected = self.model.add_policies_with_effected(sec, ptype, new_rules)
+            if effected:
+                added[ptype] = effected
+
         self.model.print_policy()
         if self.auto_build_role_links:
-            self.build_role_links()
+            for ptype, effected in added.items():
+                if ptype[0] == "g":
+                    self._build_incremental_role_links(PolicyOp.Policy_add, ptype, effected)
+        return added
+
+    def _build_incremental_role_links(self, op, ptype, rules):
+        if ptype in self.rm_map:
+            self.model.build_incremental_role_links(self.rm_map[ptype], op, "g", ptype, rules)
+        if ptype in self.cond_rm_map:
+            self.model.build_incremental_conditional_role_links(self.cond_rm_map[ptype], op, "g", ptype, rules)
 
     def is_filtered(self):
         """returns true if the loaded policy has been filtered."""
@@ -301,6 +547,209 @@ class CoreEnforcer:
 
         self.enabled = enabled
 
+    def enable_compact_policy(self, enabled=True):
+        """changes whether the rules are stored as immutable rows of interned strings,
+        which share the memory of repeated values like subjects, domains and actions.
+        """
+        self.model.set_interner(StringInterner() if enabled else None)
+
+    def enable_columnar_policy(self, enabled=True):
+        """changes whether enforce selects the candidate rules with vectorised comparisons before evaluating the matcher.
+        The comparisons are the top level conjuncts of the matcher like r.obj == p.obj, the other parts
+        of the matcher are only evaluated for the rules that satisfy them. It requires numpy.
+        """
+        if enabled and not is_columnar_supported():
+            raise ImportError("the columnar policy store requires numpy, install pycasbin[columnar]")
+        self._columnar = dict() if enabled else None
+
+    def enable_exact_match_index(self, enabled=True):
+        """changes whether enforce answers matchers that only compare every policy field with a request field
+        using ==, like r.sub == p.sub && r.obj == p.obj && r.act == p.act, with a hash lookup of the request
+        values instead of evaluating the matcher for every rule. It is enabled by default.
+        """
+        self._exact_indexes = dict() if enabled else None
+
+    def enable_domain_partitions(self, enabled=True):
+        """changes whether enforce only evaluates the rules of the domain of the request for matchers
+        with a r.dom == p.dom conjunct, like the RBAC with domains model. The rules are grouped by domain
+        when the policy changes. It is enabled by default.
+        """
+        self._domain_partitions = dict() if enabled else None
+
+    def enable_subject_index(self, enabled=True):
+        """changes whether enforce only evaluates the rules of the subject of the request and its implicit roles
+        for matchers with a g(r.sub, p.sub) or g(r.sub, p.sub, r.dom) conjunct, like the RBAC model. The roles are
+        found once per request with the role manager and the rules are looked up by subject and by the other fields
+        compared with ==. It only applies to the default role managers without matching functions and is enabled
+        by default.
+        """
+        self._subject_indexes = dict() if enabled else None
+
+    def _get_subject_columns(self, plan):
+        """returns the role type, the (p token index, r token index) columns of the subject and of the fields
+        compared with == and the r token index of the domain of the g() conjunct of the matcher, or None.
+        """
+        if "g" not in self.model.keys() or len(self.cond_rm_map) != 0:
+            return None
+        r_tokens = tuple(plan.r_tokens)
+        p_tokens = tuple(plan.p_tokens)
+        condition = get_role_condition(plan.exp_string, r_tokens, p_tokens, tuple(self.model["g"].keys()))
+        if condition is None:
+            return None
+        role_type, r_token, p_token, domain = condition
+        # other role managers may not find the roles of a subject like their has_link does
+        if type(self.model["g"][role_type].rm) not in (RoleManager, DomainManager):
+            return None
+
+        columns = [(p_tokens.index(p_token), r_tokens.index(r_token))]
+        for op, token, r_column_token, _ in get_column_conditions(plan.exp_string, r_tokens, p_tokens):
+            if op == "==" and r_column_token is not None:
+                columns.append((p_tokens.index(token), r_tokens.index(r_column_token)))
+        return role_type, tuple(columns), None if domain is None else r_tokens.index(domain)
+
+    @staticmethod
+    def _get_role_names(rm, name, domain):
+        """returns the names g(name, other) is true for in the domain, the name and its implicit roles
+        up to the max hierarchy level of the role manager, like rm.has_link finds them.
+        """
+        if rm.max_hierarchy_level <= 0:
+            return set()
+        names = {name}
+        current = [name]
+        for _ in range(rm.max_hierarchy_level - 1):
+            roles = []
+            for user in current:
+                for role in rm.get_roles(user, *domain):
+                    if role not in names:
+                        names.add(role)
+                        roles.append(role)
+            if not roles:
+                break
+            current = roles
+        return names
+
+    def _get_subject_rows(self, plan, rvals):
+        """returns the indexes of the rules of the subject of the request and its roles, in policy order,
+        or None if the rules cannot be looked up.
+        """
+        role_type, columns, domain_column = plan.subject_columns
+        rm = self.model["g"][role_type].rm
+        index = self._get_index(self._subject_indexes, plan.ptype, tuple(p_column for p_column, _ in columns))
+        if index is None or type(rm) not in (RoleManager, DomainManager):
+            return None
+        # the roles matching a pattern role are only linked when has_link is asked about them
+        if rm.matching_func not in (None, operator.eq) or rm.domain_matching_func is not None:
+            return None
+
+        try:
+            name = rvals[columns[0][1]]
+            domain = () if domain_column is None else (str(rvals[domain_column]),)
+            key = (name,) + domain
+            names = plan.role_names.get(key)
+            if names is None:
+                names = plan.role_names[key] = self._get_role_names(rm, name, domain)
+
+            values = tuple([rvals[r_column] for _, r_column in columns[1:]])
+            rows = []
+            for role in names:
+                rows.extend(index.get((role,) + values))
+        except TypeError:
+            # unhashable request values, like ABAC dicts, are compared by the matcher
+            return None
+        rows.sort()
+        return rows
+
+    def _get_domain_columns(self, plan):
+        """returns the (p token index, r token index) of the r.dom == p.dom conjunct of the matcher, or None."""
+        p_index = self.model.get_field_index(plan.ptype, "dom")
+        if p_index == -1:
+            return None
+        p_token = plan.p_tokens[p_index]
+        for op, token, r_token, _ in get_column_conditions(plan.exp_string, tuple(plan.r_tokens), tuple(plan.p_tokens)):
+            if op == "==" and token == p_token and r_token is not None:
+                return ((p_index, plan.r_tokens.index(r_token)),)
+        return None
+
+    def _get_index(self, indexes, ptype, p_columns):
+        """returns the ExactMatchIndex of the ptype in indexes for the p token index columns,
+        built again if the policy changed, or None if the rules cannot be indexed.
+        """
+        assertion = self.model["p"][ptype]
+        index = indexes.get(ptype)
+        if index is None or not index.is_current(assertion, p_columns):
+            if not ExactMatchIndex.supports(assertion):
+                return None
+            index = ExactMatchIndex(assertion, p_columns)
+            indexes[ptype] = index
+        return index
+
+    def _get_indexed_rows(self, indexes, ptype, columns, rvals):
+        """returns the indexes of the rules with the request values in the (p token index, r token index) columns,
+        looked up in the ExactMatchIndex of the ptype in indexes, or None if the rules cannot be looked up.
+        """
+        index = self._get_index(indexes, ptype, tuple(p_column for p_column, _ in columns))
+        if index is None:
+            return None
+
+        try:
+            return index.get(tuple([rvals[r_column] for _, r_column in columns]))
+        except TypeError:
+            # unhashable request values, like ABAC dicts, are compared by the matcher
+            return None
+
+    def _get_candidate_rows(self, ptype, exp_string, r_tokens, r_parameters):
+        """returns the indexes of the rules that can match the request, or None if all rules can."""
+        assertion = self.model["p"][ptype]
+        conditions = get_column_conditions(exp_string, tuple(r_tokens), tuple(assertion.tokens))
+        if not conditions:
+            return None
+
+        columnar = self._columnar.get(ptype)
+        if columnar is None or not columnar.is_current(assertion):
+            if not ColumnarPolicy.supports(assertion):
+                return None
+            columnar = ColumnarPolicy(assertion)
+            self._columnar[ptype] = columnar
+        return columnar.get_candidates(conditions, r_parameters)
+
+    def get_memory_report(self):
+        """returns an estimate of the memory used by the loaded rules, in bytes."""
+        rules = 0
+        fields = 0
+        row_bytes = 0
+        strings = dict()
+        interner = None
+        for sec in ["p", "g"]:
+            if sec not in self.model.keys():
+                continue
+            for ast in self.model[sec].values():
+                interner = interner or ast.interner
+                row_bytes += sys.getsizeof(ast.policy)
+                for rule in ast.policy:
+                    rules += 1
+                    fields += len(rule)
+                    row_bytes += sys.getsizeof(rule)
+                    for value in rule:
+                        strings[id(value)] = value
+
+        return {
+            "compact": interner is not None,
+            "rules": rules,
+            "fields": fields,
+            "distinct_strings": len(strings),
+            "row_bytes": row_bytes,
+            "string_bytes": sum(sys.getsizeof(value) for value in strings.values()),
+            "interned_strings": len(interner) if interner is not None else 0,
+        }
+
+    def enable_policy_stream(self, enabled=True):
+        """changes whether load_policy adds the rules of adapters with an iter_policy stream to the model and the
+        role links to new role managers while the rules are read. The new role managers are copies of the current
+        ones, which they replace once the policy is loaded, so a role manager got before, like with
+        get_role_manager, is not used by the enforcer anymore. It is disabled by default.
+        """
+        self._policy_stream = enabled
+
     def enable_auto_save(self, auto_save):
         """controls whether to save a policy rule automatically to the adapter when it is added or removed."""
         self.auto_save = auto_save
@@ -383,7 +832,11 @@ class CoreEnforcer:
         """decides whether a "subject" can access a "object" with the operation "action",
         input parameters are usually: (sub, obj, act).
         """
-        result, _ = self.enforce_ex(*rvals)
+        if type(self).enforce_ex is not CoreEnforcer.enforce_ex:
+            result, _ = self.enforce_ex(*rvals)
+            return result
+
+        result, _ = self._enforce_ex(rvals, explain=False)
         return result
 
     def enforce_ex(self, *rvals):
@@ -391,32 +844,92 @@ class CoreEnforcer:
         input parameters are usually: (sub, obj, act).
         return judge result with reason
         """
+        return self._enforce_ex(rvals)
 
-        rtype = "r"
-        ptype = "p"
-        etype = "e"
-        mtype = "m"
-
+    def _enforce_ex(self, rvals, explain=True):
         if not self.enabled:
             return [True, []]
 
-        functions = self.fm.get_functions()
+        enforce_context = None
+        if len(rvals) != 0 and isinstance(rvals[0], EnforceContext):
+            enforce_context = rvals[0]
+            rvals = rvals[1:]
+
+        memo = _FunctionMemo()
+        plan = self._prepare_enforce(self._get_enforce_functions(memo), enforce_context)
+        try:
+            return self._evaluate_enforce(plan, rvals, explain=explain)
+        finally:
+            self._add_memo_stats(memo)
+
+    def _get_enforce_functions(self, memo=None):
+        """returns the functions available to the matcher, including the g functions of the role managers.
+        It returns a new dict, so concurrent enforce calls do not change shared state. With a memo, the
+        results of the g functions and of the pure functions are cached in it, the conditional g functions
+        and the other functions, which may depend on the time, are always called.
+        """
+        functions = dict(self.fm.get_functions())
+        if memo is not None:
+            for name in self.fm.get_pure_functions():
+                if name in functions:
+                    functions[name] = memo.memoize(functions[name])
 
         if "g" in self.model.keys():
             for key, ast in self.model["g"].items():
                 if len(self.rm_map) != 0:
                     functions[key] = generate_g_function(ast.rm)
+                    if memo is not None:
+                        functions[key] = memo.memoize(functions[key])
                 if len(self.cond_rm_map) != 0:
                     functions[key] = generate_conditional_g_function(ast.cond_rm)
 
-        if len(rvals) != 0:
-            if isinstance(rvals[0], EnforceContext):
-                enforce_context = rvals[0]
-                rtype = enforce_context.rtype
-                ptype = enforce_context.ptype
-                etype = enforce_context.etype
-                mtype = enforce_context.mtype
-                rvals = rvals[1:]
+        return functions
+
+    def _add_memo_stats(self, memo):
+        if memo.hits or memo.misses:
+            with self._memo_stats_lock:
+                self._memo_stats["hits"] += memo.hits
+                self._memo_stats["misses"] += memo.misses
+
+    def get_memo_stats(self):
+        """returns the number of calls of the g functions and of the pure functions answered from the cache
+        of their enforce call as hits, and of the computed ones as misses.
+        """
+        with self._memo_stats_lock:
+            return dict(self._memo_stats)
+
+    def reset_memo_stats(self):
+        """sets the memo counters to zero."""
+        with self._memo_stats_lock:
+            self._memo_stats = {"hits": 0, "misses": 0}
+
+    def set_link_cache_size(self, size):
+        """sets the number of has_link and get_roles results the role managers keep between enforce calls,
+        0 disables their cache. Role managers without a link cache are left unchanged.
+        """
+        for rm in list(self.rm_map.values()) + list(self.cond_rm_map.values()):
+            if hasattr(rm, "set_link_cache_size"):
+                rm.set_link_cache_size(size)
+
+    def get_link_cache_stats(self):
+        """returns the size, the number of entries, the hits, the misses and the hit ratio of the link cache
+        of the role manager of every ptype, conditional role managers included.
+        """
+        stats = dict()
+        for rm_map in [self.rm_map, self.cond_rm_map]:
+            for ptype, rm in rm_map.items():
+                if hasattr(rm, "get_link_cache_stats"):
+                    stats[ptype] = rm.get_link_cache_stats()
+        return stats
+
+    def _prepare_enforce(self, functions, enforce_context=None):
+        """does the part of enforce that does not depend on the request values, so it can be shared by requests."""
+        plan = _EnforcePlan()
+        if enforce_context is not None:
+            plan.rtype = enforce_context.rtype
+            plan.ptype = enforce_context.ptype
+            plan.etype = enforce_context.etype
+            plan.mtype = enforce_context.mtype
 
         if "m" not in self.model.keys():
             raise RuntimeError("model is undefined")
@@ -424,69 +937,140 @@ class CoreEnforcer:
         if "m" not in self.model["m"].keys():
             raise RuntimeError("model is undefined")
 
-        r_tokens = self.model["r"][rtype].tokens
-        p_tokens = self.model["p"][ptype].tokens
+        plan.functions = functions
+        plan.r_tokens = self.model["r"][plan.rtype].tokens
+        plan.p_tokens = self.model["p"][plan.ptype].tokens
+
+        plan.exp_string = self.model["m"][plan.mtype].value
+        plan.exp_has_eval = util.has_eval(plan.exp_string)
+        if not plan.exp_has_eval:
+            plan.expression = self._get_expression(plan.exp_string, functions)
+            plan.exact_columns = get_exact_match_columns(plan.exp_string, tuple(plan.r_tokens), tuple(plan.p_tokens))
+        if plan.exact_columns is None:
+            plan.subject_columns = self._get_subject_columns(plan)
+            plan.domain_columns = self._get_domain_columns(plan)
+
+        return plan
+
+    def _evaluate_enforce(self, plan, rvals, get_candidates=None, explain=True):
+        """evaluates the matcher of the plan for one request, get_candidates(r_parameters) may return
+        the indexes of the only rules that can match the request. Without explain, the rules that
+        cannot change the result are not matched and the returned rule may be empty.
+        """
+        ptype = plan.ptype
+        r_tokens = plan.r_tokens
+        p_tokens = plan.p_tokens
+        exp_string = plan.exp_string
+        exp_has_eval = plan.exp_has_eval
+        expression = plan.expression
+        functions = plan.functions
 
         if len(r_tokens) != len(rvals):
             raise RuntimeError("invalid request size")
 
-        exp_string = self.model["m"][mtype].value
-        exp_has_eval = util.has_eval(exp_string)
-        if not exp_has_eval:
-            expression = self._get_expression(exp_string, functions)
-
-        policy_effects = set()
+        # the bits 1 << effect of the effects of the matched rules
+        policy_effects = 0
 
         r_parameters = dict(zip(r_tokens, rvals))
 
-        policy_len = len(self.model["p"][ptype].policy)
+        assertion = self.model["p"][ptype]
+        policy = assertion.policy
+        policy_len = len(policy)
+
+        candidates = None
+        # the candidates of an exact match lookup match the request without evaluating the matcher
+        exact = False
+        if policy_len != 0 and plan.exact_columns is not None and self._exact_indexes is not None:
+            candidates = self._get_indexed_rows(self._exact_indexes, ptype, plan.exact_columns, rvals)
+            exact = candidates is not None
+        if policy_len != 0 and not exact and plan.subject_columns is not None and self._subject_indexes is not None:
+            candidates = self._get_subject_rows(plan, rvals)
+        if policy_len != 0 and not exact and candidates is None:
+            if get_candidates is not None:
+                candidates = get_candidates(r_parameters)
+            elif self._columnar is not None:
+                candidates = self._get_candidate_rows(ptype, exp_string, r_tokens, r_parameters)
+            elif plan.domain_columns is not None and self._domain_partitions is not None:
+                candidates = self._get_indexed_rows(self._domain_partitions, ptype, plan.domain_columns, rvals)
 
         explain_index = -1
         if not 0 == policy_len:
-            for i, pvals in enumerate(self.model["p"][ptype].policy):
-                if len(p_tokens) != len(pvals):
+            # the rules are checked when they are loaded or added, so only an invalid policy is checked here
+            check_size = not assertion.is_policy_valid()
+            p_eft_key = ptype + "_eft"
+            eft_index = p_tokens.index(p_eft_key) if p_eft_key in p_tokens else -1
+
+            def match(i):
+                """returns the effect of rule i if it matches the request, None otherwise."""
+                pvals = policy[i]
+                if exact:
+                    return effect_of(pvals)
+                if check_size and len(p_tokens) != len(pvals):
                     raise RuntimeError("invalid policy size")
 
                 p_parameters = dict(zip(p_tokens, pvals))
                 parameters = dict(r_parameters, **p_parameters)
 
+                rule_expression = expression
                 if exp_has_eval:
                     rule_names = util.get_eval_value(exp_string)
                     rules = [util.escape_assertion(p_parameters[rule_name]) for rule_name in rule_names]
                     exp_with_rule = util.replace_eval(exp_string, rules)
-                    expression = self._get_expression(exp_with_rule, functions)
+                    rule_expression = self._get_expression(exp_with_rule, functions)
 
-                result = expression.eval(parameters)
+                result = rule_expression.eval(parameters)
 
                 if isinstance(result, bool):
                     if not result:
-                        policy_effects.add(Effector.INDETERMINATE)
-                        continue
+                        return None
                 elif isinstance(result, float):
                     if 0 == result:
-                        policy_effects.add(Effector.INDETERMINATE)
-                        continue
+                        return None
                 else:
                     raise RuntimeError("matcher result should be bool, int or float")
 
-                p_eft_key = ptype + "_eft"
-                if p_eft_key in parameters.keys():
-                    eft = parameters[p_eft_key]
-                    if "allow" == eft:
-                        policy_effects.add(Effector.ALLOW)
-                    elif "deny" == eft:
-                        policy_effects.add(Effector.DENY)
-                    else:
-                        policy_effects.add(Effector.INDETERMINATE)
-                else:
-                    policy_effects.add(Effector.ALLOW)
+                return effect_of(pvals)
+
+            def effect_of(pvals):
+                if eft_index == -1:
+                    return Effector.ALLOW
+                eft = pvals[eft_index]
+                if "allow" == eft:
+                    return Effector.ALLOW
+                elif "deny" == eft:
+                    return Effector.DENY
+                return Effector.INDETERMINATE
+
+            eft_type = type(self.eft)
+            if (
+                eft_index != -1
+                and not check_size
+                and eft_type in _DECISIVE_EFFECTS
+                and eft_type is not PriorityEffector
+                and EffectPartition.supports(assertion)
+            ):
+                policy_effects, explain_index = self._match_by_effect(
+                    ptype, assertion, eft_index, candidates, match, explain
+                )
+            else:
+                decisive_effects = _DECISIVE_EFFECTS.get(eft_type)
+                rows = range(policy_len) if candidates is None else candidates
+                for i in rows:
+                    effect = match(i)
+                    if effect is None:
+                        policy_effects |= 1 << Effector.INDETERMINATE
+                        continue
+                    policy_effects |= 1 << effect
 
-                # Update explain_index for any matching policy before checking early break condition
-                # to ensure explanations are captured for allow rules in deny models
-                explain_index = i
+                    # Update explain_index for any matching policy before checking early break condition
+                    # to ensure explanations are captured for allow rules in deny models
+                    explain_index = i
 
-                if self.eft.intermediate_effect(policy_effects) != Effector.INDETERMINATE:
-                    break
+                    if decisive_effects is not None:
+                        if policy_effects & decisive_effects:
+                            break
+                    elif self.eft.intermediate_effect(EffectMask(policy_effects)) != Effector.INDETERMINATE:
+                        break
 
         else:
             if exp_has_eval:
@@ -500,11 +1084,11 @@ class CoreEnforcer:
             result = expression.eval(parameters)
 
             if result:
-                policy_effects.add(Effector.ALLOW)
+                policy_effects |= 1 << Effector.ALLOW
             else:
-                policy_effects.add(Effector.INDETERMINATE)
+                policy_effects |= 1 << Effector.INDETERMINATE
 
-        final_effect = self.eft.final_effect(policy_effects)
+        final_effect = self.eft.final_effect(EffectMask(policy_effects))
         result = effect_to_bool(final_effect)
 
         # Log request.
@@ -523,18 +1107,167 @@ class CoreEnforcer:
 
         explain_rule = []
         if explain_index != -1 and explain_index < policy_len:
-            explain_rule = self.model["p"][ptype].policy[explain_index]
+            explain_rule = policy[explain_index]
 
         return result, explain_rule
 
-    def batch_enforce(self, rvals):
-        """batch_enforce enforce in batches"""
+    def _match_by_effect(self, ptype, assertion, eft_index, candidates, match, explain):
+        """matches first the rules with the effect that makes the effector decide, deny rules for deny override
+        and allow rules for allow override, returns the bits of the matched effects and the explained rule index.
+        """
+        if type(self.eft) is AllowOverrideEffector:
+            effect = Effector.ALLOW
+        else:
+            effect = Effector.DENY
+
+        partition = self._effect_partitions.get(ptype)
+        if partition is None or not partition.is_current(assertion, eft_index):
+            partition = EffectPartition(assertion, eft_index)
+            self._effect_partitions[ptype] = partition
+        rows, other_rows = partition.split(effect, candidates)
+
+        for i in rows:
+            if match(i) is not None:
+                return 1 << effect, i
+
+        # without a decisive rule the result is known, except for allow and deny which needs an allow rule,
+        # the explained rule is the last matching one
+        needs_allow = type(self.eft) is AllowAndDenyEffector
+        if not explain and not needs_allow:
+            return 0, -1
+
+        effects = 0
+        explain_index = -1
+        for i in reversed(other_rows):
+            matched = match(i)
+            if matched is None:
+                continue
+            effects |= 1 << matched
+            if explain_index == -1:
+                explain_index = i
+            if not needs_allow or matched == Effector.ALLOW:
+                break
+        return effects, explain_index
+
+    def batch_enforce(self, rvals, workers=None):
+        """batch_enforce enforce in batches.
+        The matcher is compiled once for the batch, identical requests are evaluated once, the results of
+        g() and of the pure functions are shared by the requests and every request is only matched against the rules that have
+        the values of its fields compared with == in the matcher.
+
+        With workers, the batch is split between that many threads, each one with its own compiled matchers,
+        function results and rule indexes. They share the role managers and the indexes of the enforcer,
+        so the policy, the role managers and the functions must not be changed during the batch, which
+        SyncedEnforcer ensures with its lock. Conditional role managers are not covered.
+        """
+        if not self.enabled:
+            return [True for _ in rvals]
+
+        if type(self).enforce is not CoreEnforcer.enforce or type(self).enforce_ex is not CoreEnforcer.enforce_ex:
+            # keep the behavior of subclasses that change enforce, which may not be thread-safe
+            return [self.enforce(*request) for request in rvals]
+
+        if workers is None or workers <= 1:
+            return [result for result, _ in self._batch_enforce_ex(rvals)]
+
+        rvals = list(rvals)
+        chunk_size = max(1, -(-len(rvals) // workers))
+        chunks = [rvals[i : i + chunk_size] for i in range(0, len(rvals), chunk_size)]
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(self._batch_enforce_ex, chunks):
+                results.extend(result for result, _ in chunk_results)
+        return results
+
+    def _batch_enforce_ex(self, rvals):
+        """evaluates the requests with plans and rule indexes prepared once."""
+        memo = _FunctionMemo()
+        functions = self._get_enforce_functions(memo)
+
+        plans = dict()
         results = []
+        done = dict()
         for request in rvals:
-            result = self.enforce(*request)
+            request = tuple(request)
+            try:
+                result = done.get(request)
+            except TypeError:
+                # requests with unhashable values, like ABAC dicts, are not deduplicated
+                result = None
+                request_key = None
+            else:
+                request_key = request
+            if result is not None:
+                results.append(result)
+                continue
+
+            enforce_context = None
+            if len(request) != 0 and isinstance(request[0], EnforceContext):
+                enforce_context = request[0]
+                request = request[1:]
+
+            plan_key = (
+                (enforce_context.rtype, enforce_context.ptype, enforce_context.etype, enforce_context.mtype)
+                if enforce_context is not None
+                else None
+            )
+            if plan_key not in plans:
+                plan = self._prepare_enforce(functions, enforce_context)
+                plans[plan_key] = (plan, self._get_batch_candidates(plan))
+            plan, get_candidates = plans[plan_key]
+
+            result = self._evaluate_enforce(plan, request, get_candidates, explain=False)
+            if request_key is not None:
+                done[request_key] = result
             results.append(result)
+
+        self._add_memo_stats(memo)
         return results
 
+    def _get_batch_candidates(self, plan):
+        """returns a get_candidates function for _evaluate_enforce that looks up the rules with a hash index
+        built once for the batch, or None if the matcher or the policy do not allow it.
+        """
+        if self._columnar is not None:
+            return None
+
+        assertion = self.model["p"][plan.ptype]
+        conditions = [
+            (p_token, r_token)
+            for op, p_token, r_token, _ in get_column_conditions(
+                plan.exp_string, tuple(plan.r_tokens), tuple(assertion.tokens)
+            )
+            if op == "==" and r_token is not None
+        ]
+        if not conditions or not ColumnarPolicy.supports(assertion):
+            return None
+
+        policy = assertion.policy
+        indexes = dict()
+
+        def get_index(p_token):
+            index = indexes.get(p_token)
+            if index is None:
+                column = assertion.tokens.index(p_token)
+                index = dict()
+                for i, rule in enumerate(policy):
+                    index.setdefault(rule[column], []).append(i)
+                index = indexes.setdefault(p_token, index)
+            return index
+
+        def get_candidates(r_parameters):
+            candidates = None
+            for p_token, r_token in conditions:
+                value = r_parameters[r_token]
+                if type(value) is not str:
+                    continue
+                rows = get_index(p_token).get(value, [])
+                if candidates is None or len(rows) < len(candidates):
+                    candidates = rows
+            return candidates
+
+        return get_candidates
+
     @staticmethod
     def configure_logging(logging_config=None):
         """configure_logging configure the default logger for casbin"""
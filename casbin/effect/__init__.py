@@ -18,7 +18,7 @@ from .default_effectors import (
     AllowAndDenyEffector,
     PriorityEffector,
 )
-from .effector import Effector
+from .effector import Effector, EffectMask
 from ..constant.constants import (
     ALLOW_OVERRIDE_EFFECT,
     SUBJECT_PRIORITY_EFFECT,
@@ -29,3 +29,20 @@ class Effector:
     def final_effect(self, effects):
         """returns the final effect based on the matched effects of the enforcer"""
         pass
+
+
+class EffectMask(int):
+    """EffectMask is a set of effects stored as the bits 1 << effect of an int,
+    the enforcer collects the effects of the matched rules in one.
+    """
+
+    __slots__ = ()
+
+    def __contains__(self, effect):
+        return bool(self & (1 << effect))
+
+    def __iter__(self):
+        return (effect for effect in (Effector.ALLOW, Effector.INDETERMINATE, Effector.DENY) if effect in self)
+
+    def __len__(self):
+        return bin(self).count("1")
@@ -302,7 +302,7 @@ class Enforcer(ManagementEnforcer):
                 else:
                     users = rm.get_users(sub)
                     for user in users:
-                        implicit_rule = rule.copy()
+                        implicit_rule = list(rule)
                         implicit_rule[subject_index] = user
                         permissions[tuple(implicit_rule)] = True
 
@@ -329,7 +329,7 @@ class Enforcer(ManagementEnforcer):
                         continue
                     users = rm.get_users(sub, domain)
                     for user in users:
-                        implicit_rule = rule.copy()
+                        implicit_rule = list(rule)
                         implicit_rule[subject_index] = user
                         permissions[tuple(implicit_rule)] = True
 
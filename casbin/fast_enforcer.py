@@ -20,6 +20,8 @@ class FastEnforcer(Enforcer):
     ):
         self._cache_key_order = cache_key_order
         super().__init__(model, adapter, enable_log, logging_config)
+        # the rules are looked up with the cache key order instead, call enable_subject_index() to use both
+        self.enable_subject_index(False)
 
     def new_model(self, path="", text=""):
         """creates a model."""
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from casbin.core_enforcer import CoreEnforcer
+from casbin.model.policy_op import PolicyOp
 
 
 class InternalEnforcer(CoreEnforcer):
@@ -210,6 +211,120 @@ class InternalEnforcer(CoreEnforcer):
 
         return rule_removed
 
+    def _commit_batch(self, ops):
+        """applies the (op, sec, ptype, rules) changes collected by a PolicyBatch."""
+        changes = []
+        try:
+            for op, sec, ptype, rules in self._coalesce_batch_ops(ops):
+                effected = []
+                changes.append((op, sec, ptype, effected))
+                if op == PolicyOp.Policy_add:
+                    effected.extend(self.model.add_policies_with_effected(sec, ptype, rules))
+                elif op == PolicyOp.Policy_remove:
+                    effected.extend(self.model.remove_policies_with_effected(sec, ptype, rules))
+                else:
+                    for old_rule, new_rule in rules:
+                        if self.model.update_policy(sec, ptype, old_rule, new_rule):
+                            effected.append((old_rule, new_rule))
+
+            changes = [change for change in changes if change[3]]
+            if not changes:
+                return False
+
+            if self.adapter and self.auto_save:
+                saved = []
+                try:
+                    for change in changes:
+                        if self._save_batch_change(*change) is False:
+                            self._undo_saved_batch_changes(saved)
+                            self._revert_batch_changes(changes)
+                            return False
+                        saved.append(change)
+                except Exception:
+                    self._undo_saved_batch_changes(saved)
+                    raise
+        except Exception:
+            self._revert_batch_changes(changes)
+            raise
+
+        if self.auto_build_role_links:
+            for op, sec, ptype, rules in changes:
+                if sec != "g":
+                    continue
+                if op == PolicyOp.Policy_update:
+                    self._build_incremental_role_links(PolicyOp.Policy_remove, ptype, [old for old, _ in rules])
+                    self._build_incremental_role_links(PolicyOp.Policy_add, ptype, [new for _, new in rules])
+                else:
+                    self._build_incremental_role_links(op, ptype, rules)
+
+        if self.adapter and self.auto_save and self.watcher and self.auto_notify_watcher:
+            self.watcher.update()
+
+        return True
+
+    @staticmethod
+    def _coalesce_batch_ops(ops):
+        """merges consecutive changes of the same kind on the same ptype, keeping their order."""
+        merged = []
+        for op, sec, ptype, rules in ops:
+            if merged and merged[-1][:3] == (op, sec, ptype):
+                merged[-1][3].extend(rules)
+            else:
+                merged.append((op, sec, ptype, list(rules)))
+        return merged
+
+    def _save_batch_change(self, op, sec, ptype, rules):
+        if op == PolicyOp.Policy_add:
+            if hasattr(self.adapter, "add_policies"):
+                return self.adapter.add_policies(sec, ptype, rules)
+            results = [self.adapter.add_policy(sec, ptype, rule) for rule in rules]
+        elif op == PolicyOp.Policy_remove:
+            if hasattr(self.adapter, "remove_policies"):
+                return self.adapter.remove_policies(sec, ptype, rules)
+            results = [self.adapter.remove_policy(sec, ptype, rule) for rule in rules]
+        else:
+            old_rules = [old for old, _ in rules]
+            new_rules = [new for _, new in rules]
+            if hasattr(self.adapter, "update_policies"):
+                return self.adapter.update_policies(sec, ptype, old_rules, new_rules)
+            if hasattr(self.adapter, "update_policy"):
+                results = [self.adapter.update_policy(sec, ptype, old, new) for old, new in rules]
+            else:
+                results = [
+                    self._save_batch_change(PolicyOp.Policy_remove, sec, ptype, old_rules),
+                    self._save_batch_change(PolicyOp.Policy_add, sec, ptype, new_rules),
+                ]
+
+        return not any(result is False for result in results)
+
+    def _undo_saved_batch_changes(self, saved):
+        """undoes the changes of a batch that were saved before a later change could not be saved, with the
+        inverse adapter calls in reverse order. A change that fails is expected to leave the adapter unchanged,
+        and an inverse call that fails is logged and the others are still made.
+        """
+        for op, sec, ptype, rules in reversed(saved):
+            if op == PolicyOp.Policy_add:
+                inverse = (PolicyOp.Policy_remove, sec, ptype, rules)
+            elif op == PolicyOp.Policy_remove:
+                inverse = (PolicyOp.Policy_add, sec, ptype, rules)
+            else:
+                inverse = (op, sec, ptype, [(new_rule, old_rule) for old_rule, new_rule in reversed(rules)])
+            try:
+                if self._save_batch_change(*inverse) is False:
+                    self.logger.warning("cannot undo the saved batch change %s of %s", op, ptype)
+            except Exception as e:
+                self.logger.warning("cannot undo the saved batch change %s of %s: %s", op, ptype, e)
+
+    def _revert_batch_changes(self, changes):
+        for op, sec, ptype, rules in reversed(changes):
+            if op == PolicyOp.Policy_add:
+                self.model.remove_policies_with_effected(sec, ptype, rules)
+            elif op == PolicyOp.Policy_remove:
+                self.model.add_policies_with_effected(sec, ptype, rules)
+            else:
+                for old_rule, new_rule in reversed(rules):
+                    self.model.update_policy(sec, ptype, new_rule, old_rule)
+
     def get_field_index(self, ptype, field):
         """gets the index of the field name."""
         return self.model.get_field_index(ptype, field)
@@ -0,0 +1,203 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+
+from casbin.core_enforcer import EnforceContext
+from casbin.enforcer import Enforcer
+from casbin.model.policy_op import PolicyOp
+from casbin.persist.adapters.filtered_file_adapter import Filter
+from casbin.util.rwlock import RWLockWrite
+
+
+class LazyDomainEnforcer:
+    """LazyDomainEnforcer wraps Enforcer for models with domains and loads the policy of a domain
+    the first time a request for it is enforced, with the filtered loading of the adapter.
+
+    filter_factory(domain) returns the filter, or a list of filters, passed to
+    adapter.load_filtered_policy. The default is a FilteredFileAdapter Filter on the domain
+    field of p and g. When more than max_domains domains or max_rules rules are loaded, the
+    least recently used domains are evicted together with their role links.
+    """
+
+    def __init__(self, model=None, adapter=None, filter_factory=None, max_domains=1000, max_rules=None):
+        if max_domains < 1:
+            raise ValueError("max_domains should be at least 1")
+
+        self._e = Enforcer(model)
+        self._e.set_adapter(adapter)
+
+        tokens = self._e.model["r"]["r"].tokens
+        if "r_dom" not in tokens:
+            raise ValueError("the request definition has no dom field")
+        self._domain_index = tokens.index("r_dom")
+        self._filter_factory = filter_factory or self._default_filter
+        self._max_domains = max_domains
+        self._max_rules = max_rules
+
+        self._rwlock = RWLockWrite()
+        self._rl = self._rwlock.gen_rlock()
+        self._wl = self._rwlock.gen_wlock()
+        # guards the LRU order and the metrics, which are updated by concurrent readers
+        self._lru_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        self._domains = OrderedDict()  # domain -> keys of the rules loaded for it
+        self._refs = dict()  # (sec, ptype, rule) -> number of loaded domains that include it
+        self._metrics = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0}
+
+    def get_enforcer(self):
+        """returns the wrapped enforcer, changing its policy bypasses the domain bookkeeping."""
+        return self._e
+
+    def _default_filter(self, domain):
+        filter = Filter()
+        p_domain_index = self._e.get_field_index("p", "dom")
+        filter.P = [""] * p_domain_index + [domain] if p_domain_index != -1 else []
+        filter.G = ["", "", domain]
+        return filter
+
+    def enforce(self, *rvals):
+        """decides whether a "subject" can access a "object" with the operation "action" in a domain,
+        input parameters are usually: (sub, dom, obj, act).
+        """
+        result, _ = self.enforce_ex(*rvals)
+        return result
+
+    def enforce_ex(self, *rvals):
+        """decides whether a "subject" can access a "object" with the operation "action" in a domain,
+        return judge result with reason
+        """
+        request = rvals[1:] if rvals and isinstance(rvals[0], EnforceContext) else rvals
+        domain = request[self._domain_index]
+
+        counted = False
+        while True:
+            with self._rl:
+                with self._lru_lock:
+                    loaded = domain in self._domains
+                    if loaded:
+                        self._domains.move_to_end(domain)
+                    if not counted:
+                        self._metrics["hits" if loaded else "misses"] += 1
+                        counted = True
+                if loaded:
+                    return self._e.enforce_ex(*rvals)
+
+            self.load_domain(domain)
+
+    def load_domain(self, domain):
+        """loads the policy of the domain if it is not loaded, returns false if it already was."""
+        with self._load_lock:
+            with self._lru_lock:
+                if domain in self._domains:
+                    return False
+
+            filters = self._filter_factory(domain)
+            if not isinstance(filters, (list, tuple)):
+                filters = [filters]
+
+            # the adapter is read without blocking enforce calls for other domains
+            keys = dict()
+            for filter in filters:
+                for (sec, ptype), rules in self._e._load_filtered_rules(filter).items():
+                    for rule in rules:
+                        keys[(sec, ptype, tuple(rule))] = rule
+
+            with self._wl:
+                added = dict()
+                for key, rule in keys.items():
+                    count = self._refs.get(key, 0)
+                    self._refs[key] = count + 1
+                    if count == 0:
+                        added.setdefault(key[:2], []).append(rule)
+
+                for (sec, ptype), rules in added.items():
+                    self._e.model.add_policies_with_effected(sec, ptype, rules)
+                    if sec == "g" and self._e.auto_build_role_links:
+                        self._e._build_incremental_role_links(PolicyOp.Policy_add, ptype, rules)
+
+                with self._lru_lock:
+                    self._domains[domain] = list(keys)
+                    self._metrics["loads"] += 1
+
+                while len(self._domains) > self._max_domains or (
+                    self._max_rules is not None and len(self._refs) > self._max_rules and len(self._domains) > 1
+                ):
+                    oldest = next(iter(self._domains))
+                    if oldest == domain:
+                        break
+                    self._evict(oldest)
+        return True
+
+    def evict_domain(self, domain):
+        """removes the policy of the domain from memory, returns false if it was not loaded."""
+        with self._load_lock, self._wl:
+            if domain not in self._domains:
+                return False
+            self._evict(domain)
+            return True
+
+    def _evict(self, domain):
+        with self._lru_lock:
+            keys = self._domains.pop(domain)
+            self._metrics["evictions"] += 1
+
+        removed = dict()
+        for key in keys:
+            count = self._refs[key] - 1
+            if count:
+                self._refs[key] = count
+            else:
+                del self._refs[key]
+                removed.setdefault(key[:2], []).append(list(key[2]))
+
+        for (sec, ptype), rules in removed.items():
+            self._e.model.discard_policies(sec, ptype, rules)
+            if sec == "g" and self._e.auto_build_role_links:
+                self._delete_role_links(ptype, rules, domain)
+
+    def _delete_role_links(self, ptype, rules, domain):
+        def in_domain(rule):
+            return len(rule) > 2 and rule[2] == domain
+
+        # dropping the whole domain is much cheaper than deleting its links one by one
+        whole_domain = all(in_domain(rule) for rule in rules) and not any(
+            in_domain(rule) for rule in self._e.model["g"][ptype].policy
+        )
+        for rm_map in [self._e.rm_map, self._e.cond_rm_map]:
+            rm = rm_map.get(ptype)
+            if rm is None:
+                continue
+            if whole_domain and hasattr(rm, "delete_domain"):
+                rm.delete_domain(domain)
+            elif rm_map is self._e.rm_map:
+                self._e.model.build_incremental_role_links(rm, PolicyOp.Policy_remove, "g", ptype, rules)
+            else:
+                self._e.model.build_incremental_conditional_role_links(rm, PolicyOp.Policy_remove, "g", ptype, rules)
+
+    def get_loaded_domains(self):
+        """returns the loaded domains, least recently used first."""
+        with self._lru_lock:
+            return list(self._domains)
+
+    def get_metrics(self):
+        """returns the hit, miss, load and eviction counters and the number of loaded domains and rules."""
+        with self._lru_lock:
+            metrics = dict(self._metrics)
+            metrics["domains"] = len(self._domains)
+        with self._rl:
+            metrics["rules"] = len(self._refs)
+        return metrics
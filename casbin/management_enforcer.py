@@ -14,6 +14,7 @@
 
 from casbin.internal_enforcer import InternalEnforcer
 from casbin.model.policy_op import PolicyOp
+from casbin.policy_batch import PolicyBatch
 from casbin.constant.constants import ACTION_INDEX, SUBJECT_INDEX, OBJECT_INDEX
 
 
@@ -342,6 +343,17 @@ class ManagementEnforcer(InternalEnforcer):
             )
         return rule_removed
 
-    def add_function(self, name, func):
-        """adds a customized function."""
-        self.fm.add_function(name, func)
+    def batch(self):
+        """returns a PolicyBatch that collects policy changes and applies them at once on commit.
+
+        with e.batch() as batch:
+            batch.add_grouping_policy("alice", "admin")
+            batch.add_policy("admin", "data1", "read")
+
+        The adapter, the role links and the watcher are updated once per batch instead of once per rule.
+        """
+        return PolicyBatch(self)
+
+    def add_function(self, name, func, pure=False):
+        """adds a customized function, the results of a pure function are cached for the calls of one enforce."""
+        self.fm.add_function(name, func, pure)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from .assertion import Assertion
+from .compact_policy import PolicyRow, StringInterner
 from .function import FunctionMap
 from .model import Model
 from .model_fast import FastModel
@@ -18,39 +18,129 @@ from casbin.model.policy_op import PolicyOp
 
 
 class Assertion:
+    __slots__ = (
+        "logger",
+        "key",
+        "value",
+        "tokens",
+        "params_tokens",
+        "role_count",
+        "policy",
+        "rm",
+        "cond_rm",
+        "priority_index",
+        "policy_map",
+        "field_index_map",
+        "interner",
+        "policy_version",
+        "valid_policy",
+        "mapped_policy",
+    )
+
     def __init__(self):
         self.logger = logging.getLogger("casbin.policy")
         self.key = ""
         self.value = ""
         self.tokens = []
         self.params_tokens = []
+        # the number of "_" in the role definition, set with the value of a g assertion
+        self.role_count = 0
         self.policy = []
         self.rm = None
         self.cond_rm = None
         self.priority_index: int = -1
         self.policy_map: dict = {}
         self.field_index_map: dict = {}
+        # set when the enforcer stores the policy as compact rows
+        self.interner = None
+        # incremented when rules are changed in place, so indexes built from the policy know they are stale
+        self.policy_version = 0
+        # (policy, policy_version, size, valid) of the last check of the number of fields of the rules
+        self.valid_policy = None
+        # (policy, policy_version, size) of the rules the keys of policy_map were last built from
+        self.mapped_policy = None
+
+    def to_row(self, rule):
+        """returns the rule in the storage format of this assertion."""
+        if self.interner is None:
+            return rule
+        return self.interner.row(rule)
+
+    def validate_policy(self):
+        """checks that every rule has one value per token, returns whether they all have."""
+        count = len(self.tokens)
+        policy = self.policy
+        valid = all(len(rule) == count for rule in policy)
+        self.valid_policy = (policy, self.policy_version, len(policy), valid)
+        return valid
+
+    def is_policy_valid(self):
+        """returns whether every rule has one value per token, the rules are only checked again
+        if the policy was changed without policy_changed.
+        """
+        checked = self.valid_policy
+        if (
+            checked is None
+            or checked[0] is not self.policy
+            or checked[1] != self.policy_version
+            or checked[2] != len(self.policy)
+        ):
+            return self.validate_policy()
+        return checked[3]
+
+    def policy_changed(self, was_valid, rules=()):
+        """increments the policy version after rules were changed in place, was_valid is the result of
+        is_policy_valid before the change and rules are the added ones, which are the only ones checked.
+        """
+        self.policy_version += 1
+        count = len(self.tokens)
+        # a removed rule may have been the only invalid one, that is only found by validate_policy
+        valid = was_valid and all(len(rule) == count for rule in rules)
+        self.valid_policy = (self.policy, self.policy_version, len(self.policy), valid)
+
+    def get_policy_map(self):
+        """returns policy_map with the key of every rule, it is only built again if the policy was changed
+        without policy_map_changed.
+        """
+        mapped = self.mapped_policy
+        if (
+            mapped is None
+            or mapped[0] is not self.policy
+            or mapped[1] != self.policy_version
+            or mapped[2] != len(self.policy)
+        ):
+            self.policy_map = {",".join(rule): i for i, rule in enumerate(self.policy)}
+            self.policy_map_changed()
+        return self.policy_map
+
+    def policy_map_changed(self):
+        """records that policy_map has the key of every rule of the current policy."""
+        self.mapped_policy = (self.policy, self.policy_version, len(self.policy))
 
     def build_role_links(self, rm):
+        self.add_role_links(rm, self.policy)
+
+        self.logger.info("Role links for: {}".format(self.key))
+        self.rm.print_roles()
+
+    def add_role_links(self, rm, rules):
+        """adds the links of the rules to the role manager, build_role_links adds the ones of every rule."""
         self.rm = rm
-        count = self.value.count("_")
+        count = self.role_count
         if count < 2:
             raise RuntimeError('the number of "_" in role definition should be at least 2')
 
-        for rule in self.policy:
+        for rule in rules:
             if len(rule) < count:
                 raise RuntimeError("grouping policy elements do not meet role definition")
             if len(rule) > count:
                 rule = rule[:count]
 
-            self.rm.add_link(*rule[:count])
-
-        self.logger.info("Role links for: {}".format(self.key))
-        self.rm.print_roles()
+            self.rm.add_link(*rule)
 
     def build_incremental_role_links(self, rm, op, rules):
         self.rm = rm
-        count = self.value.count("_")
+        count = self.role_count
         if count < 2:
             raise RuntimeError('the number of "_" in role definition should be at least 2')
         for rule in rules:
@@ -67,7 +157,7 @@ class Assertion:
 
     def build_incremental_conditional_role_links(self, cond_rm, op, rules):
         self.cond_rm = cond_rm
-        count = self.value.count("_")
+        count = self.role_count
         if count < 2:
             raise RuntimeError('the number of "_" in role definition should be at least 2')
 
@@ -87,11 +177,15 @@ class Assertion:
                 raise TypeError("Invalid operation: " + str(op))
 
     def build_conditional_role_links(self, cond_rm):
+        self.add_conditional_role_links(cond_rm, self.policy)
+
+    def add_conditional_role_links(self, cond_rm, rules):
+        """adds the links of the rules to the conditional role manager."""
         self.cond_rm = cond_rm
-        count = self.value.count("_")
+        count = self.role_count
         if count < 2:
             raise RuntimeError('the number of "_" in role definition should be at least 2')
-        for rule in self.policy:
+        for rule in rules:
             if len(rule) < count:
                 raise TypeError("grouping policy elements do not meet role definition")
             if len(rule) > count:
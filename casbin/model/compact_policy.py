@@ -0,0 +1,67 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+
+class PolicyRow(tuple):
+    """PolicyRow is an immutable policy rule that compares equal to a list with the same values,
+    so rules passed as lists to the management API still match the stored rows.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def copy(self):
+        """returns the rule as a mutable list."""
+        return list(self)
+
+
+class StringInterner:
+    """StringInterner keeps one instance of every string of the policy, shared by p and g rows and the role managers."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self):
+        self._table = dict()
+
+    def __len__(self):
+        return len(self._table)
+
+    def __deepcopy__(self, memo):
+        # the table is shared by the copies of a model that load_policy makes
+        return self
+
+    def intern(self, value):
+        return self._table.setdefault(value, value)
+
+    def row(self, rule):
+        """returns the rule as a PolicyRow of interned strings."""
+        if type(rule) is PolicyRow:
+            return rule
+        table = self._table
+        return PolicyRow(table.setdefault(value, value) for value in rule)
+
+    def size(self):
+        """returns the number of bytes used by the interned strings."""
+        return sum(sys.getsizeof(value) for value in self._table)
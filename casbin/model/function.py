@@ -17,12 +17,21 @@ from casbin import util
 
 class FunctionMap:
     fm = None
+    pure = None
 
     def __init__(self):
         self.fm = dict()
+        self.pure = set()
 
-    def add_function(self, name, func):
+    def add_function(self, name, func, pure=False):
+        """adds a function, a pure function returns the same result for the same arguments,
+        so its results are cached for the calls of one enforce.
+        """
         self.fm[name] = func
+        if pure:
+            self.pure.add(name)
+        else:
+            self.pure.discard(name)
 
     @staticmethod
     def load_function_map():
@@ -41,3 +50,6 @@ class FunctionMap:
 
     def get_functions(self):
         return self.fm
+
+    def get_pure_functions(self):
+        return self.pure
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import bisect
 import re
 
 from casbin import util, config
@@ -23,6 +24,12 @@ PARAMS_REGEX = re.compile(r"\((.*?)\)")
 
 
 class Model(Policy):
+    # the levels of the subjects of a subjectPriority model, see get_subject_hierarchy_map
+    subject_hierarchy_map = None
+    # the links between the subjects and the rules by subject, see _update_subject_hierarchy_map
+    _subject_graph = None
+    _subject_rows = None
+
     section_name_map = {
         "r": "request_definition",
         "p": "policy_definition",
@@ -62,6 +69,7 @@ class Model(Policy):
                 ast.tokens[i] = key + "_" + token.strip()
         elif "g" == sec:
             ast.params_tokens = self.get_params_token(ast.value)
+            ast.role_count = ast.value.count("_")
             ast.tokens = ast.value.split(",")
             ast.tokens = ast.tokens[: len(ast.tokens) - len(ast.params_tokens)]
         else:
@@ -114,13 +122,17 @@ class Model(Policy):
             for i, j in v.items():
                 self.logger.info("%s.%s: %s", k, i, j.value)
 
-    def sort_policies_by_priority(self):
+    def init_priority_index(self):
+        """sets the priority index of the policy assertions that have a priority field."""
         for ptype, assertion in self["p"].items():
             for index, token in enumerate(assertion.tokens):
                 if token == f"{ptype}_priority":
                     assertion.priority_index = index
                     break
 
+    def sort_policies_by_priority(self):
+        self.init_priority_index()
+        for ptype, assertion in self["p"].items():
             if assertion.priority_index == -1:
                 continue
 
@@ -136,71 +148,357 @@ class Model(Policy):
 
         return None
 
+    def is_subject_priority(self):
+        """returns whether the policies are ordered by subject hierarchy, i.e. the effect is subjectPriority."""
+        return "e" in self.keys() and self["e"]["e"].value == "subjectPriority(p_eft) || deny"
+
     def sort_policies_by_subject_hierarchy(self):
-        if self["e"]["e"].value != "subjectPriority(p_eft) || deny":
+        if not self.is_subject_priority():
             return
 
+        self._subject_rows = dict()
+        self._build_subject_graph()
+        for ptype in self["p"]:
+            self._sort_policy_by_subject_hierarchy(ptype)
+
+    def _get_subject_name_func(self, ptype):
+        """returns the function that gives the subject of a rule of ptype with its domain."""
         sub_index = 0
         domain_index = -1
-        for ptype, assertion in self["p"].items():
-            for index, token in enumerate(assertion.tokens):
-                if token == "{}_dom".format(ptype):
-                    domain_index = index
-                    break
+        for index, token in enumerate(self["p"][ptype].tokens):
+            if token == "{}_dom".format(ptype):
+                domain_index = index
+                break
 
-            subject_hierarchy_map = self.get_subject_hierarchy_map(self["g"]["g"].policy)
+        def get_name(policy):
+            domain = DEFAULT_DOMAIN
+            if domain_index != -1:
+                domain = policy[domain_index]
+            return self.get_name_with_domain(domain, policy[sub_index])
 
-            def compare_policy(policy):
-                domain = DEFAULT_DOMAIN
-                if domain_index != -1:
-                    domain = policy[domain_index]
-                name = self.get_name_with_domain(domain, policy[sub_index])
-                return subject_hierarchy_map.get(name, 0)
+        return get_name
 
-            assertion.policy = sorted(assertion.policy, key=compare_policy)
-            for i, policy in enumerate(assertion.policy):
-                assertion.policy_map[",".join(policy)] = i
+    def _get_subject_level_func(self, ptype, subject_hierarchy_map=None):
+        """returns the function that gives the level of the subject of a rule of ptype in the subject hierarchy."""
+        get_name = self._get_subject_name_func(ptype)
+        if subject_hierarchy_map is None:
+            subject_hierarchy_map = self.subject_hierarchy_map
+
+        def get_level(policy):
+            return subject_hierarchy_map.get(get_name(policy), 0)
+
+        return get_level
+
+    def update_policy_order(self, sec, ptype, added=None, removed=None):
+        """keeps the policies of a subjectPriority model sorted by subject hierarchy after a change of rules.
+        added are the rules appended to the policy, or None if rules were updated, removed are the removed rules.
+        A grouping change only moves the rules of the subjects whose level changed, one that makes a cycle
+        keeps the previous order.
+        """
+        if not self.is_subject_priority():
+            return
+
+        if sec == "g":
+            if ptype != "g":
+                return
+            changed = self._update_subject_hierarchy_map(added, removed)
+            if changed:
+                for key in self["p"]:
+                    self._move_policy_of_changed_subjects(key, changed)
+            return
+
+        if self.subject_hierarchy_map is None:
+            self._update_subject_hierarchy_map()
+            return
+
+        if added is None:
+            self._sort_policy_by_subject_hierarchy(ptype)
+            return
+
+        # the added rules are at the end, each one is moved after the rules of the same or a lower level
+        policy = self[sec][ptype].policy
+        if added:
+            start = len(policy) - len(added)
+            moved = policy[start:]
+            del policy[start:]
+            self._insert_policy_by_subject_hierarchy(ptype, moved)
+        self._update_subject_rows(ptype, added, removed)
+
+    def _build_subject_graph(self):
+        """computes the subject hierarchy map and the links between the subjects from the whole grouping policy,
+        raises RuntimeError if it has a cycle.
+        """
+        policy = self["g"]["g"].policy
+        parents, children, levels = self._get_subject_graph(policy)
+        self.subject_hierarchy_map = levels
+        # the grouping policy and its size the links were built from
+        self._subject_graph = (policy, len(policy), parents, children)
+
+    def _update_subject_hierarchy_map(self, added=None, removed=None):
+        """updates the subject hierarchy map after a change of the grouping policy, sorting the policies if
+        there was none. returns the previous levels of the subjects whose level changed, the levels of the
+        ancestors of the changed links only are computed again when the change is known.
+        A change that makes a cycle keeps the previous map.
+        """
+        previous = self.subject_hierarchy_map
+        graph = self._subject_graph
+        policy = self["g"]["g"].policy
+        if (
+            previous is not None
+            and graph is not None
+            and added is not None
+            and (graph[0] is policy or removed is not None)
+            and graph[1] == len(policy) - len(added) + len(removed or ())
+        ):
+            self._subject_graph = (policy, len(policy), graph[2], graph[3])
+            changed = dict()
+            try:
+                for rule in removed or ():
+                    self._remove_subject_link(rule, changed)
+                if all(self._add_subject_link(rule, changed) for rule in added):
+                    return changed
+            except (KeyError, ValueError, RuntimeError):
+                pass
+            # a cycle, the map is computed again from the whole grouping policy until it is removed
+            previous.update(changed)
+            self._subject_graph = None
+
+        try:
+            self._build_subject_graph()
+        except RuntimeError as e:
+            self.logger.warning("cannot sort policy by subject hierarchy: %s", e)
+            self._subject_graph = None
+            return dict()
+
+        if previous is None:
+            for key in self["p"]:
+                self._sort_policy_by_subject_hierarchy(key)
+            return dict()
+        levels = self.subject_hierarchy_map
+        return {
+            sub: previous.get(sub, 0)
+            for sub in set(previous).union(levels)
+            if previous.get(sub, 0) != levels.get(sub, 0)
+        }
+
+    def _get_subject_link(self, rule):
+        if len(rule) < 2:
+            raise RuntimeError("policy g expect 2 more params")
+        domain = DEFAULT_DOMAIN
+        if len(rule) != 2:
+            domain = rule[2]
+        return self.get_name_with_domain(domain, rule[0]), self.get_name_with_domain(domain, rule[1])
+
+    def _add_subject_link(self, rule, changed):
+        """adds the link of the grouping rule and raises the levels of the ancestors of its parent,
+        the previous levels are recorded in changed. returns False without adding it if it makes a cycle.
+        """
+        _, _, parents, children = self._subject_graph
+        levels = self.subject_hierarchy_map
+        child, parent = self._get_subject_link(rule)
+
+        # a cycle is made if the child is an ancestor of the parent
+        stack = [parent]
+        seen = {parent}
+        while stack:
+            sub = stack.pop()
+            if sub == child:
+                return False
+            for ancestor in parents.get(sub, ()):
+                if ancestor not in seen:
+                    seen.add(ancestor)
+                    stack.append(ancestor)
+
+        parents.setdefault(child, []).append(parent)
+        parents.setdefault(parent, [])
+        children.setdefault(parent, []).append(child)
+        children.setdefault(child, [])
+        levels.setdefault(child, 0)
+        levels.setdefault(parent, 0)
+        stack = [(parent, levels[child] + 1)]
+        while stack:
+            sub, level = stack.pop()
+            if levels[sub] >= level:
+                continue
+            changed.setdefault(sub, levels[sub])
+            levels[sub] = level
+            stack.extend((ancestor, level + 1) for ancestor in parents.get(sub, ()))
+        return True
+
+    def _remove_subject_link(self, rule, changed):
+        """removes the link of the grouping rule and computes the levels of the ancestors of its parent again,
+        the previous levels are recorded in changed.
+        """
+        _, _, parents, children = self._subject_graph
+        levels = self.subject_hierarchy_map
+        child, parent = self._get_subject_link(rule)
+        parents[child].remove(parent)
+        children[parent].remove(child)
+        self._forget_subject(child)
+
+        stack = [parent]
+        while stack:
+            sub = stack.pop()
+            level = 1 + max((levels[c] for c in children[sub]), default=-1)
+            if level == levels[sub]:
+                continue
+            changed.setdefault(sub, levels[sub])
+            levels[sub] = level
+            stack.extend(parents[sub])
+        self._forget_subject(parent)
+
+    def _forget_subject(self, sub):
+        _, _, parents, children = self._subject_graph
+        if not parents.get(sub) and not children.get(sub):
+            parents.pop(sub, None)
+            children.pop(sub, None)
+            del self.subject_hierarchy_map[sub]
+
+    def _get_subject_rows(self, ptype):
+        """returns the rules of ptype by subject, built again if the policy was changed since."""
+        assertion = self["p"][ptype]
+        policy = assertion.policy
+        if self._subject_rows is None:
+            self._subject_rows = dict()
+        entry = self._subject_rows.get(ptype)
+        if entry is None or entry[0] is not policy or entry[1:3] != (assertion.policy_version, len(policy)):
+            rows = dict()
+            get_name = self._get_subject_name_func(ptype)
+            for rule in policy:
+                rows.setdefault(get_name(rule), []).append(rule)
+            entry = (policy, assertion.policy_version, len(policy), rows)
+            self._subject_rows[ptype] = entry
+        return entry[3]
+
+    def _update_subject_rows(self, ptype, added, removed):
+        """updates the rules of ptype by subject after a change, if they were current before it."""
+        entry = self._subject_rows.get(ptype) if self._subject_rows is not None else None
+        if entry is None:
+            return
+        assertion = self["p"][ptype]
+        policy = assertion.policy
+        if (entry[0] is not policy and removed is None) or entry[2] != len(policy) - len(added) + len(removed or ()):
+            del self._subject_rows[ptype]
+            return
+
+        rows = entry[3]
+        get_name = self._get_subject_name_func(ptype)
+        try:
+            for rule in removed or ():
+                name = get_name(rule)
+                rows[name].remove(rule)
+                if not rows[name]:
+                    del rows[name]
+        except (KeyError, ValueError):
+            del self._subject_rows[ptype]
+            return
+        for rule in added:
+            rows.setdefault(get_name(rule), []).append(rule)
+        self._subject_rows[ptype] = (policy, assertion.policy_version, len(policy), rows)
+
+    def _sort_policy_by_subject_hierarchy(self, ptype):
+        assertion = self["p"][ptype]
+        assertion.policy = sorted(assertion.policy, key=self._get_subject_level_func(ptype))
+        for i, policy in enumerate(assertion.policy):
+            assertion.policy_map[",".join(policy)] = i
+
+    def _move_policy_of_changed_subjects(self, ptype, changed):
+        """moves the rules of ptype whose subject is in changed, the previous levels of the subjects whose
+        level changed, the other rules keep their order. The result is the same as sorting the policy again.
+        """
+        rows = self._get_subject_rows(ptype)
+        moved_ids = {id(rule) for sub in changed for rule in rows.get(sub, ())}
+        if not moved_ids:
+            return
+
+        get_level = self._get_subject_level_func(ptype)
+        assertion = self["p"][ptype]
+        kept = []
+        kept_keys = []
+        moved = []
+        for i, rule in enumerate(assertion.policy):
+            if id(rule) in moved_ids:
+                moved.append((get_level(rule), i, rule))
+            else:
+                kept.append(rule)
+                kept_keys.append((get_level(rule), i))
+        if len(moved) != len(moved_ids):
+            self._sort_policy_by_subject_hierarchy(ptype)
+            return
+
+        # each moved rule goes before the first kept rule with a greater level, or the same one and a greater index
+        moved.sort(key=lambda item: item[:2])
+        policy = []
+        start = 0
+        for level, i, rule in moved:
+            end = bisect.bisect_left(kept_keys, (level, i), start)
+            policy.extend(kept[start:end])
+            policy.append(rule)
+            start = end
+        policy.extend(kept[start:])
+
+        assertion.policy = policy
+        for i, rule in enumerate(policy):
+            if id(rule) in moved_ids:
+                assertion.policy_map[",".join(rule)] = i
+        entry = self._subject_rows[ptype]
+        self._subject_rows[ptype] = (policy,) + entry[1:]
+
+    def _insert_policy_by_subject_hierarchy(self, ptype, rules):
+        """inserts the rules into the sorted policy of ptype, each one after the rules of the same or a lower level."""
+        assertion = self["p"][ptype]
+        get_level = self._get_subject_level_func(ptype)
+        policy = assertion.policy
+        for rule in rules:
+            level = get_level(rule)
+            low, high = 0, len(policy)
+            while low < high:
+                middle = (low + high) // 2
+                if get_level(policy[middle]) <= level:
+                    low = middle + 1
+                else:
+                    high = middle
+            policy.insert(low, rule)
+            assertion.policy_map[",".join(rule)] = low
 
     def get_subject_hierarchy_map(self, policies):
         """
         Get the subject hierarchy from the policy.
-        Select the lowest level subject in multiple rounds until all subjects are selected.
+        The subjects are sorted topologically, from the ones without children to the roots, in one pass.
         Return the subject hierarchy dictionary, the subject is the key, and the level is the value.
-        The level starts from 0 and increases in turn. The smaller the level, the higher the priority.
+        The level of a subject is one more than the highest level of its children, 0 if it has none.
+        The smaller the level, the higher the priority.
         """
-        # Init unsorted policy, and subject
-        unsorted_policy = []
-        unsorted_sub = set()
+        return self._get_subject_graph(policies)[2]
+
+    def _get_subject_graph(self, policies):
+        """returns the parents and the children of the subjects of the grouping policies and their levels."""
+        parents = dict()
+        children = dict()
         for policy in policies:
-            if len(policy) < 2:
-                raise RuntimeError("policy g expect 2 more params")
-            domain = DEFAULT_DOMAIN
-            if len(policy) != 2:
-                domain = policy[2]
-            child = self.get_name_with_domain(domain, policy[0])
-            parent = self.get_name_with_domain(domain, policy[1])
-            unsorted_policy.append([child, parent])
-            unsorted_sub.add(child)
-            unsorted_sub.add(parent)
-        # sort policy,and update sorted_sub_list
-        sorted_sub_list = []
-        while len(unsorted_policy) > 0:
-            # get all parent subject
-            parent_sub = {p[1] for p in unsorted_policy if p[1] != ""}
-            # remove parent subject from unsorted_sub
-            sorted_sub = unsorted_sub - parent_sub
-            if not sorted_sub:
-                raise RuntimeError("cycle dependency in subject hierarchy.subjects: {}".format(unsorted_sub))
-            # update sorted_sub_list
-            sorted_sub_list.append(sorted_sub)
-            # remove sorted subject, and update unsorted_policy
-            unsorted_policy = [p for p in unsorted_policy if p[0] not in sorted_sub]
-            # update unsorted_sub
-            unsorted_sub = unsorted_sub - sorted_sub
-        if len(unsorted_sub) > 0:
-            sorted_sub_list.append(unsorted_sub)
-        # Tree structure of subject
-        return {sub: i for i, subs in enumerate(sorted_sub_list) for sub in subs}
+            child, parent = self._get_subject_link(policy)
+            parents.setdefault(child, []).append(parent)
+            parents.setdefault(parent, [])
+            children.setdefault(parent, []).append(child)
+            children.setdefault(child, [])
+
+        # Kahn's algorithm, a subject is placed once all its children are
+        child_counts = {sub: len(subs) for sub, subs in children.items()}
+        levels = {sub: 0 for sub, count in child_counts.items() if count == 0}
+        queue = list(levels)
+        for sub in queue:
+            level = levels[sub] + 1
+            for parent in parents[sub]:
+                if levels.get(parent, 0) < level:
+                    levels[parent] = level
+                child_counts[parent] -= 1
+                if child_counts[parent] == 0:
+                    queue.append(parent)
+
+        if len(queue) != len(child_counts):
+            cycle = sorted(sub for sub, count in child_counts.items() if count != 0)
+            raise RuntimeError("cycle dependency in subject hierarchy.subjects: {}".format(cycle))
+        return parents, children, levels
 
     def get_name_with_domain(self, domain, name):
         return "{}{}{}".format(domain, DEFAULT_SEPARATOR, name)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import logging
 from casbin.util import util
 
@@ -88,6 +89,62 @@ class Policy:
             for key in self[sec].keys():
                 self[sec][key].policy = []
 
+    def set_interner(self, interner):
+        """stores the rules as compact rows of strings interned by the interner, or as lists if it is None."""
+        for sec in ["p", "g"]:
+            if sec not in self.keys():
+                continue
+            for ast in self[sec].values():
+                ast.interner = interner
+                if not isinstance(ast.policy, list):
+                    continue
+                if interner is None:
+                    ast.policy = [list(rule) for rule in ast.policy]
+                else:
+                    ast.policy = [interner.row(rule) for rule in ast.policy]
+
+    def validate_policy(self):
+        """checks the number of fields of the rules of every policy type, returns whether they are all valid."""
+        if "p" not in self.keys():
+            return True
+
+        valid = True
+        for ptype, ast in self["p"].items():
+            if not ast.validate_policy():
+                self.logger.warning("the policy %s has rules without one value per field of %s", ptype, ast.value)
+                valid = False
+        return valid
+
+    def compact_policy(self):
+        """converts the rules added as lists, e.g. by an adapter, to the storage format of their assertion."""
+        for sec in ["p", "g"]:
+            if sec not in self.keys():
+                continue
+            for ast in self[sec].values():
+                if ast.interner is not None and isinstance(ast.policy, list):
+                    ast.policy = [ast.interner.row(rule) for rule in ast.policy]
+
+    def copy_without_policy(self):
+        """returns a copy of the model with empty policies, the definitions are shared with this model."""
+        model = copy.copy(self)
+        model.model = {}
+        for sec, assertions in self.model.items():
+            model.model[sec] = {}
+            for key, ast in assertions.items():
+                new_ast = copy.copy(ast)
+                if sec in ["p", "g"]:
+                    new_ast.policy = []
+                    new_ast.policy_map = {}
+                model.model[sec][key] = new_ast
+        return model
+
+    def update_policy_order(self, sec, ptype, added=None, removed=None):
+        """called after rules of sec and ptype were changed, added are the rules appended to the policy
+        or None if rules were updated, removed are the removed rules. Models that keep the policies
+        in a computed order restore it here.
+        """
+        pass
+
     def get_policy(self, sec, ptype):
         """gets all rules in a policy."""
 
@@ -117,7 +174,10 @@ class Policy:
         """adds a policy rule to the model."""
         assertion = self[sec][ptype]
         if not self.has_policy(sec, ptype, rule):
+            was_valid = assertion.is_policy_valid()
+            rule = assertion.to_row(rule)
             assertion.policy.append(rule)
+            assertion.policy_changed(was_valid, [rule])
         else:
             return False
 
@@ -145,6 +205,7 @@ class Policy:
                 print(e)
 
         assertion.policy_map[DEFAULT_SEP.join(rule)] = len(assertion.policy) - 1
+        self.update_policy_order(sec, ptype, [rule])
         return True
 
     def add_policies(self, sec, ptype, rules):
@@ -173,6 +234,68 @@ class Policy:
             rules_added = True
         return rules_added
 
+    def add_policies_with_effected(self, sec, ptype, rules):
+        """adds policy rules to the model, returns the rules that were actually added."""
+        assertion = self[sec][ptype]
+        policy_map = assertion.get_policy_map()
+
+        was_valid = assertion.is_policy_valid()
+        effected = []
+        for rule in rules:
+            key = DEFAULT_SEP.join(rule)
+            if key in policy_map:
+                continue
+            rule = assertion.to_row(rule)
+            policy_map[key] = len(assertion.policy)
+            assertion.policy.append(rule)
+            effected.append(rule)
+
+        if effected and sec == "p" and assertion.priority_index >= 0:
+            try:
+                self._merge_policies_by_priority(assertion, len(effected))
+            except ValueError as e:
+                self.logger.warning("cannot sort policy by priority: %s", e)
+
+        if effected:
+            assertion.policy_changed(was_valid, effected)
+            assertion.policy_map_changed()
+            self.update_policy_order(sec, ptype, effected)
+
+        return effected
+
+    @staticmethod
+    def _merge_policies_by_priority(assertion, count):
+        """moves the last count rules of the sorted policy to their place by priority, each one after the
+        existing rules of the same priority, like add_policy.
+        """
+        index = assertion.priority_index
+        policy = assertion.policy
+        start = len(policy) - count
+        added = sorted(policy[start:], key=lambda rule: int(rule[index]))
+
+        positions = []
+        low = 0
+        for rule in added:
+            priority = int(rule[index])
+            high = start
+            while low < high:
+                middle = (low + high) // 2
+                if int(policy[middle][index]) <= priority:
+                    low = middle + 1
+                else:
+                    high = middle
+            positions.append(low)
+
+        merged = []
+        previous = 0
+        for position, rule in zip(positions, added):
+            merged.extend(policy[previous:position])
+            assertion.policy_map[DEFAULT_SEP.join(rule)] = len(merged)
+            merged.append(rule)
+            previous = position
+        merged.extend(policy[previous:start])
+        assertion.policy = merged
+
     def update_policy(self, sec, ptype, old_rule, new_rule):
         """update a policy rule from the model."""
 
@@ -188,14 +311,18 @@ class Policy:
         else:
             return False
 
+        was_valid = ast.is_policy_valid()
+
         if "p_priority" in ast.tokens:
             priority_index = ast.tokens.index("p_priority")
             if old_rule[priority_index] == new_rule[priority_index]:
-                ast.policy[rule_index] = new_rule
+                ast.policy[rule_index] = ast.to_row(new_rule)
             else:
                 raise Exception("New rule should have the same priority with old rule.")
         else:
-            ast.policy[rule_index] = new_rule
+            ast.policy[rule_index] = ast.to_row(new_rule)
+        ast.policy_changed(was_valid, [new_rule])
+        self.update_policy_order(sec, ptype)
 
         return True
 
@@ -218,16 +345,19 @@ class Policy:
             else:
                 return False
 
+        was_valid = ast.is_policy_valid()
         if "p_priority" in ast.tokens:
             priority_index = ast.tokens.index("p_priority")
             for idx, old_rule, new_rule in zip(old_rules_index, old_rules, new_rules):
                 if old_rule[priority_index] == new_rule[priority_index]:
-                    ast.policy[idx] = new_rule
+                    ast.policy[idx] = ast.to_row(new_rule)
                 else:
                     raise Exception("New rule should have the same priority with old rule.")
         else:
             for idx, old_rule, new_rule in zip(old_rules_index, old_rules, new_rules):
-                ast.policy[idx] = new_rule
+                ast.policy[idx] = ast.to_row(new_rule)
+        ast.policy_changed(was_valid, new_rules)
+        self.update_policy_order(sec, ptype)
 
         return True
 
@@ -236,7 +366,11 @@ class Policy:
         if not self.has_policy(sec, ptype, rule):
             return False
 
-        self[sec][ptype].policy.remove(rule)
+        assertion = self[sec][ptype]
+        was_valid = assertion.is_policy_valid()
+        assertion.policy.remove(rule)
+        assertion.policy_changed(was_valid)
+        self.update_policy_order(sec, ptype, [], [rule])
 
         return rule not in self[sec][ptype].policy
 
@@ -246,10 +380,14 @@ class Policy:
         for rule in rules:
             if not self.has_policy(sec, ptype, rule):
                 return False
-            self[sec][ptype].policy.remove(rule)
+            assertion = self[sec][ptype]
+            was_valid = assertion.is_policy_valid()
+            assertion.policy.remove(rule)
+            assertion.policy_changed(was_valid)
             if rule in self[sec][ptype].policy:
                 return False
 
+        self.update_policy_order(sec, ptype, [], rules)
         return True
 
     def remove_policies_with_effected(self, sec, ptype, rules):
@@ -261,6 +399,22 @@ class Policy:
 
         return effected
 
+    def discard_policies(self, sec, ptype, rules):
+        """removes the rules with a single pass over the policy, returns the number of removed rules."""
+        assertion = self[sec][ptype]
+        discarded = {tuple(rule) for rule in rules}
+        kept = []
+        removed = []
+        for rule in assertion.policy:
+            (removed if tuple(rule) in discarded else kept).append(rule)
+
+        assertion.policy = kept
+        if removed and assertion.policy_map:
+            assertion.policy_map = {DEFAULT_SEP.join(rule): i for i, rule in enumerate(kept)}
+        if removed:
+            self.update_policy_order(sec, ptype, [], removed)
+        return len(removed)
+
     def remove_filtered_policy_returns_effects(self, sec, ptype, field_index, *field_values):
         """
         remove_filtered_policy_returns_effects removes policy rules based on field filters from the model.
@@ -282,6 +436,7 @@ class Policy:
                 tmp.append(rule)
 
         self[sec][ptype].policy = tmp
+        self.update_policy_order(sec, ptype, [], effects)
 
         return effects
 
@@ -295,13 +450,16 @@ class Policy:
         if ptype not in self[sec]:
             return res
 
+        removed = []
         for rule in self[sec][ptype].policy:
             if all(value == "" or rule[field_index + i] == value for i, value in enumerate(field_values)):
+                removed.append(rule)
                 res = True
             else:
                 tmp.append(rule)
 
         self[sec][ptype].policy = tmp
+        self.update_policy_order(sec, ptype, [], removed)
 
         return res
 
@@ -0,0 +1,205 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import re
+
+try:
+    import numpy
+except ImportError:  # numpy is the optional "columnar" extra
+    numpy = None
+
+_COMPARISON = re.compile(r"^(\w+)\s*(==|!=)\s*(\w+|\"[^\"\\]*\"|'[^'\\]*')$")
+_ROLE_CALL = re.compile(r"^(\w+)\s*\(\s*(\w+)\s*,\s*(\w+)\s*(?:,\s*(\w+)\s*)?\)$")
+
+
+def is_columnar_supported():
+    """returns whether numpy is installed."""
+    return numpy is not None
+
+
+def _strip_parentheses(expr):
+    expr = expr.strip()
+    while expr.startswith("(") and expr.endswith(")"):
+        depth = 0
+        for i, char in enumerate(expr):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0 and i != len(expr) - 1:
+                    return expr
+        expr = expr[1:-1].strip()
+    return expr
+
+
+def _split_conjunction(expr):
+    """splits the top level && of the expression, returns None if it has a top level ||."""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    i = 0
+    while i < len(expr):
+        char = expr[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and expr.startswith("&&", i):
+            parts.append(expr[start:i])
+            start = i + 2
+            i += 1
+        elif depth == 0 and expr.startswith("||", i):
+            return None
+        i += 1
+    parts.append(expr[start:])
+    return parts
+
+
+@functools.lru_cache(maxsize=128)
+def get_column_conditions(exp_string, r_tokens, p_tokens):
+    """returns the (operator, p token, r token or None, literal) comparisons that every matching rule satisfies,
+    they are the top level conjuncts of the matcher that compare a policy field with a request field or a string.
+    """
+    parts = _split_conjunction(_strip_parentheses(exp_string))
+    if parts is None:
+        return ()
+
+    conditions = []
+    for part in parts:
+        match = _COMPARISON.match(_strip_parentheses(part))
+        if match is None:
+            continue
+        left, op, right = match.groups()
+        if left not in p_tokens:
+            left, right = right, left
+        if left not in p_tokens:
+            continue
+        if right in r_tokens:
+            conditions.append((op, left, right, None))
+        elif right[0] in "\"'":
+            conditions.append((op, left, None, right[1:-1]))
+    return tuple(conditions)
+
+
+@functools.lru_cache(maxsize=128)
+def get_exact_match_columns(exp_string, r_tokens, p_tokens):
+    """returns the (p token index, r token index) pairs of a matcher that only compares request fields with
+    policy fields using ==, one comparison for every policy field except eft, or None for other matchers.
+    """
+    parts = _split_conjunction(_strip_parentheses(exp_string))
+    if parts is None:
+        return None
+
+    conditions = get_column_conditions(exp_string, r_tokens, p_tokens)
+    if len(conditions) != len(parts) or any(op != "==" or r_token is None for op, _, r_token, _ in conditions):
+        return None
+
+    compared = set(p_token for _, p_token, _, _ in conditions)
+    if not all(p_token in compared for p_token in p_tokens if not p_token.endswith("_eft")):
+        return None
+    return tuple((p_tokens.index(p_token), r_tokens.index(r_token)) for _, p_token, r_token, _ in conditions)
+
+
+@functools.lru_cache(maxsize=128)
+def get_role_condition(exp_string, r_tokens, p_tokens, role_types):
+    """returns the (role type, r token, p token, domain r token or None) of the first top level conjunct
+    of the matcher like g(r_sub, p_sub) or g(r_sub, p_sub, r_dom), or None if there is none.
+    """
+    parts = _split_conjunction(_strip_parentheses(exp_string))
+    if parts is None:
+        return None
+
+    for part in parts:
+        match = _ROLE_CALL.match(_strip_parentheses(part))
+        if match is None:
+            continue
+        role_type, r_token, p_token, domain = match.groups()
+        if role_type in role_types and r_token in r_tokens and p_token in p_tokens:
+            if domain is None or domain in r_tokens:
+                return role_type, r_token, p_token, domain
+    return None
+
+
+class ColumnarPolicy:
+    """ColumnarPolicy keeps every field of a policy as a numpy array of integer codes, one dictionary per field,
+    so the rules that can match a request are selected with vectorised comparisons instead of one
+    matcher evaluation per rule.
+    """
+
+    def __init__(self, assertion):
+        if numpy is None:
+            raise ImportError("the columnar policy store requires numpy, install pycasbin[columnar]")
+
+        policy = assertion.policy
+        self.policy = policy
+        self.version = assertion.policy_version
+        self.size = len(policy)
+        self.dictionaries = dict()
+        self.columns = dict()
+        for i, token in enumerate(assertion.tokens):
+            dictionary = dict()
+            self.dictionaries[token] = dictionary
+            self.columns[token] = numpy.fromiter(
+                (dictionary.setdefault(rule[i], len(dictionary)) for rule in policy), dtype=numpy.int32, count=self.size
+            )
+
+    @staticmethod
+    def supports(assertion):
+        """returns whether the rules of the assertion can be stored in columns."""
+        count = len(assertion.tokens)
+        return isinstance(assertion.policy, list) and all(len(rule) == count for rule in assertion.policy)
+
+    def is_current(self, assertion):
+        """returns whether the columns still match the rules of the assertion."""
+        return (
+            self.policy is assertion.policy
+            and self.version == assertion.policy_version
+            and self.size == len(assertion.policy)
+        )
+
+    def get_candidates(self, conditions, r_parameters):
+        """returns the indexes of the rules that satisfy the conditions, in policy order,
+        or None if no condition applies to the request.
+        """
+        mask = None
+        for op, p_token, r_token, literal in conditions:
+            if r_token is not None:
+                value = r_parameters[r_token]
+                # only strings compare like the policy values, other request values are left to the matcher
+                if type(value) is not str:
+                    continue
+            else:
+                value = literal
+
+            code = self.dictionaries[p_token].get(value, -1)
+            if op == "==":
+                if code == -1:
+                    return []
+                condition = self.columns[p_token] == code
+            else:
+                if code == -1:
+                    continue
+                condition = self.columns[p_token] != code
+            mask = condition if mask is None else mask & condition
+
+        if mask is None:
+            return None
+        return numpy.flatnonzero(mask).tolist()
@@ -0,0 +1,50 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ExactMatchIndex:
+    """ExactMatchIndex maps the values of some fields of the rules to the indexes of the rules that have them,
+    so a matcher made of == comparisons of those fields is answered with one lookup, and a matcher with one
+    such comparison, like r.dom == p.dom, is only evaluated for the rules of the request value.
+    """
+
+    def __init__(self, assertion, columns):
+        policy = assertion.policy
+        self.policy = policy
+        self.version = assertion.policy_version
+        self.size = len(policy)
+        self.columns = columns
+
+        index = dict()
+        for i, rule in enumerate(policy):
+            index.setdefault(tuple([rule[column] for column in columns]), []).append(i)
+        self.index = index
+
+    @staticmethod
+    def supports(assertion):
+        """returns whether the rules of the assertion can be indexed."""
+        return isinstance(assertion.policy, list) and assertion.is_policy_valid()
+
+    def is_current(self, assertion, columns):
+        """returns whether the index still matches the rules of the assertion."""
+        return (
+            self.policy is assertion.policy
+            and self.version == assertion.policy_version
+            and self.size == len(assertion.policy)
+            and self.columns == columns
+        )
+
+    def get(self, values):
+        """returns the indexes of the rules with the values, in policy order."""
+        return self.index.get(values, ())
@@ -18,3 +18,4 @@ import enum
 class PolicyOp(enum.Enum):
     Policy_add = 1
     Policy_remove = 2
+    Policy_update = 3
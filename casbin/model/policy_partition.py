@@ -0,0 +1,83 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from array import array
+
+from casbin.effect import Effector
+
+
+class EffectPartition:
+    """EffectPartition keeps the indexes of the allow and the deny rules of a policy, by the value of
+    their eft field, so the rules that decide the result of an effector can be matched first.
+    """
+
+    def __init__(self, assertion, eft_index):
+        policy = assertion.policy
+        self.policy = policy
+        self.version = assertion.policy_version
+        self.size = len(policy)
+        self.eft_index = eft_index
+
+        effects = bytearray(self.size)
+        allow = array("q")
+        deny = array("q")
+        neither = array("q")
+        for i, rule in enumerate(policy):
+            eft = rule[eft_index]
+            if eft == "allow":
+                effects[i] = Effector.ALLOW
+                allow.append(i)
+            elif eft == "deny":
+                effects[i] = Effector.DENY
+                deny.append(i)
+            else:
+                effects[i] = Effector.INDETERMINATE
+                neither.append(i)
+
+        self.effects = effects
+        self.rows = {Effector.ALLOW: allow, Effector.DENY: deny}
+        # the rules without the effect are only needed when nothing decides, so they are merged when used
+        self._neither = neither
+        self.other_rows = dict()
+
+    @staticmethod
+    def supports(assertion):
+        """returns whether the rules of the assertion can be partitioned, a FastPolicy changes the rules it holds
+        with its filter without changing its version.
+        """
+        return isinstance(assertion.policy, list)
+
+    def is_current(self, assertion, eft_index):
+        """returns whether the partition still matches the rules of the assertion."""
+        return (
+            self.policy is assertion.policy
+            and self.version == assertion.policy_version
+            and self.size == len(assertion.policy)
+            and self.eft_index == eft_index
+        )
+
+    def split(self, effect, candidates=None):
+        """returns the indexes of the rules with the effect and the indexes of the other rules, in policy order,
+        only among the candidates if they are given.
+        """
+        if candidates is None:
+            other_rows = self.other_rows.get(effect)
+            if other_rows is None:
+                other = self.rows[Effector.DENY if effect == Effector.ALLOW else Effector.ALLOW]
+                other_rows = array("q", sorted(other + self._neither)) if self._neither else other
+                self.other_rows[effect] = other_rows
+            return self.rows[effect], other_rows
+
+        effects = self.effects
+        return [i for i in candidates if effects[i] == effect], [i for i in candidates if effects[i] != effect]
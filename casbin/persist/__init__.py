@@ -16,3 +16,4 @@ from .adapter import *
 from .adapter_filtered import *
 from .adapters import *
 from .batch_adapter import *
+from .streaming_adapter import *
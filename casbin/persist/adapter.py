@@ -26,6 +26,10 @@ def _extract_tokens(line):
     if line[:1] == "#":
         return None
 
+    # fast path: without any nesting the tokens are just the comma separated values
+    if "(" not in line and "[" not in line and ")" not in line and "]" not in line:
+        return [token.strip() for token in line.split(",")]
+
     stack = []
     tokens = []
 
@@ -75,6 +79,76 @@ def load_policy_line(line, model):
     model.model[sec][key].policy.append(tokens[1:])
 
 
+def load_policy_lines(lines, model):
+    """loads text lines as policy rules to model.
+
+    Equivalent to calling load_policy_line for every line, but each ptype's policy is only looked up once.
+    """
+
+    appenders = {}
+    sections = model.model
+
+    for line in lines:
+        tokens = _extract_tokens(line)
+        if tokens is None:
+            continue
+
+        key = tokens[0]
+        if key in appenders:
+            append = appenders[key]
+        else:
+            sec = key[0]
+            append = None
+            if sec in sections and key in sections[sec]:
+                append = sections[sec][key].policy.append
+            appenders[key] = append
+
+        if append is not None:
+            append(tokens[1:])
+
+
+def iter_policy_batches(lines, batch_size=1000):
+    """yields the rules of text lines as lists of up to batch_size (ptype, rule) tuples."""
+
+    batch = []
+    for line in lines:
+        tokens = _extract_tokens(line)
+        if tokens is None:
+            continue
+
+        batch.append((tokens[0], tokens[1:]))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def read_policy_lines(file, chunk_size=1 << 20):
+    """yields the stripped lines of a binary policy file, reading it in large chunks."""
+
+    pending = b""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+
+        if pending:
+            chunk = pending + chunk
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            pending = chunk
+            continue
+
+        pending = chunk[end:]
+        for line in chunk[: end - 1].decode().split("\n"):
+            yield line.strip()
+
+    if pending:
+        yield pending.decode().strip()
+
+
 class Adapter:
     """the interface for Casbin adapters."""
 
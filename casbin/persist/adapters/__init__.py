@@ -15,9 +15,23 @@
 from .string_adapter import StringAdapter
 from .file_adapter import FileAdapter
 from .filtered_file_adapter import FilteredFileAdapter
+from .journaled_file_adapter import JournaledFileAdapter
+from .snapshot_adapter import SnapshotAdapter
+from .sqlite_adapter import SQLiteAdapter
+from .write_behind_adapter import WriteBehindAdapter
 from ..update_adapter import UpdateAdapter
 
 # alias import for backwards compatibility
 FilteredAdapter = FilteredFileAdapter
 
-__all__ = ["StringAdapter", "FileAdapter", "FilteredFileAdapter", "FilteredAdapter", "UpdateAdapter"]
+__all__ = [
+    "StringAdapter",
+    "FileAdapter",
+    "FilteredFileAdapter",
+    "FilteredAdapter",
+    "JournaledFileAdapter",
+    "UpdateAdapter",
+    "SnapshotAdapter",
+    "SQLiteAdapter",
+    "WriteBehindAdapter",
+]
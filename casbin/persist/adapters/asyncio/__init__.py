@@ -2,6 +2,8 @@ from .adapter import AsyncAdapter
 from .adapter_filtered import AsyncFilteredAdapter
 from .batch_adapter import AsyncBatchAdapter
 from .file_adapter import AsyncFileAdapter
+from .sqlite_adapter import AsyncSQLiteAdapter
+from .streaming_adapter import AsyncStreamingAdapter
 from .update_adapter import AsyncUpdateAdapter
 
 __all__ = [
@@ -9,5 +11,7 @@ __all__ = [
     "AsyncFilteredAdapter",
     "AsyncBatchAdapter",
     "AsyncFileAdapter",
+    "AsyncSQLiteAdapter",
+    "AsyncStreamingAdapter",
     "AsyncUpdateAdapter",
 ]
@@ -12,54 +12,76 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import functools
 import os
 
-from ...adapter import load_policy_line
+from ...adapter import iter_policy_batches, load_policy_lines, read_policy_lines
 from .adapter import AsyncAdapter
+from .streaming_adapter import AsyncStreamingAdapter
 
 
-class AsyncFileAdapter(AsyncAdapter):
+class AsyncFileAdapter(AsyncAdapter, AsyncStreamingAdapter):
     """the async file adapter for Casbin.
     It can load policy from file or save policy to file.
+    The file is read and written in an executor, so the event loop is not blocked by the disk.
     """
 
     _file_path = ""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, executor=None):
         self._file_path = file_path
+        self._executor = executor
 
-    async def load_policy(self, model):
-        if not os.path.isfile(self._file_path):
-            raise RuntimeError("invalid file path, file path cannot be empty")
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
 
-        self._load_policy_file(model)
+    async def load_policy(self, model):
+        await self._run(self._load_policy_file, model)
+
+    async def aiter_policy(self, batch_size=1000):
+        file = await self._run(self._open_policy_file)
+        try:
+            batches = iter_policy_batches(read_policy_lines(file), batch_size)
+            while True:
+                batch = await self._run(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            file.close()
 
     async def save_policy(self, model):
+        # the rule lists are copied here, the loop may change the model while the file is written
+        policies = []
+        for sec in ["p", "g"]:
+            if sec in model.model.keys():
+                for key, ast in model.model[sec].items():
+                    policies.append((key, list(ast.policy)))
+
+        await self._run(self._save_policy_file, policies)
+
+    def _open_policy_file(self):
         if not os.path.isfile(self._file_path):
             raise RuntimeError("invalid file path, file path cannot be empty")
 
-        self._save_policy_file(model)
+        return open(self._file_path, "rb")
 
     def _load_policy_file(self, model):
-        with open(self._file_path, "rb") as file:
-            line = file.readline()
-            while line:
-                load_policy_line(line.decode().strip(), model)
-                line = file.readline()
+        with self._open_policy_file() as file:
+            load_policy_lines(read_policy_lines(file), model)
+
+    def _save_policy_file(self, policies):
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
 
-    def _save_policy_file(self, model):
         with open(self._file_path, "w") as file:
             lines = []
 
-            if "p" in model.model.keys():
-                for key, ast in model.model["p"].items():
-                    for pvals in ast.policy:
-                        lines.append(key + ", " + ", ".join(pvals))
-
-            if "g" in model.model.keys():
-                for key, ast in model.model["g"].items():
-                    for pvals in ast.policy:
-                        lines.append(key + ", " + ", ".join(pvals))
+            for key, rules in policies:
+                for pvals in rules:
+                    lines.append(key + ", " + ", ".join(pvals))
 
             for i, line in enumerate(lines):
                 if i != len(lines) - 1:
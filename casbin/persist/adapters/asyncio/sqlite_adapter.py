@@ -0,0 +1,78 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+
+from ..sqlite_adapter import SQLiteAdapter
+from .adapter import AsyncAdapter
+from .adapter_filtered import AsyncFilteredAdapter
+from .batch_adapter import AsyncBatchAdapter
+from .update_adapter import AsyncUpdateAdapter
+
+
+class AsyncSQLiteAdapter(AsyncAdapter, AsyncBatchAdapter, AsyncUpdateAdapter, AsyncFilteredAdapter):
+    """the async SQLite adapter for Casbin.
+    It runs the statements of a SQLiteAdapter in an executor, so the event loop is not blocked by the database.
+    """
+
+    def __init__(self, database, table_name="casbin_rule", fetch_size=1000, executor=None):
+        self._adapter = SQLiteAdapter(database, table_name, fetch_size)
+        self._executor = executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def close(self):
+        """closes the database connection."""
+        self._adapter.close()
+
+    def is_filtered(self):
+        return self._adapter.is_filtered()
+
+    async def load_policy(self, model):
+        await self._run(self._adapter.load_policy, model)
+
+    async def load_filtered_policy(self, model, filter):
+        await self._run(self._adapter.load_filtered_policy, model, filter)
+
+    async def save_policy(self, model):
+        return await self._run(self._adapter.save_policy, model)
+
+    async def add_policy(self, sec, ptype, rule):
+        return await self._run(self._adapter.add_policy, sec, ptype, rule)
+
+    async def add_policies(self, sec, ptype, rules):
+        return await self._run(self._adapter.add_policies, sec, ptype, rules)
+
+    async def remove_policy(self, sec, ptype, rule):
+        return await self._run(self._adapter.remove_policy, sec, ptype, rule)
+
+    async def remove_policies(self, sec, ptype, rules):
+        return await self._run(self._adapter.remove_policies, sec, ptype, rules)
+
+    async def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        return await self._run(self._adapter.remove_filtered_policy, sec, ptype, field_index, *field_values)
+
+    async def update_policy(self, sec, ptype, old_rule, new_policy):
+        return await self._run(self._adapter.update_policy, sec, ptype, old_rule, new_policy)
+
+    async def update_policies(self, sec, ptype, old_rules, new_rules):
+        return await self._run(self._adapter.update_policies, sec, ptype, old_rules, new_rules)
+
+    async def update_filtered_policies(self, sec, ptype, new_rules, field_index, *field_values):
+        return await self._run(
+            self._adapter.update_filtered_policies, sec, ptype, new_rules, field_index, *field_values
+        )
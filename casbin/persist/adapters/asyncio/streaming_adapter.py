@@ -0,0 +1,28 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABCMeta, abstractmethod
+
+
+class AsyncStreamingAdapter(metaclass=ABCMeta):
+    """AsyncStreamingAdapter is the interface for async Casbin adapters that can stream their policy rules,
+    so the enforcer adds them to the model and the role managers while they are read.
+    """
+
+    @abstractmethod
+    def aiter_policy(self, batch_size=1000):
+        """returns an async iterator of lists of up to batch_size (ptype, rule) tuples with all policy rules
+        of the storage, usually as an async generator.
+        """
+        pass
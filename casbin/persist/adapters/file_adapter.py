@@ -14,10 +14,11 @@
 
 import os
 
-from ..adapter import Adapter, load_policy_line
+from ..adapter import iter_policy_batches, load_policy_lines, read_policy_lines
+from ..streaming_adapter import StreamingAdapter
 
 
-class FileAdapter(Adapter):
+class FileAdapter(StreamingAdapter):
     """the file adapter for Casbin.
     It can load policy from file or save policy to file.
     """
@@ -33,6 +34,13 @@ class FileAdapter(Adapter):
 
         self._load_policy_file(model)
 
+    def iter_policy(self, batch_size=1000):
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
+
+        with open(self._file_path, "rb") as file:
+            yield from iter_policy_batches(read_policy_lines(file), batch_size)
+
     def save_policy(self, model):
         if not os.path.isfile(self._file_path):
             raise RuntimeError("invalid file path, file path cannot be empty")
@@ -41,10 +49,7 @@ class FileAdapter(Adapter):
 
     def _load_policy_file(self, model):
         with open(self._file_path, "rb") as file:
-            line = file.readline()
-            while line:
-                load_policy_line(line.decode().strip(), model)
-                line = file.readline()
+            load_policy_lines(read_policy_lines(file), model)
 
     def _save_policy_file(self, model):
         with open(self._file_path, "w") as file:
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import logging
 import os
 
 from casbin import persist
@@ -26,15 +28,121 @@ class Filter:
     G = []
 
 
+class PolicyFileIndex:
+    """PolicyFileIndex maps the ptype and the leading field values of the lines of a policy file
+    to their byte offsets, so a filtered load only reads the lines that can match.
+
+    It is kept in a sidecar file (file_path + ".idx" by default) and rebuilt when the size or
+    the modification time of the policy file changes.
+    """
+
+    VERSION = 1
+
+    def __init__(self, file_path, index_path=None, columns=3):
+        self.logger = logging.getLogger("casbin.adapter")
+        self.file_path = file_path
+        self.index_path = index_path or file_path + ".idx"
+        self.columns = columns
+        self._stamp = None
+        self._ptypes = {}
+
+    def _file_stamp(self):
+        stat = os.stat(self.file_path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def refresh(self):
+        """makes sure the index matches the policy file, reading or rebuilding the sidecar if needed."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+
+        if not self._read(stamp):
+            self._build()
+            self._write(stamp)
+        self._stamp = stamp
+
+    def _read(self, stamp):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != self.VERSION or data.get("stamp") != stamp or data.get("columns") != self.columns:
+            return False
+        self._ptypes = data["ptypes"]
+        return True
+
+    def _build(self):
+        ptypes = {}
+        offset = 0
+        with open(self.file_path, "rb") as file:
+            for raw in file:
+                start = offset
+                offset += len(raw)
+                line = raw.decode().strip()
+                if not line or line[:1] == "#":
+                    continue
+
+                p = line.split(",")
+                ptype = p[0].strip()
+                entry = ptypes.get(ptype)
+                if entry is None:
+                    entry = ptypes[ptype] = {"all": [], "fields": [{} for _ in range(self.columns)]}
+                entry["all"].append(start)
+                for i, value in enumerate(p[1 : self.columns + 1]):
+                    entry["fields"][i].setdefault(value.strip(), []).append(start)
+        self._ptypes = ptypes
+
+    def _write(self, stamp):
+        data = {"version": self.VERSION, "stamp": stamp, "columns": self.columns, "ptypes": self._ptypes}
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # the index still works from memory, it is only rebuilt on the next start
+            self.logger.warning("cannot write policy index %s: %r", self.index_path, e)
+
+    def offsets(self, filter):
+        """returns the sorted offsets of the lines that may pass filter_line, a superset of the matches."""
+        result = []
+        for ptype, entry in self._ptypes.items():
+            if ptype == "p":
+                filter_slice = filter[0]
+            elif ptype == "g":
+                filter_slice = filter[1]
+            else:
+                filter_slice = []
+
+            candidates = entry["all"]
+            for i, v in enumerate(filter_slice[: self.columns]):
+                if v and v.strip():
+                    matches = entry["fields"][i].get(v.strip(), [])
+                    if len(matches) < len(candidates):
+                        candidates = matches
+            result.extend(candidates)
+
+        result.sort()
+        return result
+
+
 class FilteredFileAdapter(FileAdapter, FilteredAdapter):
+    """the filtered file adapter for Casbin.
+    With use_index, filtered loads look up the matching lines in a PolicyFileIndex
+    (the ptype and the first index_columns fields of every line) instead of scanning the whole file.
+    """
+
     filtered = False
     _file_path = ""
     filter = Filter()
 
     # new_filtered_adapter is the constructor for FilteredAdapter.
-    def __init__(self, file_path):
+    def __init__(self, file_path, use_index=False, index_path=None, index_columns=3):
         self.filtered = True
         self._file_path = file_path
+        self._index = PolicyFileIndex(file_path, index_path, index_columns) if use_index else None
 
     def load_policy(self, model):
         if not os.path.isfile(self._file_path):
@@ -42,6 +150,10 @@ class FilteredFileAdapter(FileAdapter, FilteredAdapter):
         self.filtered = False
         self._load_policy_file(model)
 
+    def iter_policy(self, batch_size=1000):
+        self.filtered = False
+        yield from super().iter_policy(batch_size)
+
     # load_filtered_policy loads only policy rules that match the filter.
     def load_filtered_policy(self, model, filter):
         if filter == None:
@@ -64,6 +176,18 @@ class FilteredFileAdapter(FileAdapter, FilteredAdapter):
         self.filtered = True
 
     def load_filtered_policy_file(self, model, filter, handler):
+        if self._index is not None:
+            self._index.refresh()
+            with open(self._file_path, "rb") as file:
+                for offset in self._index.offsets(filter):
+                    file.seek(offset)
+                    line = file.readline().decode().strip()
+                    if filter_line(line, filter):
+                        continue
+
+                    handler(line, model)
+            return
+
         with open(self._file_path, "rb") as file:
             for line in file:
                 line = line.decode().strip()
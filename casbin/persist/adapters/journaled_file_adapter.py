@@ -0,0 +1,270 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import threading
+import time
+
+from ..adapter import _extract_tokens, load_policy_lines, read_policy_lines
+from ..update_adapter import UpdateAdapter
+from .file_adapter import FileAdapter
+
+JOURNAL_ADD = "+"
+JOURNAL_REMOVE = "-"
+JOURNAL_REMOVE_FILTERED = "~"
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+
+
+class JournaledFileAdapter(FileAdapter, UpdateAdapter):
+    """the journaled file adapter for Casbin.
+
+    The base file has the same CSV format as FileAdapter. Auto-save changes are appended to
+    a journal next to it (file_path + ".journal" by default), one record per rule:
+
+        +, p, alice, data1, read
+        -, g, bob, admin
+        ~, p, 0, bob
+
+    so a change costs one append instead of rewriting the whole file. Loading replays the
+    journal on top of the base file. Once the journal holds compact_threshold records it is
+    folded into the base file, in a background thread unless background_compaction is false.
+
+    fsync controls durability of the journal: "always" syncs every write, "interval" syncs at
+    most every fsync_interval seconds and "never" leaves it to the operating system.
+    """
+
+    def __init__(
+        self,
+        file_path,
+        journal_path=None,
+        fsync=FSYNC_ALWAYS,
+        fsync_interval=1.0,
+        compact_threshold=10000,
+        background_compaction=True,
+    ):
+        if fsync not in (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER):
+            raise ValueError("invalid fsync policy: {}".format(fsync))
+
+        super().__init__(file_path)
+        self.logger = logging.getLogger("casbin.adapter")
+        self._journal_path = journal_path or file_path + ".journal"
+        self._fsync = fsync
+        self._fsync_interval = fsync_interval
+        self._compact_threshold = compact_threshold
+        self._background_compaction = background_compaction
+
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._journal = None
+        self._last_sync = 0.0
+        self._records = 0
+        self._compaction = None
+
+    @property
+    def _old_journal_path(self):
+        # a journal that is being folded into the base file
+        return self._journal_path + ".old"
+
+    def load_policy(self, model):
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
+
+        with self._lock:
+            journals = [path for path in (self._old_journal_path, self._journal_path) if os.path.isfile(path)]
+            if not any(os.path.getsize(path) for path in journals):
+                self._records = 0
+                self._load_policy_file(model)
+                return
+
+            rows, self._records = self._replay(journals)
+
+        load_policy_lines((", ".join(row) for row in rows), model)
+        self._maybe_compact()
+
+    def save_policy(self, model):
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
+
+        with self._compact_lock, self._lock:
+            lines = []
+            for sec in ["p", "g"]:
+                if sec not in model.model.keys():
+                    continue
+                for key, ast in model.model[sec].items():
+                    lines.extend(key + ", " + ", ".join(pvals) for pvals in ast.policy)
+            self._write_base(lines)
+            self._close_journal()
+            for path in (self._journal_path, self._old_journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._records = 0
+
+    def add_policy(self, sec, ptype, rule):
+        self._append(ptype, [(JOURNAL_ADD, rule)])
+
+    def add_policies(self, sec, ptype, rules):
+        self._append(ptype, [(JOURNAL_ADD, rule) for rule in rules])
+
+    def add_policies_ex(self, sec, ptype, rules):
+        self.add_policies(sec, ptype, rules)
+
+    def remove_policy(self, sec, ptype, rule):
+        self._append(ptype, [(JOURNAL_REMOVE, rule)])
+
+    def remove_policies(self, sec, ptype, rules):
+        self._append(ptype, [(JOURNAL_REMOVE, rule) for rule in rules])
+
+    def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        self._append(ptype, [(JOURNAL_REMOVE_FILTERED, [str(field_index)] + list(field_values))])
+
+    def update_policy(self, sec, ptype, old_rule, new_policy):
+        self.update_policies(sec, ptype, [old_rule], [new_policy])
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        records = [(JOURNAL_REMOVE, rule) for rule in old_rules]
+        records.extend((JOURNAL_ADD, rule) for rule in new_rules)
+        self._append(ptype, records)
+
+    def journal_size(self):
+        """returns the number of records in the journal that are not part of the base file yet."""
+        with self._lock:
+            return self._records
+
+    def compact(self):
+        """folds the journal into the base file."""
+        with self._compact_lock:
+            with self._lock:
+                if not os.path.isfile(self._old_journal_path):
+                    if not os.path.isfile(self._journal_path):
+                        return
+                    # writers continue with a fresh journal while the old one is folded in
+                    self._close_journal()
+                    os.replace(self._journal_path, self._old_journal_path)
+                    self._records = 0
+
+            rows, _ = self._replay([self._old_journal_path])
+            tmp_path = self._write_base((", ".join(row) for row in rows), replace=False)
+
+            with self._lock:
+                os.replace(tmp_path, self._file_path)
+                os.remove(self._old_journal_path)
+
+    def close(self):
+        """waits for a running compaction and closes the journal."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            self._close_journal()
+
+    def _append(self, ptype, records):
+        records = [op + ", " + ptype + ", " + ", ".join(rule) + "\n" for op, rule in records]
+        if not records:
+            return
+
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self._journal_path, "a", encoding="utf-8")
+            self._journal.write("".join(records))
+            self._journal.flush()
+            if self._fsync == FSYNC_ALWAYS or (
+                self._fsync == FSYNC_INTERVAL and time.monotonic() - self._last_sync >= self._fsync_interval
+            ):
+                os.fsync(self._journal.fileno())
+                self._last_sync = time.monotonic()
+            self._records += len(records)
+
+        self._maybe_compact()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.flush()
+            if self._fsync != FSYNC_NEVER:
+                os.fsync(self._journal.fileno())
+            self._journal.close()
+            self._journal = None
+
+    def _replay(self, journals):
+        """applies the journal records on top of the base file, returns the rows and the number of records."""
+        rows = {}
+        with open(self._file_path, "rb") as file:
+            for line in read_policy_lines(file):
+                tokens = _extract_tokens(line)
+                if tokens is not None:
+                    rows.setdefault(tuple(tokens), tokens)
+
+        records = 0
+        for path in journals:
+            if not os.path.isfile(path):
+                continue
+            with open(path, "rb") as file:
+                for line in read_policy_lines(file):
+                    tokens = _extract_tokens(line)
+                    if tokens is None or len(tokens) < 2:
+                        continue
+                    records += 1
+                    op, row = tokens[0], tokens[1:]
+                    if op == JOURNAL_ADD:
+                        rows.setdefault(tuple(row), row)
+                    elif op == JOURNAL_REMOVE:
+                        rows.pop(tuple(row), None)
+                    elif op == JOURNAL_REMOVE_FILTERED:
+                        self._remove_filtered_rows(rows, row[0], int(row[1]), row[2:])
+
+        return list(rows.values()), records
+
+    @staticmethod
+    def _remove_filtered_rows(rows, ptype, field_index, field_values):
+        # row[0] is the ptype, so the rule fields start at 1
+        start = field_index + 1
+        for key, row in list(rows.items()):
+            if row[0] != ptype or len(row) < start + len(field_values):
+                continue
+            if all(value == "" or row[start + i] == value for i, value in enumerate(field_values)):
+                del rows[key]
+
+    def _write_base(self, lines, replace=True):
+        tmp_path = self._file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+        if not replace:
+            return tmp_path
+        os.replace(tmp_path, self._file_path)
+
+    def _maybe_compact(self):
+        if self._compact_threshold is None or self._records < self._compact_threshold:
+            return
+        if not self._background_compaction:
+            self.compact()
+            return
+
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._compaction = threading.Thread(
+                target=self._compact_in_background, name="casbin-journal-compaction", daemon=True
+            )
+            self._compaction.start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            self.logger.error("journal compaction failed: %r", e)
@@ -0,0 +1,203 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import array
+import hashlib
+import os
+import struct
+import sys
+
+from ..adapter import Adapter
+
+SNAPSHOT_MAGIC = b"CASBSNAP"
+SNAPSHOT_VERSION = 1
+
+# magic, format version, model fingerprint
+_HEADER = struct.Struct("<8sI32s")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_UINT_TYPECODE = "I" if array.array("I").itemsize == 4 else "L"
+
+
+def model_fingerprint(model):
+    """returns a digest of the model definition, snapshots taken with another model are rejected."""
+    digest = hashlib.sha256()
+    for sec in sorted(model.keys()):
+        for key in sorted(model[sec].keys()):
+            digest.update("{}.{} = {}\n".format(sec, key, model[sec][key].value).encode())
+    return digest.digest()
+
+
+def _pack_uints(values):
+    values = array.array(_UINT_TYPECODE, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+class _SnapshotReader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def read(self, size):
+        end = self.offset + size
+        if end > len(self.data):
+            raise RuntimeError("invalid policy snapshot: unexpected end of data")
+        chunk = self.data[self.offset : end]
+        self.offset = end
+        return chunk
+
+    def u32(self):
+        return _U32.unpack(self.read(_U32.size))[0]
+
+    def u64(self):
+        return _U64.unpack(self.read(_U64.size))[0]
+
+    def uints(self, count):
+        values = array.array(_UINT_TYPECODE)
+        values.frombytes(self.read(count * values.itemsize))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def text(self):
+        return bytes(self.read(self.u32())).decode()
+
+
+def save_policy_snapshot(model, file_path):
+    """writes the policy of the model to a binary snapshot file.
+
+    Layout: header, string table (every distinct value once), then for each ptype the rows
+    as indexes into the string table, in the current (already sorted) order of the model.
+    """
+    table = {}
+    sections = []
+    for sec in ["p", "g"]:
+        if sec not in model.keys():
+            continue
+        for key, ast in model[sec].items():
+            lengths = []
+            flat = []
+            for rule in ast.policy:
+                lengths.append(len(rule))
+                flat.extend(table.setdefault(value, len(table)) for value in rule)
+            sections.append((key, lengths, flat))
+
+    strings = list(table)
+    blob = "".join(strings).encode()
+
+    chunks = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, model_fingerprint(model))]
+    chunks.append(_U32.pack(len(strings)))
+    chunks.append(_pack_uints(len(s) for s in strings))
+    chunks.append(_U64.pack(len(blob)))
+    chunks.append(blob)
+
+    chunks.append(_U32.pack(len(sections)))
+    for key, lengths, flat in sections:
+        encoded_key = key.encode()
+        width = lengths[0] if lengths and lengths.count(lengths[0]) == len(lengths) else 0
+        chunks.append(_U32.pack(len(encoded_key)))
+        chunks.append(encoded_key)
+        chunks.append(_U32.pack(len(lengths)))
+        chunks.append(_U32.pack(width))
+        if width == 0:
+            chunks.append(_pack_uints(lengths))
+        chunks.append(_U64.pack(len(flat)))
+        chunks.append(_pack_uints(flat))
+
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.writelines(chunks)
+    os.replace(tmp_path, file_path)
+
+
+def load_policy_snapshot(model, file_path):
+    """loads the policy rules of a binary snapshot file into the model, in their saved order."""
+    with open(file_path, "rb") as file:
+        reader = _SnapshotReader(memoryview(file.read()))
+
+    magic, version, fingerprint = _HEADER.unpack(reader.read(_HEADER.size))
+    if magic != SNAPSHOT_MAGIC:
+        raise RuntimeError("invalid policy snapshot: bad magic number")
+    if version != SNAPSHOT_VERSION:
+        raise RuntimeError("unsupported policy snapshot version: {}".format(version))
+    if fingerprint != model_fingerprint(model):
+        raise RuntimeError("policy snapshot was taken with a different model")
+
+    lengths = reader.uints(reader.u32())
+    text = bytes(reader.read(reader.u64())).decode()
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start : start + length])
+        start += length
+
+    for _ in range(reader.u32()):
+        key = reader.text()
+        row_count = reader.u32()
+        width = reader.u32()
+        row_lengths = reader.uints(row_count) if width == 0 else None
+        values = [strings[i] for i in reader.uints(reader.u64())]
+
+        if width:
+            rows = [values[i : i + width] for i in range(0, len(values), width)]
+        else:
+            rows = []
+            start = 0
+            for length in row_lengths:
+                rows.append(values[start : start + length])
+                start += length
+
+        sec = key[0]
+        if sec not in model.keys() or key not in model[sec]:
+            continue
+        policy = model[sec][key].policy
+        if hasattr(policy, "extend"):
+            policy.extend(rows)
+        else:
+            for row in rows:
+                policy.append(row)
+
+
+class SnapshotAdapter(Adapter):
+    """the snapshot adapter for Casbin.
+    It loads and saves the policy as a versioned binary snapshot, which is much faster to read than CSV.
+    """
+
+    _file_path = ""
+
+    def __init__(self, file_path):
+        self._file_path = file_path
+
+    def load_policy(self, model):
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
+
+        load_policy_snapshot(model, self._file_path)
+
+    def save_policy(self, model):
+        save_policy_snapshot(model, self._file_path)
+
+    def add_policy(self, sec, ptype, rule):
+        pass
+
+    def add_policies(self, sec, ptype, rules):
+        pass
+
+    def remove_policy(self, sec, ptype, rule):
+        pass
+
+    def remove_policies(self, sec, ptype, rules):
+        pass
@@ -0,0 +1,228 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import threading
+
+from ..adapter_filtered import FilteredAdapter
+from ..batch_adapter import BatchAdapter
+from ..update_adapter import UpdateAdapter
+
+FIELD_COUNT = 6
+
+_FIELDS = ["v{}".format(i) for i in range(FIELD_COUNT)]
+_COLUMNS = ", ".join(["ptype"] + _FIELDS)
+_MATCH_RULE = " AND ".join("{} IS ?".format(column) for column in ["ptype"] + _FIELDS)
+_PLACEHOLDERS = ", ".join("?" * (FIELD_COUNT + 1))
+
+
+class Filter:
+    """Filter selects the rules of a filtered load, every non-empty list restricts its column to those values."""
+
+    def __init__(self, ptype=None, v0=None, v1=None, v2=None, v3=None, v4=None, v5=None):
+        self.ptype = ptype or []
+        self.v0 = v0 or []
+        self.v1 = v1 or []
+        self.v2 = v2 or []
+        self.v3 = v3 or []
+        self.v4 = v4 or []
+        self.v5 = v5 or []
+
+
+class SQLiteAdapter(BatchAdapter, UpdateAdapter, FilteredAdapter):
+    """the SQLite adapter for Casbin.
+    It stores the policy in a casbin_rule table (ptype, v0 .. v5) with an index per column,
+    so every auto-save change is a single indexed statement.
+    """
+
+    def __init__(self, database, table_name="casbin_rule", fetch_size=1000):
+        self._table = table_name
+        self._fetch_size = fetch_size
+        self._filtered = False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._create_table()
+
+    def _create_table(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS {} (id INTEGER PRIMARY KEY, ptype TEXT NOT NULL, {})".format(
+                    self._table, ", ".join("{} TEXT".format(field) for field in _FIELDS)
+                )
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_{0}_ptype ON {0} (ptype, v0)".format(self._table),
+            )
+            for field in _FIELDS[1:]:
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_{0}_{1} ON {0} (ptype, {1})".format(self._table, field),
+                )
+
+    def close(self):
+        """closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_row(ptype, rule):
+        if len(rule) > FIELD_COUNT:
+            raise ValueError("the SQLite adapter supports at most {} policy fields".format(FIELD_COUNT))
+        return [ptype] + list(rule) + [None] * (FIELD_COUNT - len(rule))
+
+    @staticmethod
+    def _to_rule(fields):
+        rule = list(fields)
+        while rule and rule[-1] is None:
+            rule.pop()
+        return rule
+
+    def _load_rows(self, model, query, params=()):
+        appenders = {}
+        sections = model.model
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self._fetch_size)
+                if not rows:
+                    break
+
+                for row in rows:
+                    ptype = row[0]
+                    if ptype in appenders:
+                        append = appenders[ptype]
+                    else:
+                        sec = ptype[0]
+                        append = None
+                        if sec in sections and ptype in sections[sec]:
+                            append = sections[sec][ptype].policy.append
+                        appenders[ptype] = append
+
+                    if append is not None:
+                        append(self._to_rule(row[1:]))
+
+    def load_policy(self, model):
+        self._filtered = False
+        self._load_rows(model, "SELECT {} FROM {} ORDER BY id".format(_COLUMNS, self._table))
+
+    def load_filtered_policy(self, model, filter):
+        if filter is None:
+            return self.load_policy(model)
+
+        conditions = []
+        params = []
+        for column in ["ptype"] + _FIELDS:
+            values = getattr(filter, column, None)
+            if values:
+                conditions.append("{} IN ({})".format(column, ", ".join("?" * len(values))))
+                params.extend(values)
+
+        query = "SELECT {} FROM {}".format(_COLUMNS, self._table)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        self._load_rows(model, query + " ORDER BY id", params)
+        self._filtered = bool(conditions)
+
+    def is_filtered(self):
+        return self._filtered
+
+    def save_policy(self, model):
+        rows = []
+        for sec in ["p", "g"]:
+            if sec not in model.model.keys():
+                continue
+            for ptype, ast in model.model[sec].items():
+                rows.extend(self._to_row(ptype, rule) for rule in ast.policy)
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM {}".format(self._table))
+            self._insert(rows)
+        return True
+
+    def _insert(self, rows):
+        self._conn.executemany("INSERT INTO {} ({}) VALUES ({})".format(self._table, _COLUMNS, _PLACEHOLDERS), rows)
+
+    def add_policy(self, sec, ptype, rule):
+        return self.add_policies(sec, ptype, [rule])
+
+    def add_policies(self, sec, ptype, rules):
+        rows = [self._to_row(ptype, rule) for rule in rules]
+        with self._lock, self._conn:
+            self._insert(rows)
+        return True
+
+    def add_policies_ex(self, sec, ptype, rules):
+        rows = [self._to_row(ptype, rule) for rule in rules]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO {0} ({1}) SELECT {2} WHERE NOT EXISTS (SELECT 1 FROM {0} WHERE {3})".format(
+                    self._table, _COLUMNS, _PLACEHOLDERS, _MATCH_RULE
+                ),
+                [row + row for row in rows],
+            )
+        return True
+
+    def remove_policy(self, sec, ptype, rule):
+        return self.remove_policies(sec, ptype, [rule])
+
+    def remove_policies(self, sec, ptype, rules):
+        rows = [self._to_row(ptype, rule) for rule in rules]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM {} WHERE {}".format(self._table, _MATCH_RULE), rows)
+        return True
+
+    def _filter_condition(self, ptype, field_index, field_values):
+        conditions = ["ptype = ?"]
+        params = [ptype]
+        for i, value in enumerate(field_values):
+            if value != "":
+                conditions.append("{} = ?".format(_FIELDS[field_index + i]))
+                params.append(value)
+        return " AND ".join(conditions), params
+
+    def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        condition, params = self._filter_condition(ptype, field_index, field_values)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM {} WHERE {}".format(self._table, condition), params)
+        return True
+
+    def update_policy(self, sec, ptype, old_rule, new_policy):
+        return self.update_policies(sec, ptype, [old_rule], [new_policy])
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        params = [
+            self._to_row(ptype, new_rule)[1:] + self._to_row(ptype, old_rule)
+            for old_rule, new_rule in zip(old_rules, new_rules)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE {} SET {} WHERE {}".format(
+                    self._table, ", ".join("{} = ?".format(field) for field in _FIELDS), _MATCH_RULE
+                ),
+                params,
+            )
+        return True
+
+    def update_filtered_policies(self, sec, ptype, new_rules, field_index, *field_values):
+        condition, params = self._filter_condition(ptype, field_index, field_values)
+        rows = [self._to_row(ptype, rule) for rule in new_rules]
+        with self._lock, self._conn:
+            old_rules = [
+                self._to_rule(row)
+                for row in self._conn.execute(
+                    "SELECT {} FROM {} WHERE {} ORDER BY id".format(", ".join(_FIELDS), self._table, condition), params
+                )
+            ]
+            self._conn.execute("DELETE FROM {} WHERE {}".format(self._table, condition), params)
+            self._insert(rows)
+        return old_rules
@@ -14,10 +14,11 @@
 
 from casbin.util import util
 
-from ..adapter import Adapter, load_policy_line
+from ..adapter import iter_policy_batches, load_policy_lines
+from ..streaming_adapter import StreamingAdapter
 
 
-class StringAdapter(Adapter):
+class StringAdapter(StreamingAdapter):
     """the string adapter for Casbin.
     It can load policy from string or save policy to string.
     """
@@ -32,11 +33,14 @@ class StringAdapter(Adapter):
         if self.line == "":
             raise RuntimeError("invalid line, line cannot be empty")
 
-        strs = self.line.split("\n")
-        for s in strs:
-            if s == "":
-                continue
-            load_policy_line(s, model)
+        load_policy_lines(self.line.split("\n"), model)
+
+    def iter_policy(self, batch_size=1000):
+        """yields lists of up to batch_size (ptype, rule) tuples with all policy rules of the storage."""
+        if self.line == "":
+            raise RuntimeError("invalid line, line cannot be empty")
+
+        yield from iter_policy_batches(self.line.split("\n"), batch_size)
 
     def save_policy(self, model):
         """saves all policy rules to the storage."""
@@ -0,0 +1,250 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+
+from ..batch_adapter import BatchAdapter
+from ..update_adapter import UpdateAdapter
+
+Operation = namedtuple("Operation", ["kind", "sec", "ptype", "args"])
+
+
+class WriteBehindAdapter(BatchAdapter, UpdateAdapter):
+    """WriteBehindAdapter wraps another adapter and persists auto-save changes in the background.
+
+    Mutations are queued and return immediately, so the enforcer updates its in-memory
+    policy without waiting for the storage. A flusher thread collects the queued changes
+    for up to flush_interval seconds (or until max_batch_size changes are waiting) and
+    writes consecutive changes of the same kind with a single add_policies /
+    remove_policies / update_policies call of the wrapped adapter.
+
+    on_error(error, operation) is called when the wrapped adapter fails or rejects a
+    write; the default is to log the error. Call flush() to wait until everything queued
+    so far is written, and close() (or use the adapter as a context manager) on shutdown.
+    Loading and saving the whole policy flush the queue first.
+    """
+
+    def __init__(self, adapter, flush_interval=0.05, max_batch_size=1000, max_queue_size=100000, on_error=None):
+        self.logger = logging.getLogger("casbin.adapter")
+        self._adapter = adapter
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._max_queue_size = max_queue_size
+        self._on_error = on_error
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="casbin-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def get_adapter(self):
+        """gets the wrapped adapter."""
+        return self._adapter
+
+    def load_policy(self, model):
+        self.flush()
+        self._adapter.load_policy(model)
+
+    def save_policy(self, model):
+        self.flush()
+        return self._adapter.save_policy(model)
+
+    def is_filtered(self):
+        is_filtered = getattr(self._adapter, "is_filtered", None)
+        return bool(is_filtered and is_filtered())
+
+    def load_filtered_policy(self, model, filter):
+        if not hasattr(self._adapter, "load_filtered_policy"):
+            raise ValueError("filtered policies are not supported by this adapter")
+        self.flush()
+        self._adapter.load_filtered_policy(model, filter)
+
+    def add_policy(self, sec, ptype, rule):
+        self._enqueue(Operation("add", sec, ptype, [rule]))
+
+    def add_policies(self, sec, ptype, rules):
+        self._enqueue(Operation("add", sec, ptype, list(rules)))
+
+    def add_policies_ex(self, sec, ptype, rules):
+        self._enqueue(Operation("add_ex", sec, ptype, list(rules)))
+
+    def remove_policy(self, sec, ptype, rule):
+        self._enqueue(Operation("remove", sec, ptype, [rule]))
+
+    def remove_policies(self, sec, ptype, rules):
+        self._enqueue(Operation("remove", sec, ptype, list(rules)))
+
+    def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        self._enqueue(Operation("remove_filtered", sec, ptype, (field_index, field_values)))
+
+    def update_policy(self, sec, ptype, old_rule, new_policy):
+        self._enqueue(Operation("update", sec, ptype, ([old_rule], [new_policy])))
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        self._enqueue(Operation("update", sec, ptype, (list(old_rules), list(new_rules))))
+
+    def update_filtered_policies(self, sec, ptype, new_rules, field_index, *field_values):
+        # the enforcer needs the replaced rules back, so this one is written synchronously
+        self.flush()
+        return self._adapter.update_filtered_policies(sec, ptype, new_rules, field_index, *field_values)
+
+    def pending(self):
+        """returns the number of queued changes that have not been written yet."""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def flush(self):
+        """blocks until every change queued so far has been written to the wrapped adapter."""
+        if threading.current_thread() is self._thread:
+            return
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._queue or self._in_flight:
+                    self._cond.wait()
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self):
+        """writes the remaining changes and stops the flusher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        atexit.unregister(self.close)
+
+    def _enqueue(self, operation):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind adapter is closed")
+            while len(self._queue) >= self._max_queue_size:
+                self._cond.wait()
+            self._queue.append(operation)
+            if len(self._queue) >= self._max_batch_size:
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # group commit: let concurrent writers join the batch for a short while
+                deadline = time.monotonic() + self._flush_interval
+                while len(self._queue) < self._max_batch_size and not self._closed and not self._flush_waiters:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                count = min(len(self._queue), self._max_batch_size)
+                operations = [self._queue.popleft() for _ in range(count)]
+                self._in_flight = count
+                self._cond.notify_all()
+
+            try:
+                self._write(operations)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _write(self, operations):
+        for operation in self._merge(operations):
+            try:
+                if self._apply(operation) is False:
+                    raise RuntimeError("adapter rejected the {} operation".format(operation.kind))
+            except Exception as e:
+                self._handle_error(e, operation)
+
+    @staticmethod
+    def _merge(operations):
+        """merges consecutive operations of the same kind on the same ptype, keeping their order."""
+        merged = []
+        for operation in operations:
+            kind, sec, ptype, args = operation
+            last = merged[-1] if merged else None
+            if last is not None and kind != "remove_filtered" and last[:3] == operation[:3]:
+                if kind == "update":
+                    last.args[0].extend(args[0])
+                    last.args[1].extend(args[1])
+                else:
+                    last.args.extend(args)
+                continue
+
+            if kind == "update":
+                args = (list(args[0]), list(args[1]))
+            elif kind != "remove_filtered":
+                args = list(args)
+            merged.append(Operation(kind, sec, ptype, args))
+        return merged
+
+    def _apply(self, operation):
+        adapter = self._adapter
+        kind, sec, ptype, args = operation
+
+        if kind == "remove_filtered":
+            field_index, field_values = args
+            return adapter.remove_filtered_policy(sec, ptype, field_index, *field_values)
+
+        if kind == "update":
+            old_rules, new_rules = args
+            if hasattr(adapter, "update_policies"):
+                return adapter.update_policies(sec, ptype, old_rules, new_rules)
+            results = [adapter.update_policy(sec, ptype, old, new) for old, new in zip(old_rules, new_rules)]
+            return not any(result is False for result in results)
+
+        if kind == "add_ex" and hasattr(adapter, "add_policies_ex"):
+            return adapter.add_policies_ex(sec, ptype, args)
+        if kind in ("add", "add_ex"):
+            if hasattr(adapter, "add_policies"):
+                return adapter.add_policies(sec, ptype, args)
+            results = [adapter.add_policy(sec, ptype, rule) for rule in args]
+            return not any(result is False for result in results)
+
+        if hasattr(adapter, "remove_policies"):
+            return adapter.remove_policies(sec, ptype, args)
+        results = [adapter.remove_policy(sec, ptype, rule) for rule in args]
+        return not any(result is False for result in results)
+
+    def _handle_error(self, error, operation):
+        if self._on_error is None:
+            self.logger.error("write-behind %s for %s failed: %r", operation.kind, operation.ptype, error)
+            return
+        try:
+            self._on_error(error, operation)
+        except Exception as e:
+            self.logger.error("write-behind error callback failed: %r", e)
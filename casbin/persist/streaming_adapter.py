@@ -0,0 +1,40 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .adapter import Adapter
+
+
+class StreamingAdapter(Adapter):
+    """StreamingAdapter is the interface for Casbin adapters that can stream their policy rules,
+    so the enforcer adds them to the model and the role managers while they are read.
+    """
+
+    def iter_policy(self, batch_size=1000):
+        """yields lists of up to batch_size (ptype, rule) tuples with all policy rules of the storage."""
+        pass
+
+
+def uses_policy_stream(adapter, method="iter_policy"):
+    """returns whether the policy of the adapter can be loaded from its stream method, i.e. it has one
+    and it is not inherited by a subclass that loads the policy in its own way.
+    """
+    if adapter is None or not hasattr(adapter, method):
+        return False
+
+    mro = type(adapter).__mro__
+    stream_owner = next((cls for cls in mro if method in vars(cls)), None)
+    load_owner = next((cls for cls in mro if "load_policy" in vars(cls)), None)
+    if stream_owner is None or load_owner is None:
+        return stream_owner is not None
+    return mro.index(stream_owner) <= mro.index(load_owner)
@@ -0,0 +1,162 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from casbin.model.policy_op import PolicyOp
+
+
+class PolicyBatch:
+    """PolicyBatch collects policy changes and applies them to an enforcer at once.
+
+    Nothing is applied until commit. On commit the model is updated, the adapter is
+    called once per run of same-kind changes (add_policies / remove_policies /
+    update_policies when available), the role links are updated in a single pass and
+    the watcher is notified once.
+
+        with e.batch() as batch:
+            batch.add_grouping_policy("alice", "admin")
+            batch.remove_policy("bob", "data1", "read")
+
+    Leaving the with block with an exception discards the collected changes. If the adapter
+    cannot save a change, the model is restored and the changes it already saved are undone.
+    """
+
+    def __init__(self, enforcer, lock=None):
+        self._enforcer = enforcer
+        self._lock = lock
+        self._ops = []
+        self._done = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def __len__(self):
+        return sum(len(rules) for _, _, _, rules in self._ops)
+
+    def _record(self, op, sec, ptype, rules):
+        if self._done:
+            raise RuntimeError("batch has already been committed or rolled back")
+        self._ops.append((op, sec, ptype, rules))
+
+    @staticmethod
+    def _params_to_rule(params):
+        if len(params) == 1 and isinstance(params[0], list):
+            return params[0]
+        return list(params)
+
+    def add_policy(self, *params):
+        """adds an authorization rule to the batch."""
+        self.add_named_policy("p", *params)
+
+    def add_named_policy(self, ptype, *params):
+        """adds a named authorization rule to the batch."""
+        self._record(PolicyOp.Policy_add, "p", ptype, [self._params_to_rule(params)])
+
+    def add_policies(self, rules):
+        """adds authorization rules to the batch."""
+        self.add_named_policies("p", rules)
+
+    def add_named_policies(self, ptype, rules):
+        """adds named authorization rules to the batch."""
+        self._record(PolicyOp.Policy_add, "p", ptype, list(rules))
+
+    def add_grouping_policy(self, *params):
+        """adds a role inheritance rule to the batch."""
+        self.add_named_grouping_policy("g", *params)
+
+    def add_named_grouping_policy(self, ptype, *params):
+        """adds a named role inheritance rule to the batch."""
+        self._record(PolicyOp.Policy_add, "g", ptype, [self._params_to_rule(params)])
+
+    def add_grouping_policies(self, rules):
+        """adds role inheritance rules to the batch."""
+        self.add_named_grouping_policies("g", rules)
+
+    def add_named_grouping_policies(self, ptype, rules):
+        """adds named role inheritance rules to the batch."""
+        self._record(PolicyOp.Policy_add, "g", ptype, list(rules))
+
+    def remove_policy(self, *params):
+        """removes an authorization rule in the batch."""
+        self.remove_named_policy("p", *params)
+
+    def remove_named_policy(self, ptype, *params):
+        """removes a named authorization rule in the batch."""
+        self._record(PolicyOp.Policy_remove, "p", ptype, [self._params_to_rule(params)])
+
+    def remove_policies(self, rules):
+        """removes authorization rules in the batch."""
+        self.remove_named_policies("p", rules)
+
+    def remove_named_policies(self, ptype, rules):
+        """removes named authorization rules in the batch."""
+        self._record(PolicyOp.Policy_remove, "p", ptype, list(rules))
+
+    def remove_grouping_policy(self, *params):
+        """removes a role inheritance rule in the batch."""
+        self.remove_named_grouping_policy("g", *params)
+
+    def remove_named_grouping_policy(self, ptype, *params):
+        """removes a named role inheritance rule in the batch."""
+        self._record(PolicyOp.Policy_remove, "g", ptype, [self._params_to_rule(params)])
+
+    def remove_grouping_policies(self, rules):
+        """removes role inheritance rules in the batch."""
+        self.remove_named_grouping_policies("g", rules)
+
+    def remove_named_grouping_policies(self, ptype, rules):
+        """removes named role inheritance rules in the batch."""
+        self._record(PolicyOp.Policy_remove, "g", ptype, list(rules))
+
+    def update_policy(self, old_rule, new_rule):
+        """updates an authorization rule in the batch."""
+        self.update_named_policy("p", old_rule, new_rule)
+
+    def update_named_policy(self, ptype, old_rule, new_rule):
+        """updates a named authorization rule in the batch."""
+        self._record(PolicyOp.Policy_update, "p", ptype, [(old_rule, new_rule)])
+
+    def update_grouping_policy(self, old_rule, new_rule):
+        """updates a role inheritance rule in the batch."""
+        self.update_named_grouping_policy("g", old_rule, new_rule)
+
+    def update_named_grouping_policy(self, ptype, old_rule, new_rule):
+        """updates a named role inheritance rule in the batch."""
+        self._record(PolicyOp.Policy_update, "g", ptype, [(old_rule, new_rule)])
+
+    def commit(self):
+        """applies the collected changes to the enforcer.
+
+        Returns true if at least one rule was changed.
+        """
+        if self._done:
+            raise RuntimeError("batch has already been committed or rolled back")
+        self._done = True
+        ops, self._ops = self._ops, []
+
+        if self._lock is None:
+            return self._enforcer._commit_batch(ops)
+        with self._lock:
+            return self._enforcer._commit_batch(ops)
+
+    def rollback(self):
+        """discards the collected changes."""
+        self._done = True
+        self._ops = []
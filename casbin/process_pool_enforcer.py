@@ -0,0 +1,203 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from casbin.core_enforcer import CoreEnforcer
+from casbin.effect import get_effector
+from casbin.rbac.default_role_manager import DomainManager, RoleManager
+
+# the enforcer of the snapshot last loaded by this worker process
+_worker_snapshot = {"path": None, "enforcer": None}
+
+
+def _load_snapshot(path):
+    with open(path, "rb") as file:
+        model, functions, pure_functions, role_managers = pickle.load(file)
+
+    enforcer = CoreEnforcer(model)
+    for name, func in functions.items():
+        enforcer.fm.add_function(name, func, name in pure_functions)
+    for ptype, (max_hierarchy_level, matching_func, domain_matching_func) in role_managers.items():
+        rm = enforcer.rm_map[ptype]
+        rm.max_hierarchy_level = max_hierarchy_level
+        rm.matching_func = matching_func
+        rm.domain_matching_func = domain_matching_func
+    if len(enforcer.rm_map) != 0:
+        model.build_role_links(enforcer.rm_map)
+    return enforcer
+
+
+def _batch_enforce_chunk(path, requests):
+    if _worker_snapshot["path"] != path:
+        _worker_snapshot["enforcer"] = _load_snapshot(path)
+        _worker_snapshot["path"] = path
+    return _worker_snapshot["enforcer"].batch_enforce(requests)
+
+
+class ProcessPoolEnforcer:
+    """ProcessPoolEnforcer evaluates large batch_enforce calls of an enforcer in a pool of worker processes,
+    so they are not limited to one core by the GIL.
+
+    The rules and the role manager settings are written once to a snapshot file that every worker loads
+    the first time it needs it, the role links are built again in the workers. A new snapshot is written
+    when the policy of the enforcer changes. Call refresh after changing the functions or the matching
+    functions of the enforcer without changing its policy. Batches smaller than min_batch_size and enforcers
+    that cannot be copied to other processes are evaluated in the current process, like the ones with
+    conditional or custom role managers, a custom effector or functions that cannot be pickled.
+    """
+
+    def __init__(self, enforcer, processes=None, min_batch_size=1000, chunk_size=None):
+        self._e = enforcer
+        self._processes = processes or os.cpu_count() or 1
+        self._min_batch_size = min_batch_size
+        self._chunk_size = chunk_size
+        self.logger = logging.getLogger("casbin.enforcer")
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._tmp_dir = None
+        self._version = 0
+        self._snapshot_key = None
+        self._snapshot_path = None
+
+    def get_enforcer(self):
+        """returns the wrapped enforcer."""
+        return self._e
+
+    def get_version(self):
+        """returns the version id of the last snapshot sent to the workers, 0 if there is none."""
+        return self._version
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """stops the worker processes and removes the snapshots."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if self._tmp_dir is not None:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+                self._tmp_dir = None
+            self._snapshot_key = None
+            self._snapshot_path = None
+
+    def refresh(self):
+        """makes the next batch send a new snapshot of the enforcer to the workers."""
+        with self._lock:
+            self._snapshot_key = None
+
+    def _get_policy_key(self):
+        # the policy lists are kept in the key, so their identity cannot be reused by new lists
+        policies = []
+        for sec in ["p", "g"]:
+            if sec not in self._e.model.keys():
+                continue
+            for ast in self._e.model[sec].values():
+                policies.append((ast.policy, ast.policy_version))
+        return self._e.model, policies
+
+    def _is_current(self, key):
+        if self._snapshot_key is None:
+            return False
+        model, policies = self._snapshot_key
+        return (
+            model is key[0]
+            and len(policies) == len(key[1])
+            and all(
+                policy is other_policy and version == other_version
+                for (policy, version), (other_policy, other_version) in zip(policies, key[1])
+            )
+        )
+
+    def _write_snapshot(self, key):
+        e = self._e
+        if len(e.cond_rm_map) != 0:
+            raise TypeError("conditional role managers cannot be copied to other processes")
+        # the workers create the default role managers and effector of the model
+        for ptype, rm in e.rm_map.items():
+            ast = e.model["g"].get(ptype) if "g" in e.model.keys() else None
+            if ast is None or type(rm) is not (RoleManager if len(ast.tokens) <= 2 else DomainManager):
+                raise TypeError("the role manager of {} cannot be copied to other processes".format(ptype))
+        if type(e.eft) is not type(get_effector(e.model["e"]["e"].value)):
+            raise TypeError("the effector cannot be copied to other processes")
+
+        model = e.model.copy_without_policy()
+        for sec in ["p", "g"]:
+            if sec not in model.keys():
+                continue
+            for ptype, ast in model[sec].items():
+                source = e.model[sec][ptype]
+                ast.policy = source.policy
+                ast.policy_map = source.policy_map
+                ast.rm = None
+                ast.cond_rm = None
+                ast.interner = None
+
+        # the g functions are generated again from the role managers of the workers
+        grouping = e.model["g"].keys() if "g" in e.model.keys() else ()
+        functions = {name: func for name, func in e.fm.get_functions().items() if name not in grouping}
+        pure_functions = set(e.fm.get_pure_functions())
+        role_managers = {
+            ptype: (rm.max_hierarchy_level, rm.matching_func, rm.domain_matching_func) for ptype, rm in e.rm_map.items()
+        }
+        data = pickle.dumps((model, functions, pure_functions, role_managers), protocol=pickle.HIGHEST_PROTOCOL)
+
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="casbin-")
+        self._version += 1
+        path = os.path.join(self._tmp_dir, "snapshot-{}.pickle".format(self._version))
+        with open(path, "wb") as file:
+            file.write(data)
+
+        if self._snapshot_path is not None:
+            os.remove(self._snapshot_path)
+        self._snapshot_key = key
+        self._snapshot_path = path
+
+    def batch_enforce(self, rvals):
+        """batch_enforce enforce in batches, the results are in the order of the requests."""
+        rvals = list(rvals)
+        if len(rvals) < self._min_batch_size or not self._e.enabled:
+            return self._e.batch_enforce(rvals)
+
+        with self._lock:
+            key = self._get_policy_key()
+            if not self._is_current(key):
+                try:
+                    self._write_snapshot(key)
+                except (pickle.PicklingError, AttributeError, TypeError) as e:
+                    self.logger.warning("cannot send the enforcer to the worker processes: %s", e)
+                    return self._e.batch_enforce(rvals)
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._processes)
+
+            chunk_size = self._chunk_size or max(1, -(-len(rvals) // (self._processes * 4)))
+            chunks = [rvals[i : i + chunk_size] for i in range(0, len(rvals), chunk_size)]
+            results = []
+            for chunk_results in self._executor.map(_batch_enforce_chunk, [self._snapshot_path] * len(chunks), chunks):
+                results.extend(chunk_results)
+            return results
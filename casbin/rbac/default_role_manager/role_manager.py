@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
 import logging
-from collections import namedtuple
+import operator
+import threading
+from collections import OrderedDict, namedtuple
 from enum import Enum
 
 from casbin.rbac import RoleManager as RM
@@ -22,6 +25,102 @@ from casbin.rbac import ConditionalRoleManager as CRM
 Link = namedtuple("Link", ["user", "role"])
 
 
+# serializes the roles that reads add to role managers with a matching function
+_find_role_lock = threading.Lock()
+
+# the versions of the role graphs, unique across role managers so copies sharing a cache never collide
+_graph_versions = itertools.count(1)
+
+DEFAULT_LINK_CACHE_SIZE = 10000
+
+
+class LinkCache:
+    """LinkCache is a bounded LRU cache of the results of has_link and get_roles of a role manager,
+    the results are tagged with the version of the role graph and dropped when it changes.
+    A size of 0 disables it.
+    """
+
+    def __init__(self, size=DEFAULT_LINK_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """returns the result of the key for the version of the role graph, or None if it is not cached."""
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, version, result):
+        """caches the result, unless the role graph changed since it was computed."""
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = result
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def resize(self, size):
+        with self._lock:
+            self.size = size
+            while len(self._entries) > max(size, 0):
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """returns the size, the number of entries, the hits, the misses and the hit ratio of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": self.size,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _cached(rm, key, compute):
+    """returns compute() through the link cache of the role manager."""
+    cache = rm.link_cache
+    if cache.size <= 0:
+        return compute()
+
+    version = rm.graph_version
+    try:
+        result = cache.get(key, version)
+    except TypeError:
+        # unhashable names are not cached
+        return compute()
+    if result is None:
+        result = compute()
+        cache.put(key, version, result)
+    return result
+
+
+class _LinkCacheMixin:
+    def _graph_changed(self):
+        self.graph_version = next(_graph_versions)
+
+    def set_link_cache_size(self, size):
+        """sets the number of has_link and get_roles results kept in the cache, 0 disables it."""
+        self.link_cache.resize(size)
+
+    def get_link_cache_stats(self):
+        """returns the size, the number of entries, the hits, the misses and the hit ratio of the link cache."""
+        return self.link_cache.stats()
+
+
 class MatchOrder(Enum):
     STR_PATTERN = 0
     PATTERN_STR = 1
@@ -29,6 +128,8 @@ class MatchOrder(Enum):
 
 
 class Role:
+    __slots__ = ("name", "roles", "users", "link_condition_func_map", "link_condition_func_params_map")
+
     def __init__(self, name):
         self.name = name
         self.roles = set()
@@ -93,18 +194,21 @@ class Role:
         return list(params) if params is not None else []
 
 
-class RoleManager(RM):
+class RoleManager(_LinkCacheMixin, RM):
     """provides a default implementation for the RoleManager interface"""
 
-    def __init__(self, max_hierarchy_level=10):
+    def __init__(self, max_hierarchy_level=10, link_cache_size=DEFAULT_LINK_CACHE_SIZE):
         self.logger = logging.getLogger("casbin.role")
         self.max_hierarchy_level = max_hierarchy_level
         self.matching_func = None
         self.domain_matching_func = None
         self.all_links = list()
         self.all_roles = dict()
+        self.graph_version = next(_graph_versions)
+        self.link_cache = LinkCache(link_cache_size)
 
     def _rebuild(self):
+        self._graph_changed()
         self.all_roles = dict()
         links = self.all_links
         self.all_links = list()
@@ -130,12 +234,39 @@ class RoleManager(RM):
             if self._matching_fn(name, role_name, match_order)
         ]
 
+    def _find_role(self, name):
+        """returns the role of the name for reading. Without a matching function a missing role has no links,
+        so it is not added to all_roles and reads do not change the role manager. With a matching function
+        the new role copies the links of the matching patterns, which is serialized by a lock and changes
+        the version of the role graph if it got any.
+        """
+        role = self.all_roles.get(name)
+        if role is not None:
+            return role
+        if self.matching_func == None:
+            return Role(name)
+
+        # the patterns are matched outside of the lock, only linking the new role is serialized
+        pattern_roles = self._matching_roles(name)
+        with _find_role_lock:
+            role = self.all_roles.get(name)
+            if role is None:
+                role = Role(name)
+                for pattern_role in pattern_roles:
+                    role.copy_from(pattern_role)
+                self.all_roles[name] = role
+                if not role.empty():
+                    self._graph_changed()
+            return role
+
     def _get_role(self, name):
         if name not in self.all_roles:
             role = Role(name)
             if self.matching_func != None:
                 for pattern_role in self._matching_roles(name):
                     role.copy_from(pattern_role)
+                if not role.empty():
+                    self._graph_changed()
             self.all_roles[name] = role
         return self.all_roles[name]
 
@@ -144,13 +275,16 @@ class RoleManager(RM):
         self._rebuild()
 
     def add_domain_matching_func(self, fn=None):
+        self._graph_changed()
         self.domain_matching_func = fn
 
     def clear(self):
+        self._graph_changed()
         self.all_roles = dict()
         self.all_links = list()
 
     def add_link(self, name1, name2, *domain):
+        self._graph_changed()
         self.all_links.append(Link(name1, name2))
 
         user = self._get_role(name1)
@@ -168,6 +302,7 @@ class RoleManager(RM):
     def delete_link(self, name1, name2, *domain):
         if Link(name1, name2) not in self.all_links:
             return
+        self._graph_changed()
         self.all_links.remove(Link(name1, name2))
 
         user = self._get_role(name1)
@@ -181,8 +316,13 @@ class RoleManager(RM):
                 role.remove_role(r)
 
     def has_link(self, name1, name2, *domain):
-        user = self._get_role(name1)
-        role = self._get_role(name2)
+        return _cached(
+            self, ("has_link", name1, name2, self.max_hierarchy_level), lambda: self._has_link_uncached(name1, name2)
+        )
+
+    def _has_link_uncached(self, name1, name2):
+        user = self._find_role(name1)
+        role = self._find_role(name2)
 
         return self._has_link(name2, [user], self.max_hierarchy_level)
 
@@ -199,12 +339,13 @@ class RoleManager(RM):
         return self._has_link(name, list(next_roles), level - 1)
 
     def get_roles(self, name, *domain):
-        user = self._get_role(name)
-        return [r.name for r in user.roles]
+        return list(
+            _cached(self, ("get_roles", name), lambda: tuple(r.name for r in list(self._find_role(name).roles)))
+        )
 
     def get_users(self, name, *domain):
-        role = self._get_role(name)
-        return [u.name for u in role.users]
+        role = self._find_role(name)
+        return [u.name for u in list(role.users)]
 
     def to_string(self):
         line = []
@@ -218,19 +359,23 @@ class RoleManager(RM):
         self.logger.info(self.to_string())
 
 
-class DomainManagerBase(RM):
-    def __init__(self, max_hierarchy_level=10):
+class DomainManagerBase(_LinkCacheMixin, RM):
+    def __init__(self, max_hierarchy_level=10, link_cache_size=DEFAULT_LINK_CACHE_SIZE):
         self.logger = logging.getLogger("casbin.role")
         self.all_links = dict()
         self.max_hierarchy_level = max_hierarchy_level
         self.matching_func = None
         self.domain_matching_func = None
-        self.matching_func = lambda name1, name2: name1 == name2
+        self.matching_func = operator.eq
+        self.graph_version = next(_graph_versions)
+        self.link_cache = LinkCache(link_cache_size)
 
     def add_matching_func(self, fn):
+        self._graph_changed()
         self.matching_func = fn
 
     def add_domain_matching_func(self, fn=None):
+        self._graph_changed()
         self.domain_matching_func = fn
 
     def _get_domain(self, *domain):
@@ -260,16 +405,19 @@ class DomainManagerBase(RM):
                 if domain1 != domain2 and match_error_handler(self.domain_matching_func, domain1, domain2):
                     domain_links = domain_links + links
 
-        rm = RoleManager(max_hierarchy_level=self.max_hierarchy_level)
+        # the results are cached by the domain manager
+        rm = RoleManager(max_hierarchy_level=self.max_hierarchy_level, link_cache_size=0)
         rm.add_matching_func(self.matching_func)
         for link in domain_links:
             rm.add_link(link[0], link[1])
         return rm
 
     def clear(self):
+        self._graph_changed()
         self.all_links = dict()
 
     def add_link(self, name1, name2, *domain):
+        self._graph_changed()
         links = self._get_links(*domain)
         links.append(Link(name1, name2))
 
@@ -277,15 +425,29 @@ class DomainManagerBase(RM):
         links = self._get_links(*domain)
         if Link(name1, name2) not in links:
             raise RuntimeError(f"error: link between {name1} and {name2} does not exist")
+        self._graph_changed()
         links.remove(Link(name1, name2))
 
+    def delete_domain(self, domain):
+        """deletes all links of the domain."""
+        self._graph_changed()
+        self.all_links.pop(domain, None)
+
+    def _read(self, domain, read):
+        """returns read of the role manager of the domain."""
+        return read(self._get_role_manager(*domain))
+
     def has_link(self, name1, name2, *domain):
-        rm = self._get_role_manager(*domain)
-        return rm.has_link(name1, name2)
+        return _cached(
+            self,
+            ("has_link", name1, name2, domain, self.max_hierarchy_level),
+            lambda: self._read(domain, lambda rm: rm.has_link(name1, name2)),
+        )
 
     def get_roles(self, name, *domain):
-        rm = self._get_role_manager(*domain)
-        return rm.get_roles(name)
+        return list(
+            _cached(self, ("get_roles", name, domain), lambda: self._read(domain, lambda rm: tuple(rm.get_roles(name))))
+        )
 
     def get_users(self, name, *domain):
         rm = self._get_role_manager(*domain)
@@ -305,10 +467,23 @@ class DomainManager(DomainManagerBase):
 
     def _get_role_manager(self, *domain):
         domain1 = self._get_domain(*domain)
-        if domain1 not in self.rm_map:
-            self.rm_map[domain1] = super()._get_role_manager(*domain)
+        rm = self.rm_map.get(domain1)
+        if rm is None:
+            # the role manager is built before it is shared, concurrent readers keep the first one
+            rm = self.rm_map.setdefault(domain1, super()._get_role_manager(*domain))
 
-        return self.rm_map[domain1]
+        return rm
+
+    def _read(self, domain, read):
+        """returns read of the role manager of the domain, the roles it adds with the matching function
+        change the version of the role graph of the domain manager too.
+        """
+        rm = self._get_role_manager(*domain)
+        version = rm.graph_version
+        result = read(rm)
+        if rm.graph_version != version:
+            self._graph_changed()
+        return result
 
     def _affected_role_managers(self, *domain):
         domain_pattern = self._get_domain(*domain)
@@ -347,6 +522,14 @@ class DomainManager(DomainManagerBase):
         for rm in self._affected_role_managers(*domain):
             rm.delete_link(name1, name2, *domain)
 
+    def delete_domain(self, domain):
+        super().delete_domain(domain)
+        if self.domain_matching_func != None:
+            # the links of the domain may also be part of the role managers of matching domains
+            self._rebuild()
+        else:
+            self.rm_map.pop(domain, None)
+
     def has_link(self, name1, name2, *domain):
         return super().has_link(name1, name2, *domain)
 
@@ -375,12 +558,28 @@ class ConditionalRoleManager(RoleManager, CRM):
         if name1 == name2 or (self.matching_func is not None and self._matching_fn(name1, name2)):
             return True
 
+        cache = self.link_cache
+        key = ("has_link", name1, name2, domains, self.max_hierarchy_level)
+        version = self.graph_version
+        try:
+            result = cache.get(key, version) if cache.size > 0 else None
+        except TypeError:
+            key = None
+            result = None
+        if result is not None:
+            return result
+
         user = self._get_role(name1)
         role = self._get_role(name2)
 
-        return self._has_link(role.name, [user], self.max_hierarchy_level, *domains)
+        # the results that depend on link condition functions are computed every time
+        conditions = []
+        result = self._has_link(role.name, [user], self.max_hierarchy_level, *domains, conditions=conditions)
+        if key is not None and not conditions and cache.size > 0:
+            cache.put(key, version, result)
+        return result
 
-    def _has_link(self, target_name, roles, level, *domains):
+    def _has_link(self, target_name, roles, level, *domains, conditions=None):
         """use the Breadth First Search algorithm to traverse the Role tree
         Judging whether the user has a role (has link) is to judge whether the role node can be reached from the user node
         """
@@ -395,12 +594,15 @@ class ConditionalRoleManager(RoleManager, CRM):
                 return True
 
             for next_role in role.roles:
-                linked_role = self.get_next_roles(role, next_role, domains)
+                linked_role = self.get_next_roles(role, next_role, domains, conditions)
                 next_roles.update(set(linked_role))
 
-        return self._has_link(target_name, next_roles, level - 1, *domains)
+        return self._has_link(target_name, next_roles, level - 1, *domains, conditions=conditions)
 
-    def get_next_roles(self, current_role, next_role, domains):
+    def get_next_roles(self, current_role, next_role, domains, conditions=None):
+        """returns [next_role] if the link passes its condition function, the links with a condition function
+        are added to conditions.
+        """
         pass_link_condition_func = True
         next_roles = list()
         if not domains:
@@ -413,6 +615,8 @@ class ConditionalRoleManager(RoleManager, CRM):
             if link_condition_func is not None:
                 params = self.get_link_condition_func_params(current_role.name, next_role.name, domains)
                 pass_link_condition_func = link_condition_func(*params)
+        if link_condition_func is not None and conditions is not None:
+            conditions.append((current_role.name, next_role.name))
 
         if pass_link_condition_func:
             next_roles.append(next_role)
@@ -452,6 +656,7 @@ class ConditionalRoleManager(RoleManager, CRM):
         """add_domain_link_condition_func is based on userName, roleName, domain, add LinkConditionFunc"""
         user = self._get_role(user_name)
         role = self._get_role(role_name)
+        self._graph_changed()
         user.add_link_condition_func(role, domain, fn)
 
     def set_link_condition_func_params(self, user_name, role_name, *params):
@@ -462,6 +667,7 @@ class ConditionalRoleManager(RoleManager, CRM):
         """set_domain_link_condition_func_params sets parameters of LinkConditionFunc based on userName, roleName, domain"""
         user = self._get_role(user_name)
         role = self._get_role(role_name)
+        self._graph_changed()
         user.set_link_condition_func_params(role, domain, *params)
 
 
@@ -499,15 +705,21 @@ class ConditionalDomainManager(DomainManager, ConditionalRoleManager):
         return rm.has_link(name1, name2, domain)
 
     def add_link(self, name1, name2, *domain):
+        self._graph_changed()
         domain = self._get_domain(*domain)
         rm = self._get_conditional_role_manager(domain, store=True)
         rm.add_link(name1, name2, domain)
 
     def delete_link(self, name1, name2, *domain):
+        self._graph_changed()
         domain = self._get_domain(*domain)
         rm = self._get_conditional_role_manager(domain, store=True)
         rm.delete_link(name1, name2, domain)
 
+    def delete_domain(self, domain):
+        self._graph_changed()
+        self.rm_map.pop(domain, None)
+
     def add_link_condition_func(self, user_name, role_name, fn):
         for rm in self.rm_map.values():
             rm.add_link_condition_func(user_name, role_name, fn)
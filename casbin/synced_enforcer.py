@@ -16,6 +16,7 @@ import threading
 import time
 
 from casbin.enforcer import Enforcer
+from casbin.policy_batch import PolicyBatch
 from casbin.util.rwlock import RWLockWrite
 
 
@@ -134,6 +135,11 @@ class SyncedEnforcer:
         with self._wl:
             return self._e.load_filtered_policy(filter)
 
+    def load_increment_filtered_policy(self, filter):
+        """appends a filtered policy from file/database, returns the added rules as {ptype: rules}."""
+        with self._wl:
+            return self._e.load_increment_filtered_policy(filter)
+
     def save_policy(self):
         with self._rl:
             return self._e.save_policy()
@@ -158,12 +164,12 @@ class SyncedEnforcer:
         with self._rl:
             return self._e.enforce_ex(*rvals)
 
-    def batch_enforce(self, rvals):
+    def batch_enforce(self, rvals, workers=None):
         """batch_enforce enforce in batches,
         input parameters are usually: [(sub, obj, act), (sub, obj, act), ...].
         """
         with self._rl:
-            return self._e.batch_enforce(rvals)
+            return self._e.batch_enforce(rvals, workers)
 
     def get_all_subjects(self):
         """gets the list of subjects that show up in the current policy."""
@@ -337,10 +343,10 @@ class SyncedEnforcer:
         with self._wl:
             return self._e.remove_filtered_named_grouping_policy(ptype, field_index, *field_values)
 
-    def add_function(self, name, func):
-        """adds a customized function."""
+    def add_function(self, name, func, pure=False):
+        """adds a customized function, the results of a pure function are cached for the calls of one enforce."""
         with self._wl:
-            return self._e.add_function(name, func)
+            return self._e.add_function(name, func, pure)
 
     # enforcer.py
 
@@ -542,11 +548,66 @@ class SyncedEnforcer:
         with self._wl:
             return self._e.enable_auto_build_role_links(auto_build_role_links)
 
+    def enable_policy_stream(self, enabled=True):
+        """changes whether load_policy streams the rules of adapters with an iter_policy stream."""
+        with self._wl:
+            return self._e.enable_policy_stream(enabled)
+
     def enable_auto_save(self, auto_save):
         """controls whether to save a policy rule automatically to the adapter when it is added or removed."""
         with self._wl:
             return self._e.enable_auto_save(auto_save)
 
+    def enable_compact_policy(self, enabled=True):
+        """changes whether the rules are stored as immutable rows of interned strings."""
+        with self._wl:
+            return self._e.enable_compact_policy(enabled)
+
+    def enable_columnar_policy(self, enabled=True):
+        """changes whether enforce selects the candidate rules with vectorised comparisons, it requires numpy."""
+        with self._wl:
+            return self._e.enable_columnar_policy(enabled)
+
+    def enable_exact_match_index(self, enabled=True):
+        """changes whether enforce answers matchers made of == comparisons of every policy field with a hash lookup."""
+        with self._wl:
+            return self._e.enable_exact_match_index(enabled)
+
+    def enable_domain_partitions(self, enabled=True):
+        """changes whether enforce only evaluates the rules of the domain of the request for r.dom == p.dom matchers."""
+        with self._wl:
+            return self._e.enable_domain_partitions(enabled)
+
+    def enable_subject_index(self, enabled=True):
+        """changes whether enforce only evaluates the rules of the request subject and its roles for g() matchers."""
+        with self._wl:
+            return self._e.enable_subject_index(enabled)
+
+    def get_memo_stats(self):
+        """returns the number of g and pure function calls answered from the cache of their enforce call."""
+        with self._rl:
+            return self._e.get_memo_stats()
+
+    def reset_memo_stats(self):
+        """sets the memo counters to zero."""
+        with self._wl:
+            return self._e.reset_memo_stats()
+
+    def set_link_cache_size(self, size):
+        """sets the number of has_link and get_roles results the role managers keep between enforce calls."""
+        with self._wl:
+            return self._e.set_link_cache_size(size)
+
+    def get_link_cache_stats(self):
+        """returns the size, the entries, the hits, the misses and the hit ratio of the role manager link caches."""
+        with self._rl:
+            return self._e.get_link_cache_stats()
+
+    def get_memory_report(self):
+        """returns an estimate of the memory used by the loaded rules, in bytes."""
+        with self._rl:
+            return self._e.get_memory_report()
+
     def enable_enforce(self, enabled=True):
         """changes the enforcing state of Casbin,
         when Casbin is disabled, all access will be allowed by the Enforce() function.
@@ -681,6 +742,10 @@ class SyncedEnforcer:
         with self._wl:
             return self._e.remove_named_grouping_policies(ptype, rules)
 
+    def batch(self):
+        """returns a PolicyBatch whose commit is applied under the write lock."""
+        return PolicyBatch(self._e, self._wl)
+
     def build_incremental_role_links(self, op, ptype, rules):
         self.get_model().build_incremental_role_links(self.get_role_manager(), op, "g", ptype, rules)
 
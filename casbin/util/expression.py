@@ -14,6 +14,17 @@
 
 from simpleeval import EvalWithCompoundTypes
 import ast
+import functools
+import threading
+
+_parse_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_expression(expr):
+    # ast.parse is not thread-safe on some CPython versions, the parsed expressions are only read
+    with _parse_lock:
+        return ast.parse(expr.strip()).body[0].value
 
 
 class SimpleEval(EvalWithCompoundTypes):
@@ -31,7 +42,7 @@ class SimpleEval(EvalWithCompoundTypes):
         super(SimpleEval, self).__init__(functions=functions)
         if expr != "":
             self.expr = expr
-            self.ast_parsed_value = ast.parse(expr.strip()).body[0].value
+            self.ast_parsed_value = _parse_expression(expr)
 
     def eval(self, names=None):
         """evaluate an expresssion, using the operators, functions and
@@ -18,5 +18,7 @@ from .test_enforcer import *
 from .test_fast_enforcer import TestFastEnforcer
 from .test_filter import TestFilteredFileAdapter
 from .test_frontend import TestFrontend
+from .test_lazy_domain_enforcer import TestLazyDomainEnforcer
 from .test_management_api import TestManagementApi, TestManagementApiSynced
+from .test_process_pool_enforcer import TestProcessPoolEnforcer
 from .test_rbac_api import TestRbacApi, TestRbacApiSynced
@@ -1,4 +1,8 @@
-from casbin.persist.adapter import _extract_tokens
+import io
+
+import casbin
+from casbin.persist.adapter import _extract_tokens, load_policy_lines, read_policy_lines
+from tests.benchmarks.benchmark_model import get_examples
 
 
 def _benchmark_extract_tokens(benchmark, line):
@@ -28,3 +32,12 @@ def test_benchmark_extract_tokens_long_nested(benchmark):
         benchmark,
         "00000000-0000-0000-0000-000000000000(00000000-0000-0000-0000-000000000001,00000000-0000-0000-0000-000000000002),00000000-0000-0000-0000-000000000003(00000000-0000-0000-0000-000000000004,00000000-0000-0000-0000-000000000005)",
     )
+
+
+def test_benchmark_load_policy_file_10k(benchmark):
+    content = "\n".join("p, user%d, data%d, read" % (i, i % 100) for i in range(10000)).encode()
+
+    @benchmark
+    def run_benchmark():
+        m = casbin.Enforcer.new_model(get_examples("basic_model.conf"))
+        load_policy_lines(read_policy_lines(io.BytesIO(content)), m)
@@ -0,0 +1,66 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import time
+
+import pytest
+
+import casbin
+
+# scaling beyond one thread is only expected on free-threaded builds
+FREE_THREADED = hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled()
+
+
+def get_examples(path):
+    examples_path = os.path.split(os.path.realpath(__file__))[0] + "/../../examples/"
+    return os.path.abspath(examples_path + path)
+
+
+def get_enforcer():
+    e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"))
+    e.enable_auto_save(False)
+    e.add_policies([("role" + str(i), "domain" + str(i % 10), "data" + str(i), "read") for i in range(1000)])
+    e.add_grouping_policies([("user" + str(i), "role" + str(i % 1000), "domain" + str(i % 10)) for i in range(5000)])
+    # builds the role managers of the domains, which are created by the first requests
+    e.batch_enforce(get_requests())
+    return e
+
+
+def get_requests(count=4000):
+    return [("user" + str(i), "domain" + str(i % 10), "data" + str(i % 1000), "read") for i in range(count)]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8])
+def test_benchmark_batch_enforce_threads(benchmark, workers):
+    e = get_enforcer()
+    requests = get_requests()
+
+    @benchmark
+    def benchmark_batch_enforce():
+        e.batch_enforce(requests, workers=workers)
+
+
+if __name__ == "__main__":
+    e = get_enforcer()
+    requests = get_requests()
+    print("free-threaded: {}".format(FREE_THREADED))
+    baseline = None
+    for workers in [1, 2, 4, 8]:
+        start = time.perf_counter()
+        e.batch_enforce(requests, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print("{} threads: {:.3f}s, speedup {:.2f}x".format(workers, elapsed, baseline / elapsed))
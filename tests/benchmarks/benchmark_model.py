@@ -231,3 +231,15 @@ def test_benchmark_globmatch(benchmark):
     @benchmark
     def benchmark_globmatch():
         e.enforce("alice", "/alice_data/resource1", "GET")
+
+
+def test_benchmark_batch_enforce_medium(benchmark):
+    e = get_enforcer(get_examples("rbac_model.conf"))
+
+    e.add_policies({("group" + str(i), "data" + str(int(i / 10)), "read") for i in range(1000)})
+    e.add_grouping_policies({("user" + str(i), "group" + str(int(i / 10))) for i in range(10000)})
+    requests = [("user" + str(i), "data" + str(i % 100), "read") for i in range(5000)]
+
+    @benchmark
+    def benchmark_batch_enforce():
+        e.batch_enforce(requests)
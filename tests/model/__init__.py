@@ -12,5 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .test_compact_policy import TestCompactPolicy
 from .test_policy import TestPolicy
+from .test_policy_columnar import TestColumnarPolicy, TestColumnarPolicyWithoutNumpy, TestColumnConditions
 from .test_policy_fast import TestContextManager, TestFastPolicy
+from .test_policy_index import TestDomainPartitions, TestExactMatchIndex, TestSubjectIndex
+from .test_policy_partition import TestEffectMask, TestEffectPartition
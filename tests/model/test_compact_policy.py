@@ -0,0 +1,88 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+import casbin
+from casbin.model import PolicyRow, StringInterner
+from tests.test_enforcer import get_examples
+
+
+class TestCompactPolicy(TestCase):
+    def get_enforcer(self, model="rbac_with_domains_model.conf", policy="rbac_with_domains_policy.csv"):
+        e = casbin.Enforcer(get_examples(model), get_examples(policy))
+        e.enable_auto_save(False)
+        e.enable_compact_policy()
+        return e
+
+    def test_interner(self):
+        interner = StringInterner()
+        row = interner.row(["alice", "data1", "read"])
+        self.assertIsInstance(row, PolicyRow)
+        self.assertEqual(row, ["alice", "data1", "read"])
+        self.assertNotEqual(row, ["alice", "data1", "write"])
+        self.assertIs(interner.row(row), row)
+        self.assertIs(interner.row(["".join(["al", "ice"])])[0], row[0])
+        self.assertEqual(len(interner), 3)
+
+    def test_enforce_and_management(self):
+        e = self.get_enforcer()
+        self.assertTrue(all(isinstance(rule, PolicyRow) for rule in e.get_policy() + e.get_grouping_policy()))
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+        self.assertFalse(e.enforce("alice", "domain2", "data2", "read"))
+
+        self.assertTrue(e.add_policy("admin", "domain1", "data3", "read"))
+        self.assertFalse(e.add_policy("admin", "domain1", "data3", "read"))
+        self.assertTrue(e.update_policy(["admin", "domain1", "data3", "read"], ["admin", "domain1", "data4", "read"]))
+        self.assertTrue(e.has_policy("admin", "domain1", "data4", "read"))
+        self.assertTrue(e.add_grouping_policy("carol", "admin", "domain2"))
+        self.assertTrue(e.enforce("carol", "domain2", "data2", "write"))
+        self.assertTrue(e.remove_policy("admin", "domain2", "data2", "write"))
+        self.assertFalse(e.enforce("carol", "domain2", "data2", "write"))
+        self.assertEqual(
+            e.get_implicit_permissions_for_user("alice", "domain1"),
+            [
+                ["admin", "domain1", "data1", "read"],
+                ["admin", "domain1", "data1", "write"],
+                ["admin", "domain1", "data4", "read"],
+            ],
+        )
+
+        e.load_policy()
+        self.assertTrue(all(isinstance(rule, PolicyRow) for rule in e.get_policy()))
+
+        e.enable_compact_policy(False)
+        self.assertTrue(all(type(rule) is list for rule in e.get_policy()))
+        self.assertTrue(e.add_policy("admin", "domain1", "data3", "read"))
+        self.assertIs(type(e.get_policy()[-1]), list)
+
+    def test_priority(self):
+        e = self.get_enforcer("priority_model_explicit.conf", "priority_policy_explicit.csv")
+        e.add_policy("0", "bob", "data2", "write", "deny")
+        self.assertEqual(e.get_policy()[0], ["0", "bob", "data2", "write", "deny"])
+        self.assertFalse(e.enforce("bob", "data2", "write"))
+
+    def test_memory_report(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        before = e.get_memory_report()
+        self.assertFalse(before["compact"])
+
+        e.enable_compact_policy()
+        after = e.get_memory_report()
+        self.assertTrue(after["compact"])
+        self.assertEqual(after["rules"], before["rules"])
+        self.assertEqual(after["fields"], before["fields"])
+        self.assertEqual(after["distinct_strings"], after["interned_strings"])
+        self.assertLessEqual(after["distinct_strings"], before["distinct_strings"])
+        self.assertLess(after["row_bytes"], before["row_bytes"])
@@ -2,6 +2,7 @@ from unittest import TestCase
 
 from casbin import Model
 from casbin.model.model import DEFAULT_DOMAIN
+from tests.test_enforcer import get_examples
 
 
 class TestModel(TestCase):
@@ -45,3 +46,36 @@ class TestModel(TestCase):
             ["B3", "B1"],
         ]
         self.assertRaises(RuntimeError, self.m.get_subject_hierarchy_map, policies)
+
+    def test_subject_hierarchy_levels(self):
+        policies = [
+            ["A1", "B1"],
+            ["A1", "B2"],
+            ["B1", "B2"],
+            ["B2", "C1", "domain1"],
+        ]
+        res = self.m.get_subject_hierarchy_map(policies)
+        self.assertEqual(
+            res,
+            {
+                self.m.get_name_with_domain(DEFAULT_DOMAIN, "A1"): 0,
+                self.m.get_name_with_domain(DEFAULT_DOMAIN, "B1"): 1,
+                self.m.get_name_with_domain(DEFAULT_DOMAIN, "B2"): 2,
+                self.m.get_name_with_domain("domain1", "B2"): 0,
+                self.m.get_name_with_domain("domain1", "C1"): 1,
+            },
+        )
+
+        # the subjects that are part of or above a cycle are reported
+        with self.assertRaisesRegex(RuntimeError, "::B3"):
+            self.m.get_subject_hierarchy_map([["A1", "B1"], ["B1", "B2"], ["B2", "B1"], ["B2", "B3"]])
+
+    def test_role_count(self):
+        m = Model()
+        m.load_model(get_examples("rbac_with_domains_model.conf"))
+        self.assertEqual(m["g"]["g"].role_count, 3)
+
+        m = Model()
+        m.load_model(get_examples("rbac_with_temporal_roles_model.conf"))
+        # the parameters of the link conditions are part of the rules
+        self.assertEqual(m["g"]["g"].role_count, 4)
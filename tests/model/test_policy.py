@@ -148,6 +148,77 @@ class TestPolicy(TestCase):
         for new_rule in new_rules:
             self.assertTrue(m.has_policy("p", "p", new_rule))
 
+    def test_update_policy_with_subject_cycle(self):
+        m = Model()
+        m.load_model(get_examples("subject_priority_model.conf"))
+        m.add_policies(
+            "p",
+            "p",
+            [
+                ["admin", "data1", "read", "deny"],
+                ["jane", "data1", "read", "allow"],
+                ["alice", "data1", "read", "allow"],
+            ],
+        )
+        m.add_policies("g", "g", [["jane", "admin"], ["alice", "jane"]])
+        self.assertEqual([rule[0] for rule in m.get_policy("p", "p")], ["alice", "jane", "admin"])
+
+        # a grouping rule that makes a cycle keeps the previous order
+        self.assertTrue(m.add_policy("g", "g", ["admin", "alice"]))
+        self.assertTrue(
+            m.update_policy("p", "p", ["jane", "data1", "read", "allow"], ["jane", "data2", "read", "allow"])
+        )
+        self.assertTrue(
+            m.update_policies("p", "p", [["alice", "data1", "read", "allow"]], [["alice", "data2", "read", "allow"]])
+        )
+        self.assertEqual([rule[0] for rule in m.get_policy("p", "p")], ["alice", "jane", "admin"])
+
+        # only the rules of the subjects whose level changed are moved
+        self.assertTrue(m.remove_policy("g", "g", ["admin", "alice"]))
+        self.assertTrue(m.remove_policy("g", "g", ["alice", "jane"]))
+        self.assertEqual([rule[0] for rule in m.get_policy("p", "p")], ["alice", "jane", "admin"])
+        self.assertTrue(m.add_policy("g", "g", ["bob", "alice"]))
+        self.assertEqual([rule[0] for rule in m.get_policy("p", "p")], ["jane", "alice", "admin"])
+
+    def test_update_subject_hierarchy_with_grouping_changes(self):
+        m = Model()
+        m.load_model(get_examples("subject_priority_model.conf"))
+        m.add_policies(
+            "p",
+            "p",
+            [
+                ["root", "data1", "read", "deny"],
+                ["admin", "data1", "read", "allow"],
+                ["alice", "data1", "read", "deny"],
+                ["bob", "data1", "read", "allow"],
+            ],
+        )
+        m.add_policies("g", "g", [["admin", "root"], ["alice", "admin"], ["bob", "root"]])
+
+        def check(levels, subjects):
+            self.assertEqual(m.subject_hierarchy_map, m.get_subject_hierarchy_map(m.get_policy("g", "g")))
+            for name, level in levels.items():
+                self.assertEqual(m.subject_hierarchy_map.get(m.get_name_with_domain("", name), 0), level)
+            self.assertEqual([rule[0] for rule in m.get_policy("p", "p")], subjects)
+
+        check({"alice": 0, "bob": 0, "admin": 1, "root": 2}, ["alice", "bob", "admin", "root"])
+
+        # the levels of the ancestors of the changed links are computed again
+        m.add_policy("g", "g", ["admin", "bob"])
+        check({"alice": 0, "admin": 1, "bob": 2, "root": 3}, ["alice", "admin", "bob", "root"])
+        m.remove_policy("g", "g", ["alice", "admin"])
+        check({"alice": 0, "admin": 0, "bob": 1, "root": 2}, ["alice", "admin", "bob", "root"])
+        m.remove_filtered_policy("g", "g", 1, "bob")
+        check({"admin": 0, "bob": 0, "root": 1}, ["alice", "admin", "bob", "root"])
+        m.remove_policies("g", "g", [["admin", "root"], ["bob", "root"]])
+        check({"admin": 0, "bob": 0, "root": 0}, ["alice", "admin", "bob", "root"])
+        self.assertEqual(m.subject_hierarchy_map, {})
+
+        # the rules added since are moved too
+        m.add_policy("p", "p", ["carol", "data1", "read", "allow"])
+        m.add_policy("g", "g", ["root", "carol"])
+        check({"root": 0, "carol": 1}, ["alice", "admin", "bob", "root", "carol"])
+
     def test_remove_policy(self):
         m = Model()
         m.load_model(get_examples("basic_model.conf"))
@@ -172,3 +243,57 @@ class TestPolicy(TestCase):
 
         res = m.remove_filtered_policy("p", "p", 1, "domain1", "data1")
         self.assertFalse(res)
+
+    def test_policy_validation(self):
+        m = Model()
+        m.load_model(get_examples("basic_model.conf"))
+        ast = m["p"]["p"]
+
+        m.add_policy("p", "p", ["alice", "data1", "read"])
+        self.assertTrue(ast.is_policy_valid())
+
+        # the added rules are checked without checking the others again
+        m.add_policies_with_effected("p", "p", [["bob", "data2", "write"], ["admin", "domain1", "data1", "read"]])
+        self.assertEqual(ast.valid_policy[1], ast.policy_version)
+        self.assertFalse(ast.is_policy_valid())
+        self.assertFalse(m.validate_policy())
+
+        m.remove_policy("p", "p", ["admin", "domain1", "data1", "read"])
+        self.assertTrue(m.validate_policy())
+        m.update_policy("p", "p", ["bob", "data2", "write"], ["bob", "data2", "read"])
+        self.assertTrue(ast.is_policy_valid())
+
+        # changes made without the model are found when the policy is used
+        ast.policy.append(["eve", "data3"])
+        self.assertFalse(ast.is_policy_valid())
+
+    def test_add_policies_with_effected(self):
+        m = Model()
+        m.load_model(get_examples("priority_model_explicit.conf"))
+        m.sort_policies_by_priority()
+        ast = m["p"]["p"]
+
+        # rules appended without the model are found when the policy is used
+        ast.policy.append(["1", "alice", "data1", "read", "allow"])
+        ast.policy.append(["3", "bob", "data1", "read", "allow"])
+        effected = m.add_policies_with_effected(
+            "p",
+            "p",
+            [
+                ["3", "carol", "data1", "read", "allow"],
+                ["1", "alice", "data1", "read", "allow"],
+                ["2", "dave", "data1", "read", "allow"],
+                ["0", "eve", "data1", "read", "deny"],
+                ["2", "dave", "data1", "read", "allow"],
+            ],
+        )
+        self.assertEqual([rule[1] for rule in effected], ["carol", "dave", "eve"])
+        self.assertEqual([rule[1] for rule in ast.policy], ["eve", "alice", "dave", "bob", "carol"])
+        self.assertEqual(ast.policy_map["2,dave,data1,read,allow"], 2)
+
+        # the key of a removed rule is not kept
+        m.remove_policy("p", "p", ["2", "dave", "data1", "read", "allow"])
+        effected = m.add_policies_with_effected("p", "p", [["2", "dave", "data1", "read", "allow"]])
+        self.assertEqual(len(effected), 1)
+        self.assertEqual(m.add_policies_with_effected("p", "p", [["2", "dave", "data1", "read", "allow"]]), [])
+        self.assertEqual([rule[1] for rule in ast.policy], ["eve", "alice", "dave", "bob", "carol"])
@@ -0,0 +1,92 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase, skipIf, skipUnless
+
+import casbin
+from casbin.model.policy_columnar import get_column_conditions, is_columnar_supported
+from tests.test_enforcer import get_examples
+
+R_TOKENS = ("r_sub", "r_obj", "r_act")
+P_TOKENS = ("p_sub", "p_obj", "p_act")
+
+
+class TestColumnConditions(TestCase):
+    def test_conjunction(self):
+        self.assertEqual(
+            get_column_conditions("g(r_sub, p_sub) && r_obj == p_obj && (p_act == r_act)", R_TOKENS, P_TOKENS),
+            (("==", "p_obj", "r_obj", None), ("==", "p_act", "r_act", None)),
+        )
+        self.assertEqual(
+            get_column_conditions('r_sub == p_sub && p_act != "deny" && keyMatch(r_obj, p_obj)', R_TOKENS, P_TOKENS),
+            (("==", "p_sub", "r_sub", None), ("!=", "p_act", None, "deny")),
+        )
+        # operators inside strings are not split
+        self.assertEqual(
+            get_column_conditions('r_sub == "a||b" && r_obj == p_obj', R_TOKENS, P_TOKENS),
+            (("==", "p_obj", "r_obj", None),),
+        )
+
+    def test_unsupported(self):
+        self.assertEqual(get_column_conditions("r_sub == p_sub || r_obj == p_obj", R_TOKENS, P_TOKENS), ())
+        self.assertEqual(get_column_conditions("!(r_sub == p_sub)", R_TOKENS, P_TOKENS), ())
+        self.assertEqual(get_column_conditions("r_sub == r_obj && p_sub == p_obj", R_TOKENS, P_TOKENS), ())
+
+
+@skipUnless(is_columnar_supported(), "numpy is not installed")
+class TestColumnarPolicy(TestCase):
+    def assert_same_results(self, model, policy, requests):
+        e = casbin.Enforcer(get_examples(model), get_examples(policy))
+        columnar = casbin.Enforcer(get_examples(model), get_examples(policy))
+        columnar.enable_columnar_policy()
+        for request in requests:
+            self.assertEqual(columnar.enforce_ex(*request), e.enforce_ex(*request), request)
+
+    def test_enforce(self):
+        requests = [
+            (sub, obj, act)
+            for sub in ["alice", "bob", "data2_admin", "eve"]
+            for obj in ["data1", "data2", "data3"]
+            for act in ["read", "write"]
+        ]
+        self.assert_same_results("rbac_model.conf", "rbac_policy.csv", requests)
+        self.assert_same_results("basic_model.conf", "basic_policy.csv", requests)
+        self.assert_same_results("priority_model.conf", "priority_policy.csv", requests)
+
+    def test_policy_changes(self):
+        e = casbin.Enforcer(get_examples("basic_model.conf"), get_examples("basic_policy.csv"))
+        e.enable_auto_save(False)
+        e.enable_columnar_policy()
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+
+        e.remove_policy("alice", "data1", "read")
+        e.add_policy("alice", "data3", "read")
+        self.assertFalse(e.enforce("alice", "data1", "read"))
+        self.assertTrue(e.enforce("alice", "data3", "read"))
+
+        e.update_policy(["alice", "data3", "read"], ["alice", "data4", "read"])
+        self.assertEqual(e.enforce_ex("alice", "data4", "read"), (True, ["alice", "data4", "read"]))
+
+        e.load_policy()
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+
+
+@skipIf(is_columnar_supported(), "numpy is installed")
+class TestColumnarPolicyWithoutNumpy(TestCase):
+    def test_enable(self):
+        e = casbin.Enforcer(get_examples("basic_model.conf"), get_examples("basic_policy.csv"))
+        with self.assertRaises(ImportError):
+            e.enable_columnar_policy()
+        e.enable_columnar_policy(False)
+        self.assertTrue(e.enforce("alice", "data1", "read"))
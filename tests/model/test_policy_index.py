@@ -0,0 +1,225 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+import casbin
+from casbin.model.policy_columnar import get_exact_match_columns, get_role_condition
+from tests.test_enforcer import get_examples
+
+R_TOKENS = ("r_sub", "r_obj", "r_act")
+P_TOKENS = ("p_sub", "p_obj", "p_act")
+
+
+class TestExactMatchIndex(TestCase):
+    def test_exact_match_columns(self):
+        self.assertEqual(
+            get_exact_match_columns("r_sub == p_sub && p_obj == r_obj && (r_act == p_act)", R_TOKENS, P_TOKENS),
+            ((0, 0), (1, 1), (2, 2)),
+        )
+        # the eft field does not need a comparison
+        self.assertEqual(
+            get_exact_match_columns(
+                "r_sub == p_sub && r_obj == p_obj", ("r_sub", "r_obj"), ("p_sub", "p_obj", "p_eft")
+            ),
+            ((0, 0), (1, 1)),
+        )
+
+        # other matchers are evaluated rule by rule
+        self.assertIsNone(get_exact_match_columns("r_sub == p_sub && r_obj == p_obj", R_TOKENS, P_TOKENS))
+        self.assertIsNone(
+            get_exact_match_columns("g(r_sub, p_sub) && r_obj == p_obj && r_act == p_act", R_TOKENS, P_TOKENS)
+        )
+        self.assertIsNone(
+            get_exact_match_columns('r_sub == p_sub && r_obj == p_obj && p_act == "read"', R_TOKENS, P_TOKENS)
+        )
+        self.assertIsNone(
+            get_exact_match_columns("r_sub == p_sub && r_obj == p_obj && r_act != p_act", R_TOKENS, P_TOKENS)
+        )
+        self.assertIsNone(
+            get_exact_match_columns("r_sub == p_sub && r_obj == p_obj || r_act == p_act", R_TOKENS, P_TOKENS)
+        )
+
+    def assert_same_results(self, model, policy):
+        e = casbin.Enforcer(get_examples(model), get_examples(policy))
+        evaluated = casbin.Enforcer(get_examples(model), get_examples(policy))
+        evaluated.enable_exact_match_index(False)
+        for sub in ["alice", "bob", "data2_admin", "eve"]:
+            for obj in ["data1", "data2", "data3"]:
+                for act in ["read", "write"]:
+                    self.assertEqual(e.enforce_ex(sub, obj, act), evaluated.enforce_ex(sub, obj, act))
+        requests = [["alice", "data1", "read"], ["bob", "data2", "write"], ["bob", "data1", "write"]]
+        self.assertEqual(e.batch_enforce(requests), evaluated.batch_enforce(requests))
+
+    def test_enforce(self):
+        self.assert_same_results("basic_model.conf", "basic_policy.csv")
+        self.assert_same_results("basic_with_root_model.conf", "basic_policy.csv")
+        self.assert_same_results("rbac_model.conf", "rbac_policy.csv")
+
+        e = casbin.Enforcer(get_examples("basic_model.conf"), get_examples("basic_policy.csv"))
+        self.assertEqual(e.enforce_ex("alice", "data1", "read"), (True, ["alice", "data1", "read"]))
+        self.assertEqual(e.enforce_ex("alice", "data1", "write"), (False, []))
+        # unhashable request values are left to the matcher
+        self.assertFalse(e.enforce("alice", ["data1"], "read"))
+
+    def test_policy_changes(self):
+        e = casbin.Enforcer(get_examples("basic_model.conf"), get_examples("basic_policy.csv"))
+        e.enable_auto_save(False)
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+
+        e.remove_policy("alice", "data1", "read")
+        e.add_policy("alice", "data3", "read")
+        self.assertFalse(e.enforce("alice", "data1", "read"))
+        self.assertTrue(e.enforce("alice", "data3", "read"))
+
+        e.update_policy(["alice", "data3", "read"], ["alice", "data4", "read"])
+        self.assertEqual(e.enforce_ex("alice", "data4", "read"), (True, ["alice", "data4", "read"]))
+        self.assertFalse(e.enforce("alice", "data3", "read"))
+
+        e.load_policy()
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+
+
+class TestDomainPartitions(TestCase):
+    def test_enforce(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        evaluated = casbin.Enforcer(
+            get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv")
+        )
+        evaluated.enable_domain_partitions(False)
+        for enforcer in [e, evaluated]:
+            enforcer.enable_subject_index(False)
+        for sub in ["alice", "bob", "admin"]:
+            for dom in ["domain1", "domain2", "domain3"]:
+                for obj in ["data1", "data2"]:
+                    for act in ["read", "write"]:
+                        request = (sub, dom, obj, act)
+                        self.assertEqual(e.enforce_ex(*request), evaluated.enforce_ex(*request), request)
+        self.assertEqual(list(e._domain_partitions), ["p"])
+        self.assertEqual(e._domain_partitions["p"].get(("domain1",)), [0, 1])
+
+    def test_policy_changes(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        e.enable_auto_save(False)
+        self.assertFalse(e.enforce("bob", "domain1", "data1", "read"))
+
+        e.add_grouping_policy("bob", "admin", "domain1")
+        self.assertTrue(e.enforce("bob", "domain1", "data1", "read"))
+        e.add_policy("admin", "domain3", "data3", "read")
+        e.add_grouping_policy("carol", "admin", "domain3")
+        self.assertEqual(
+            e.enforce_ex("carol", "domain3", "data3", "read"), (True, ["admin", "domain3", "data3", "read"])
+        )
+        e.remove_filtered_policy(1, "domain1")
+        self.assertFalse(e.enforce("alice", "domain1", "data1", "read"))
+        self.assertTrue(e.enforce("bob", "domain2", "data2", "read"))
+
+
+class TestSubjectIndex(TestCase):
+    def test_role_condition(self):
+        self.assertEqual(
+            get_role_condition("g(r_sub, p_sub) && r_obj == p_obj && r_act == p_act", R_TOKENS, P_TOKENS, ("g",)),
+            ("g", "r_sub", "p_sub", None),
+        )
+        self.assertEqual(
+            get_role_condition(
+                "r_sub == p_sub && g2(r_obj, p_obj, r_dom)", R_TOKENS + ("r_dom",), P_TOKENS, ("g", "g2")
+            ),
+            ("g2", "r_obj", "p_obj", "r_dom"),
+        )
+        self.assertIsNone(get_role_condition("g(r_sub, p_sub) || r_sub == p_sub", R_TOKENS, P_TOKENS, ("g",)))
+        self.assertIsNone(get_role_condition("g(p_sub, r_sub)", R_TOKENS, P_TOKENS, ("g",)))
+        self.assertIsNone(get_role_condition("keyMatch(r_sub, p_sub)", R_TOKENS, P_TOKENS, ("g",)))
+
+    def get_enforcers(self, model, policy):
+        e = casbin.Enforcer(get_examples(model), get_examples(policy))
+        evaluated = casbin.Enforcer(get_examples(model), get_examples(policy))
+        evaluated.enable_subject_index(False)
+        return e, evaluated
+
+    def assert_same_results(self, e, evaluated, requests):
+        for request in requests:
+            self.assertEqual(e.enforce_ex(*request), evaluated.enforce_ex(*request), request)
+        self.assertEqual(e.batch_enforce(requests), evaluated.batch_enforce(requests))
+
+    def test_enforce(self):
+        requests = [
+            (sub, obj, act)
+            for sub in ["alice", "bob", "data2_admin", "eve"]
+            for obj in ["data1", "data2", "data3"]
+            for act in ["read", "write"]
+        ]
+        self.assert_same_results(*self.get_enforcers("rbac_model.conf", "rbac_policy.csv"), requests)
+        self.assert_same_results(
+            *self.get_enforcers("rbac_with_deny_model.conf", "rbac_with_deny_policy.csv"), requests
+        )
+        self.assert_same_results(
+            *self.get_enforcers("rbac_with_resource_roles_model.conf", "rbac_with_resource_roles_policy.csv"), requests
+        )
+
+        e, _ = self.get_enforcers("rbac_model.conf", "rbac_policy.csv")
+        self.assertEqual(e.enforce_ex("alice", "data2", "read"), (True, ["data2_admin", "data2", "read"]))
+
+    def test_domains(self):
+        e, evaluated = self.get_enforcers("rbac_with_domains_model.conf", "rbac_with_domains_policy.csv")
+        requests = [
+            (sub, dom, obj, act)
+            for sub in ["alice", "bob", "admin"]
+            for dom in ["domain1", "domain2"]
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+        self.assert_same_results(e, evaluated, requests)
+
+    def test_pattern_roles(self):
+        e, evaluated = self.get_enforcers("rbac_with_pattern_model.conf", "rbac_with_pattern_policy.csv")
+        for enforcer in [e, evaluated]:
+            enforcer.add_named_matching_func("g", casbin.util.key_match2)
+            enforcer.add_named_matching_func("g2", casbin.util.key_match2)
+            enforcer.add_grouping_policy("/user/:id", "pen_admin")
+
+        self.assertTrue(e.enforce("/user/1", "/pen/3", "GET"))
+        requests = [
+            (sub, obj, "GET")
+            for sub in ["alice", "bob", "/user/1", "/user/2/3"]
+            for obj in ["/book/1", "/pen/1", "/pen/2", "/pen2/1"]
+        ]
+        self.assert_same_results(e, evaluated, requests)
+
+    def test_pattern_role_of_user(self):
+        e = casbin.Enforcer(get_examples("rbac_model.conf"))
+        e.add_named_matching_func("g", casbin.util.key_match)
+        e.add_grouping_policy("alice", "data*")
+        e.add_policy("data1_admin", "data1", "read")
+
+        # data1_admin is only a role of alice through the data* pattern
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+        self.assertEqual(e.batch_enforce([("alice", "data1", "read"), ("data1_admin", "data1", "read")]), [True, True])
+
+    def test_role_changes(self):
+        e, _ = self.get_enforcers("rbac_model.conf", "rbac_policy.csv")
+        e.enable_auto_save(False)
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+        e.add_role_for_user("bob", "data2_admin")
+        self.assertTrue(e.enforce("bob", "data2", "read"))
+        e.delete_role_for_user("bob", "data2_admin")
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+
+        # the roles are found up to the max hierarchy level of the role manager
+        e.add_role_for_user("bob", "data2_reader")
+        e.add_role_for_user("data2_reader", "data2_admin")
+        self.assertTrue(e.enforce("bob", "data2", "read"))
+        e.get_role_manager().max_hierarchy_level = 2
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+        self.assertTrue(e.enforce("data2_reader", "data2", "read"))
@@ -0,0 +1,69 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+import casbin
+from casbin.effect import Effector, EffectMask
+from casbin.model.policy_partition import EffectPartition
+from tests.test_enforcer import get_examples
+
+
+class TestEffectPartition(TestCase):
+    def get_assertion(self):
+        e = casbin.Enforcer(get_examples("rbac_with_deny_model.conf"), get_examples("rbac_with_deny_policy.csv"))
+        return e, e.get_model()["p"]["p"]
+
+    def test_split(self):
+        _, ast = self.get_assertion()
+        ast.policy.append(["carol", "data3", "read", "maybe"])
+        partition = EffectPartition(ast, 3)
+
+        deny = [i for i, rule in enumerate(ast.policy) if rule[3] == "deny"]
+        others = [i for i, rule in enumerate(ast.policy) if rule[3] != "deny"]
+        rows, other_rows = partition.split(Effector.DENY)
+        self.assertEqual(list(rows), deny)
+        self.assertEqual(list(other_rows), others)
+
+        candidates = [0, len(ast.policy) - 1] + deny
+        self.assertEqual(partition.split(Effector.DENY, candidates), (deny, [0, len(ast.policy) - 1]))
+
+    def test_is_current(self):
+        e, ast = self.get_assertion()
+        partition = EffectPartition(ast, 3)
+        self.assertTrue(partition.is_current(ast, 3))
+        self.assertFalse(partition.is_current(ast, 2))
+
+        e.add_policy("eve", "data1", "read", "deny")
+        self.assertFalse(partition.is_current(ast, 3))
+
+    def test_enforce_after_changes(self):
+        e, _ = self.get_assertion()
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+        e.add_policy("alice", "data2", "read", "deny")
+        self.assertTupleEqual(e.enforce_ex("alice", "data2", "read"), (False, ["alice", "data2", "read", "deny"]))
+        self.assertEqual(e.batch_enforce([["alice", "data2", "read"], ["bob", "data2", "write"]]), [False, True])
+        e.remove_policy("alice", "data2", "read", "deny")
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+
+
+class TestEffectMask(TestCase):
+    def test_effects(self):
+        mask = EffectMask(1 << Effector.ALLOW | 1 << Effector.DENY)
+        self.assertIn(Effector.ALLOW, mask)
+        self.assertIn(Effector.DENY, mask)
+        self.assertNotIn(Effector.INDETERMINATE, mask)
+        self.assertEqual(list(mask), [Effector.ALLOW, Effector.DENY])
+        self.assertEqual(len(mask), 2)
+        self.assertEqual(len(EffectMask(0)), 0)
@@ -1,5 +1,17 @@
-from casbin.persist.adapter import _extract_tokens
+import io
+
+import casbin
+from casbin.persist import uses_policy_stream
+from casbin.persist.adapter import (
+    _extract_tokens,
+    iter_policy_batches,
+    load_policy_line,
+    load_policy_lines,
+    read_policy_lines,
+)
+from casbin.persist.adapters import FileAdapter, FilteredFileAdapter, JournaledFileAdapter, StringAdapter
 from tests import TestCaseBase
+from tests.test_enforcer import get_examples
 
 
 class TestExtractTokens(TestCaseBase):
@@ -51,3 +63,71 @@ class TestExtractTokens(TestCaseBase):
                 "parens_and_square(inside1[], inside2[])",
             ],
         )
+
+
+class TestLoadPolicyLines(TestCaseBase):
+    def test_fast_path_matches_nested_tokenizer(self):
+        for line in ["p, alice, data1, read", " g ,  alice,admin ,", "a,,b", "single", "p, a b, c\t"]:
+            self.assertEqual(_extract_tokens(line), [token.strip() for token in line.split(",")])
+
+    def test_read_policy_lines(self):
+        content = "p, alice, data1, read\r\n\n# comment\np, bôb, dätä2, write\ng, alice, admin"
+        file = io.BytesIO(content.encode())
+        self.assertEqual(
+            list(read_policy_lines(file, chunk_size=3)),
+            ["p, alice, data1, read", "", "# comment", "p, bôb, dätä2, write", "g, alice, admin"],
+        )
+
+    def test_load_policy_lines_matches_load_policy_line(self):
+        model_path = get_examples("rbac_with_domains_model.conf")
+        with open(get_examples("rbac_with_domains_policy.csv"), "rb") as file:
+            lines = list(read_policy_lines(file, chunk_size=7))
+        lines.append("p2, ignored, rule")
+
+        expected = casbin.Enforcer.new_model(model_path)
+        for line in lines:
+            load_policy_line(line, expected)
+
+        actual = casbin.Enforcer.new_model(model_path)
+        load_policy_lines(lines, actual)
+
+        for sec in ["p", "g"]:
+            for key, ast in expected[sec].items():
+                self.assertEqual(actual[sec][key].policy, ast.policy)
+
+
+class TestPolicyStream(TestCaseBase):
+    def test_iter_policy_batches(self):
+        lines = ["p, alice, data1, read", "", "# comment", "g, alice, admin", "p, bob, data2, write"]
+        self.assertEqual(
+            list(iter_policy_batches(lines, batch_size=2)),
+            [[("p", ["alice", "data1", "read"]), ("g", ["alice", "admin"])], [("p", ["bob", "data2", "write"])]],
+        )
+
+    def test_adapters_stream_the_loaded_rules(self):
+        path = get_examples("rbac_with_domains_policy.csv")
+        with open(path) as file:
+            text = file.read()
+
+        for adapter in [FileAdapter(path), FilteredFileAdapter(path), StringAdapter(text)]:
+            self.assertTrue(uses_policy_stream(adapter))
+            expected = casbin.Enforcer.new_model(get_examples("rbac_with_domains_model.conf"))
+            adapter.load_policy(expected)
+            rules = [rule for batch in adapter.iter_policy(batch_size=3) for rule in batch]
+            self.assertEqual(
+                rules,
+                [(ptype, rule) for sec in ["p", "g"] for ptype, ast in expected[sec].items() for rule in ast.policy],
+            )
+
+        # adapters that load the policy in their own way are not streamed
+        self.assertFalse(uses_policy_stream(JournaledFileAdapter(path)))
+        self.assertFalse(uses_policy_stream(casbin.persist.Adapter()))
+
+    def test_streamed_load_policy(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        e.enable_compact_policy()
+        e.load_policy()
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+        self.assertFalse(e.enforce("alice", "domain2", "data2", "read"))
+        self.assertEqual(e.get_roles_for_user_in_domain("bob", "domain2"), ["admin"])
+        self.assertEqual(e.get_policy()[0], ["admin", "domain1", "data1", "read"])
@@ -0,0 +1,91 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+
+import casbin
+from casbin.persist.adapters import JournaledFileAdapter
+from tests.test_enforcer import get_examples, TestCaseBase
+
+
+class TestJournaledFileAdapter(TestCaseBase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "rbac_policy.csv")
+        shutil.copyfile(get_examples("rbac_policy.csv"), self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_enforcer(self, adapter):
+        return casbin.Enforcer(get_examples("rbac_model.conf"), adapter)
+
+    def test_changes_are_journaled(self):
+        with open(self.path) as file:
+            base = file.read()
+
+        adapter = JournaledFileAdapter(self.path, compact_threshold=None)
+        e = self.get_enforcer(adapter)
+        e.add_policy("eve", "data3", "read")
+        e.add_grouping_policies([["carol", "data2_admin"], ["dave", "data2_admin"]])
+        e.remove_policy("alice", "data1", "read")
+        e.update_policy(["bob", "data2", "write"], ["bob", "data2", "read"])
+        e.remove_filtered_grouping_policy(0, "dave")
+        adapter.close()
+
+        # the base file is untouched, every change is a journal record
+        with open(self.path) as file:
+            self.assertEqual(file.read(), base)
+        self.assertEqual(adapter.journal_size(), 7)
+
+        reloaded = self.get_enforcer(JournaledFileAdapter(self.path))
+        self.assertEqual(sorted(reloaded.get_policy()), sorted(e.get_policy()))
+        self.assertEqual(sorted(reloaded.get_grouping_policy()), sorted(e.get_grouping_policy()))
+        self.assertTrue(reloaded.enforce("carol", "data2", "write"))
+        self.assertFalse(reloaded.enforce("dave", "data2", "write"))
+        self.assertFalse(reloaded.enforce("alice", "data1", "read"))
+
+    def test_compaction(self):
+        adapter = JournaledFileAdapter(self.path, fsync="never", compact_threshold=10)
+        e = self.get_enforcer(adapter)
+        for i in range(25):
+            e.add_policy("user%d" % i, "data1", "read")
+        e.remove_policy("user3", "data1", "read")
+        adapter.close()
+        adapter.compact()
+
+        self.assertFalse(os.path.exists(self.path + ".journal.old"))
+        reloaded = self.get_enforcer(JournaledFileAdapter(self.path, compact_threshold=None))
+        self.assertEqual(sorted(reloaded.get_policy()), sorted(e.get_policy()))
+
+        # compacted rows are plain policy lines
+        base_only = casbin.Enforcer(get_examples("rbac_model.conf"), self.path)
+        self.assertEqual(sorted(base_only.get_policy()), sorted(e.get_policy()))
+
+    def test_save_policy_resets_journal(self):
+        adapter = JournaledFileAdapter(self.path)
+        e = self.get_enforcer(adapter)
+        e.add_policy("eve", "data3", "read")
+        e.save_policy()
+        self.assertEqual(adapter.journal_size(), 0)
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+
+        reloaded = self.get_enforcer(JournaledFileAdapter(self.path))
+        self.assertTrue(reloaded.enforce("eve", "data3", "read"))
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            JournaledFileAdapter(self.path, fsync="sometimes")
@@ -0,0 +1,81 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+import casbin
+from casbin.persist.adapters import SnapshotAdapter
+from tests.test_enforcer import get_examples, TestCaseBase
+
+
+class TestSnapshotAdapter(TestCaseBase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "policy.snap")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_same_policy(self, e1, e2, ordered=True):
+        for sec in ["p", "g"]:
+            for ptype, ast in e1.model[sec].items():
+                if ordered:
+                    self.assertEqual(ast.policy, e2.model[sec][ptype].policy)
+                else:
+                    self.assertEqual(sorted(ast.policy), sorted(e2.model[sec][ptype].policy))
+
+    def test_round_trip(self):
+        for model, policy in [
+            ("rbac_with_domains_model.conf", "rbac_with_domains_policy.csv"),
+            ("priority_model.conf", "priority_policy.csv"),
+            ("subject_priority_model_with_domain.conf", "subject_priority_policy_with_domain.csv"),
+        ]:
+            e = casbin.Enforcer(get_examples(model), get_examples(policy))
+            e.add_named_grouping_policy("g", ["é", "ünicode", "extra", "column"])
+            e.save_snapshot(self.path)
+
+            restored = casbin.Enforcer(get_examples(model))
+            restored.load_snapshot(self.path)
+            self.assert_same_policy(e, restored)
+            self.assertEqual(restored.model["p"]["p"].priority_index, e.model["p"]["p"].priority_index)
+            self.assertEqual(restored.get_all_roles(), e.get_all_roles())
+
+            # the snapshot adapter can also be used as the enforcer adapter
+            adapter_enforcer = casbin.Enforcer(get_examples(model), SnapshotAdapter(self.path))
+            self.assert_same_policy(e, adapter_enforcer, ordered=False)
+
+    def test_enforce_after_load(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"))
+        casbin.Enforcer(
+            get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv")
+        ).save_snapshot(self.path)
+        e.load_snapshot(self.path)
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+        self.assertFalse(e.enforce("alice", "domain2", "data2", "read"))
+        self.assertTrue(e.enforce("bob", "domain2", "data2", "write"))
+
+    def test_stale_snapshot(self):
+        casbin.Enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv")).save_snapshot(self.path)
+
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        with self.assertRaises(RuntimeError):
+            e.load_snapshot(self.path)
+        # the current policy is kept
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot")
+        with self.assertRaises(RuntimeError):
+            e.load_snapshot(self.path)
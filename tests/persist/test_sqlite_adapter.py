@@ -0,0 +1,113 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+
+import casbin
+from casbin.persist.adapters import SQLiteAdapter
+from casbin.persist.adapters.asyncio import AsyncSQLiteAdapter
+from casbin.persist.adapters.sqlite_adapter import Filter
+from tests.test_enforcer import get_examples, TestCaseBase
+
+
+class TestSQLiteAdapter(TestCaseBase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "casbin.db")
+        adapter = SQLiteAdapter(self.path)
+        adapter.save_policy(
+            casbin.Enforcer(
+                get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv")
+            ).get_model()
+        )
+        adapter.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_enforcer(self, adapter):
+        return casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), adapter)
+
+    def test_load_and_auto_save(self):
+        adapter = SQLiteAdapter(self.path)
+        e = self.get_enforcer(adapter)
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+
+        e.add_policies([["eve", "domain1", "data3", "read"], ["eve", "domain1", "data3", "write"]])
+        e.remove_policy("admin", "domain2", "data2", "write")
+        e.update_policy(["admin", "domain1", "data1", "write"], ["admin", "domain1", "data4", "write"])
+        e.add_grouping_policy("carol", "admin", "domain2")
+        e.remove_filtered_grouping_policy(0, "bob")
+        adapter.close()
+
+        reloaded = self.get_enforcer(SQLiteAdapter(self.path))
+        self.assertEqual(sorted(reloaded.get_policy()), sorted(e.get_policy()))
+        self.assertEqual(sorted(reloaded.get_grouping_policy()), sorted(e.get_grouping_policy()))
+        self.assertTrue(reloaded.enforce("carol", "domain2", "data2", "read"))
+        self.assertFalse(reloaded.enforce("bob", "domain2", "data2", "read"))
+
+    def test_load_filtered_policy(self):
+        adapter = SQLiteAdapter(self.path, fetch_size=1)
+        e = self.get_enforcer(adapter)
+        e.load_filtered_policy(Filter(v1=["domain1"]))
+        self.assertTrue(e.is_filtered())
+        self.assertEqual(
+            e.get_policy(), [["admin", "domain1", "data1", "read"], ["admin", "domain1", "data1", "write"]]
+        )
+        self.assertEqual(e.get_grouping_policy(), [])
+
+        e.load_filtered_policy(Filter(ptype=["g"], v2=["domain2"]))
+        self.assertEqual(e.get_grouping_policy(), [["bob", "admin", "domain2"]])
+        with self.assertRaises(RuntimeError):
+            e.save_policy()
+
+    def test_update_filtered_policies(self):
+        adapter = SQLiteAdapter(self.path)
+        e = self.get_enforcer(adapter)
+        e.update_filtered_policies([["admin", "domain1", "data5", "read"]], 0, "admin", "domain1")
+        self.assertEqual(
+            sorted(self.get_enforcer(SQLiteAdapter(self.path)).get_policy()),
+            [
+                ["admin", "domain1", "data5", "read"],
+                ["admin", "domain2", "data2", "read"],
+                ["admin", "domain2", "data2", "write"],
+            ],
+        )
+
+    def test_too_many_fields(self):
+        adapter = SQLiteAdapter(self.path)
+        with self.assertRaises(ValueError):
+            adapter.add_policy("p", "p", ["a", "b", "c", "d", "e", "f", "g"])
+
+
+class TestAsyncSQLiteAdapter(IsolatedAsyncioTestCase):
+    async def test_load_and_auto_save(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "casbin.db")
+            adapter = AsyncSQLiteAdapter(path)
+            e = casbin.AsyncEnforcer(get_examples("rbac_model.conf"), adapter)
+            await e.add_policy("alice", "data1", "read")
+            await e.add_grouping_policy("bob", "data2_admin")
+            await e.add_policy("data2_admin", "data2", "write")
+            adapter.close()
+
+            e = casbin.AsyncEnforcer(get_examples("rbac_model.conf"), AsyncSQLiteAdapter(path))
+            await e.load_policy()
+            self.assertTrue(e.enforce("alice", "data1", "read"))
+            self.assertTrue(e.enforce("bob", "data2", "write"))
+
+            await e.load_filtered_policy(Filter(ptype=["p"], v0=["alice"]))
+            self.assertEqual(e.get_policy(), [["alice", "data1", "read"]])
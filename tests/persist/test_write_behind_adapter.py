@@ -0,0 +1,88 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import casbin
+from casbin.persist.adapters import FileAdapter, WriteBehindAdapter
+from tests.test_enforcer import get_examples, TestCaseBase
+
+
+class RecordingAdapter(FileAdapter):
+    def __init__(self, file_path, fail_on=None):
+        super().__init__(file_path)
+        self.fail_on = fail_on
+        self.calls = []
+
+    def add_policies(self, sec, ptype, rules):
+        if self.fail_on == "add":
+            raise RuntimeError("storage unavailable")
+        self.calls.append(("add_policies", ptype, len(rules)))
+
+    def remove_policies(self, sec, ptype, rules):
+        self.calls.append(("remove_policies", ptype, len(rules)))
+
+    def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        self.calls.append(("remove_filtered_policy", ptype, field_values))
+
+
+class TestWriteBehindAdapter(TestCaseBase):
+    def test_group_commit(self):
+        inner = RecordingAdapter(get_examples("rbac_policy.csv"))
+        with WriteBehindAdapter(inner, flush_interval=10) as adapter:
+            e = casbin.Enforcer(get_examples("rbac_model.conf"), adapter)
+            for i in range(100):
+                self.assertTrue(e.add_grouping_policy("user%d" % i, "data2_admin"))
+            e.add_policy("eve", "data3", "read")
+            e.remove_policy("alice", "data1", "read")
+            e.remove_filtered_policy(0, "bob")
+
+            # in-memory state is updated before the storage catches up
+            self.assertTrue(e.enforce("user42", "data2", "read"))
+            self.assertFalse(e.enforce("alice", "data1", "read"))
+
+            adapter.flush()
+            self.assertEqual(adapter.pending(), 0)
+            self.assertEqual(
+                inner.calls,
+                [
+                    ("add_policies", "g", 100),
+                    ("add_policies", "p", 1),
+                    ("remove_policies", "p", 1),
+                    ("remove_filtered_policy", "p", ("bob",)),
+                ],
+            )
+
+        with self.assertRaises(RuntimeError):
+            adapter.add_policy("p", "p", ["eve", "data3", "write"])
+
+    def test_close_flushes(self):
+        inner = RecordingAdapter(get_examples("rbac_policy.csv"))
+        adapter = WriteBehindAdapter(inner, flush_interval=10)
+        adapter.add_policies("p", "p", [["eve", "data3", "read"]])
+        adapter.add_policies("p", "p", [["eve", "data3", "write"]])
+        adapter.close()
+        self.assertEqual(inner.calls, [("add_policies", "p", 2)])
+
+    def test_error_callback(self):
+        errors = []
+        inner = RecordingAdapter(get_examples("rbac_policy.csv"), fail_on="add")
+        with WriteBehindAdapter(inner, on_error=lambda error, operation: errors.append((error, operation))) as adapter:
+            e = casbin.Enforcer(get_examples("rbac_model.conf"), adapter)
+            e.add_policy("eve", "data3", "read")
+            adapter.flush()
+
+        self.assertEqual(len(errors), 1)
+        error, operation = errors[0]
+        self.assertIsInstance(error, RuntimeError)
+        self.assertEqual(operation.kind, "add")
+        self.assertEqual(operation.args, [["eve", "data3", "read"]])
@@ -12,4 +12,4 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .test_role_manager import TestRoleManager, TestDomainManager
+from .test_role_manager import TestRoleManager, TestDomainManager, TestConditionalRoleManager
@@ -244,6 +244,54 @@ class TestRoleManager(TestCase):
         rm.add_link("u1", r"g\d+")
         self.assertTrue(rm.has_link("u1", "root"))
 
+    def test_link_cache(self):
+        rm = self.get_role_manager()
+        rm.add_link("u1", "g1")
+        rm.add_link("g1", "g2")
+
+        self.assertTrue(rm.has_link("u1", "g2"))
+        self.assertTrue(rm.has_link("u1", "g2"))
+        self.assertEqual(rm.get_roles("u1"), ["g1"])
+        self.assertEqual(rm.get_roles("u1"), ["g1"])
+        stats = rm.get_link_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 2, 2))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+        # changes of the role graph drop the cached results
+        rm.delete_link("g1", "g2")
+        self.assertFalse(rm.has_link("u1", "g2"))
+        rm.add_link("u1", "g2")
+        self.assertTrue(rm.has_link("u1", "g2"))
+        self.assertEqual(sorted(rm.get_roles("u1")), ["g1", "g2"])
+        rm.clear()
+        self.assertFalse(rm.has_link("u1", "g1"))
+
+        rm.set_link_cache_size(1)
+        rm.has_link("u1", "g1")
+        rm.has_link("u2", "g1")
+        self.assertEqual(rm.get_link_cache_stats()["entries"], 1)
+        rm.set_link_cache_size(0)
+        rm.has_link("u3", "g1")
+        self.assertEqual(rm.get_link_cache_stats()["entries"], 0)
+
+    def test_link_cache_with_matching_func(self):
+        rm = self.get_role_manager()
+        rm.add_matching_func(regex_match_func)
+        rm.add_link("u1", r"g\d+")
+        self.assertEqual(rm.get_roles("u1"), [r"g\d+"])
+
+        # the role added by a read gets the links of the matching patterns, the cached results are dropped
+        self.assertTrue(rm.has_link("u1", "g1"))
+        self.assertEqual(sorted(rm.get_roles("u1")), ["g1", r"g\d+"])
+
+    def test_read_does_not_add_roles(self):
+        rm = default_role_manager.RoleManager(max_hierarchy_level=10)
+        rm.add_link("u1", "g1")
+        self.assertFalse(rm.has_link("u2", "g2"))
+        self.assertEqual(rm.get_roles("u3"), [])
+        self.assertEqual(rm.get_users("g3"), [])
+        self.assertEqual(sorted(rm.all_roles), ["g1", "u1"])
+
     def test_concurrent_has_link_with_matching_func(self):
         def matching_func(*args):
             time.sleep(0.01)
@@ -313,3 +361,25 @@ class TestDomainManager(TestRoleManager):
         self.assertTrue(rm.has_link("alice", "users", "domain1"))
         self.assertTrue(rm.has_link("alice", "user", "domain2"))
         self.assertFalse(rm.has_link("alice", "users", "domain2"))
+
+
+class TestConditionalRoleManager(TestCase):
+    def test_link_cache(self):
+        rm = default_role_manager.ConditionalRoleManager(max_hierarchy_level=10)
+        rm.add_link("u1", "g1")
+        rm.add_link("u2", "g2")
+        enabled = [True]
+        rm.add_link_condition_func("u2", "g2", lambda: enabled[0])
+
+        self.assertTrue(rm.has_link("u1", "g1"))
+        self.assertTrue(rm.has_link("u1", "g1"))
+        self.assertEqual(rm.get_link_cache_stats()["hits"], 1)
+
+        # the links with a condition function are evaluated every time
+        self.assertTrue(rm.has_link("u2", "g2"))
+        enabled[0] = False
+        self.assertFalse(rm.has_link("u2", "g2"))
+        self.assertEqual(rm.get_link_cache_stats()["entries"], 1)
+
+        rm.add_link_condition_func("u1", "g1", lambda: False)
+        self.assertFalse(rm.has_link("u1", "g1"))
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, IsolatedAsyncioTestCase
 
 import casbin
@@ -79,6 +83,89 @@ class TestConfig(TestCaseBase):
             results,
         )
 
+    def test_batch_enforce_matches_enforce(self):
+        e = self.get_enforcer(
+            get_examples("rbac_with_domains_model.conf"),
+            get_examples("rbac_with_domains_policy.csv"),
+        )
+        requests = [
+            (sub, dom, obj, act)
+            for sub in ["alice", "bob", "admin", "eve"]
+            for dom in ["domain1", "domain2"]
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+        # duplicated requests are evaluated once and keep their position
+        requests = requests + requests[::-1]
+        self.assertEqual(e.batch_enforce(requests), [e.enforce(*request) for request in requests])
+
+    def test_batch_enforce_with_workers(self):
+        e = self.get_enforcer(
+            get_examples("rbac_with_domains_model.conf"),
+            get_examples("rbac_with_domains_policy.csv"),
+        )
+        requests = [
+            (sub, dom, obj, act)
+            for sub in ["alice", "bob", "admin", "eve"]
+            for dom in ["domain1", "domain2"]
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+        self.assertEqual(e.batch_enforce(requests, workers=4), e.batch_enforce(requests))
+
+    def test_batch_enforce_with_workers_and_matching_func(self):
+        def get_enforcer():
+            e = self.get_enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+            e.add_named_matching_func("g", util.key_match)
+            e.add_grouping_policy("user*", "data2_admin")
+            return e
+
+        # the threads add the roles of the users to the role manager at the same time
+        requests = [
+            ("user{}".format(i), obj, act)
+            for i in range(200)
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+        results = get_enforcer().batch_enforce(requests, workers=8)
+        self.assertEqual(results, get_enforcer().batch_enforce(requests))
+        self.assertEqual(results.count(True), 400)
+
+    def test_enforce_invalid_policy_size(self):
+        e = self.get_enforcer(
+            get_examples("basic_model.conf"),
+            get_examples("basic_policy.csv"),
+        )
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+
+        e.add_policy("eve", "data3")
+        with self.assertRaises(RuntimeError):
+            e.enforce("eve", "data3", "read")
+        e.remove_policy("eve", "data3")
+        e.load_policy()
+        self.assertTrue(e.get_model()["p"]["p"].valid_policy[3])
+        self.assertFalse(e.enforce("eve", "data3", "read"))
+
+    def test_batch_enforce_with_context(self):
+        e = self.get_enforcer(
+            get_examples("multiple_policy_definitions_model.conf"),
+            get_examples("multiple_policy_definitions_policy.csv"),
+        )
+        enforce_context = e.new_enforce_context("2")
+        enforce_context.etype = "e"
+
+        self.assertEqual(
+            e.batch_enforce(
+                [
+                    ("alice", "data2", "read"),
+                    (enforce_context, MockSub("alice", 70), "/data1", "read"),
+                    (enforce_context, MockSub("bob", 30), "/data1", "read"),
+                    ("alice", "data1", "read"),
+                ]
+            ),
+            [True, False, True, False],
+        )
+
     def test_model_set_load(self):
         e = self.get_enforcer(
             get_examples("basic_model.conf"),
@@ -166,6 +253,89 @@ class TestConfig(TestCaseBase):
         self.assertFalse(e.enforce("alice", "/alice_data2/myid", "GET"))
         self.assertTrue(e.enforce("alice", "/alice_data2/myid/using/res_id", "GET"))
 
+    def test_pure_function_memo(self):
+        e = self.get_enforcer(
+            get_examples("keymatch_custom_model.conf"),
+            get_examples("keymatch2_policy.csv"),
+        )
+        calls = []
+
+        def custom_function(key1, key2):
+            calls.append((key1, key2))
+            return casbin.util.key_match2(key1, key2)
+
+        requests = [["alice", "/alice_data2/1/using/2", "GET"], ["alice", "/alice_data2/1/using/2", "POST"]]
+        e.add_function("keyMatchCustom", custom_function, pure=True)
+        self.assertEqual(e.batch_enforce(requests), [True, False])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(e.get_memo_stats(), {"hits": 2, "misses": 2})
+
+        # the results are only cached for one enforce call
+        e.reset_memo_stats()
+        self.assertTrue(e.enforce("alice", "/alice_data2/1/using/2", "GET"))
+        self.assertTrue(e.enforce("alice", "/alice_data2/1/using/2", "GET"))
+        self.assertEqual(e.get_memo_stats(), {"hits": 0, "misses": 4})
+
+        calls.clear()
+        e.add_function("keyMatchCustom", custom_function)
+        self.assertEqual(e.batch_enforce(requests), [True, False])
+        self.assertEqual(len(calls), 4)
+
+    def test_g_function_memo(self):
+        e = self.get_enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+        # every rule is evaluated, so g() is called twice with data2_admin
+        e.enable_subject_index(False)
+        self.assertFalse(e.enforce("alice", "data3", "read"))
+        self.assertEqual(e.get_memo_stats(), {"hits": 1, "misses": 3})
+
+    def test_link_cache_stats(self):
+        e = self.get_enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+        e.enable_subject_index(False)
+        for _ in range(3):
+            self.assertTrue(e.enforce("alice", "data2", "read"))
+        stats = e.get_link_cache_stats()["g"]
+        self.assertEqual((stats["hits"], stats["misses"]), (6, 3))
+
+        e.set_link_cache_size(0)
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+        self.assertEqual(e.get_link_cache_stats()["g"]["hits"], 6)
+
+    def test_load_policy_stream(self):
+        class StreamingAdapter(casbin.persist.adapters.FileAdapter):
+            links = []
+
+            def iter_policy(self, batch_size=1000):
+                yield [("p", ["data2_admin", "data2", "write"]), ("g", ["bob", "data2_admin"])]
+                self.links.append((rm.has_link("alice", "data2_admin"), rm.has_link("bob", "data2_admin")))
+                yield [("g", ["alice", "data1_admin"])]
+                if self.fail:
+                    raise RuntimeError("cannot read the policy")
+
+        adapter = StreamingAdapter(get_examples("rbac_policy.csv"))
+        adapter.fail = True
+        e = self.get_enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+        e.set_adapter(adapter)
+        rm = e.get_role_manager()
+
+        # without the stream the policy is loaded with load_policy and the role manager is kept
+        e.load_policy()
+        self.assertIs(e.get_role_manager(), rm)
+        self.assertEqual(adapter.links, [])
+
+        # the current role links are used until the policy is loaded
+        e.enable_policy_stream()
+        with self.assertRaises(RuntimeError):
+            e.load_policy()
+        self.assertEqual(adapter.links, [(True, False)])
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+
+        adapter.fail = False
+        e.load_policy()
+        self.assertTrue(e.enforce("bob", "data2", "write"))
+        self.assertFalse(e.enforce("alice", "data2", "write"))
+        self.assertTrue(e.has_grouping_policy("alice", "data1_admin"))
+
     def test_enforce_glob_match(self):
         e = self.get_enforcer(
             get_examples("globmatch_model.conf"),
@@ -232,6 +402,30 @@ class TestConfig(TestCaseBase):
         self.assertTrue(e.enforce("jane", "data1", "read"))
         self.assertTrue(e.enforce("alice", "data1", "read"))
 
+    def test_subpriority_order_after_changes(self):
+        e = self.get_enforcer(
+            get_examples("subject_priority_model.conf"),
+            get_examples("subject_priority_policy.csv"),
+        )
+        self.assertTrue(e.add_grouping_policy("bob", "jane"))
+        self.assertTrue(e.enforce("bob", "data1", "read"))
+
+        # the rule of bob goes before the rules of his roles
+        e.add_policy("bob", "data1", "read", "deny")
+        self.assertFalse(e.enforce("bob", "data1", "read"))
+        self.assertEqual(
+            [rule[0] for rule in e.get_policy()], ["alice", "bob", "jane", "subscriber", "editor", "admin", "root"]
+        )
+
+        e.add_grouping_policy("root", "carol")
+        e.add_policy("carol", "data1", "read", "allow")
+        self.assertEqual(e.get_policy()[-1], ["carol", "data1", "read", "allow"])
+        e.remove_grouping_policy("bob", "jane")
+        self.assertEqual(
+            [rule[0] for rule in e.get_policy()],
+            ["alice", "bob", "jane", "subscriber", "editor", "admin", "root", "carol"],
+        )
+
     def test_enforce_subpriority_with_domain(self):
         e = self.get_enforcer(
             get_examples("subject_priority_model_with_domain.conf"),
@@ -294,6 +488,18 @@ class TestConfig(TestCaseBase):
         self.assertTupleEqual(e.enforce_ex("alice", "data2", "read"), (True, ["data2_admin", "data2", "read", "allow"]))
         self.assertTupleEqual(e.enforce_ex("alice", "data2", "write"), (False, ["alice", "data2", "write", "deny"]))
 
+    def test_enforce_ex_rbac_with_not_deny(self):
+        e = self.get_enforcer(
+            get_examples("rbac_with_not_deny_model.conf"),
+            get_examples("rbac_with_deny_policy.csv"),
+        )
+        self.assertTupleEqual(e.enforce_ex("alice", "data2", "read"), (True, ["data2_admin", "data2", "read", "allow"]))
+        self.assertTupleEqual(e.enforce_ex("alice", "data2", "write"), (False, ["alice", "data2", "write", "deny"]))
+        # without a matching deny rule the request is allowed
+        self.assertTupleEqual(e.enforce_ex("alice", "data3", "read"), (True, []))
+        self.assertFalse(e.enforce("alice", "data2", "write"))
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+
     def test_enforce_rbac_with_domains(self):
         e = self.get_enforcer(
             get_examples("rbac_with_domains_model.conf"),
@@ -646,6 +852,150 @@ class TestConfigAsync(IsolatedAsyncioTestCase):
             results,
         )
 
+    async def test_enforce_async(self):
+        e = self.get_enforcer(
+            get_examples("basic_model.conf"),
+            get_examples("basic_policy.csv"),
+        )
+        await e.load_policy()
+
+        batches = []
+        batch_enforce = e.batch_enforce
+
+        def recording_batch_enforce(rvals):
+            batches.append(rvals)
+            return batch_enforce(rvals)
+
+        e.batch_enforce = recording_batch_enforce
+
+        requests = [
+            ("alice", "data1", "read"),
+            ("alice", "data2", "read"),
+            ("bob", "data2", "write"),
+            ("alice", "data1", "read"),
+        ]
+        results = await asyncio.gather(*[e.enforce_async(*request) for request in requests])
+        self.assertEqual(results, [True, False, True, True])
+        # the concurrent calls are one batch, without the duplicated request
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 3)
+
+        # an invalid request only fails its own call
+        results = await asyncio.gather(
+            e.enforce_async("alice", "data1", "read"), e.enforce_async("alice", "data1"), return_exceptions=True
+        )
+        self.assertTrue(results[0])
+        self.assertIsInstance(results[1], RuntimeError)
+
+        e.configure_enforce_async(batch_window=0, max_batch_size=2)
+        results = await asyncio.gather(*[e.enforce_async(*request) for request in requests[:3]])
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(await e.batch_enforce_async(requests), [True, False, True, True])
+
+    async def test_enforce_async_with_policy_change(self):
+        e = self.get_enforcer(
+            get_examples("basic_model.conf"),
+            get_examples("basic_policy.csv"),
+        )
+        await e.load_policy()
+
+        started = threading.Event()
+        release = threading.Event()
+        batch_enforce = e.batch_enforce
+
+        def blocking_batch_enforce(rvals):
+            started.set()
+            release.wait(5)
+            return batch_enforce(rvals)
+
+        e.batch_enforce = blocking_batch_enforce
+        loop = asyncio.get_running_loop()
+        enforced = asyncio.ensure_future(e.enforce_async("alice", "data2", "read"))
+        await loop.run_in_executor(None, started.wait, 5)
+
+        # the change waits for the running batch, which sees the policy before it
+        added = asyncio.ensure_future(e.add_policy("alice", "data2", "read"))
+        await asyncio.sleep(0.01)
+        self.assertFalse(added.done())
+        self.assertFalse(e.has_policy("alice", "data2", "read"))
+
+        release.set()
+        self.assertFalse(await enforced)
+        self.assertTrue(await added)
+        self.assertTrue(await e.enforce_async("alice", "data2", "read"))
+
+        # a batch does not start while a change is made
+        release.clear()
+        started.clear()
+        async with e._changing_policy():
+            enforced = asyncio.ensure_future(e.batch_enforce_async([("alice", "data2", "read")]))
+            await asyncio.sleep(0.01)
+            self.assertFalse(started.is_set())
+        release.set()
+        self.assertEqual(await enforced, [True])
+
+    async def test_load_policy_in_chunks(self):
+        e = self.get_enforcer(
+            get_examples("rbac_model.conf"),
+            get_examples("rbac_policy.csv"),
+        )
+        await e.load_policy()
+        rm = e.get_role_manager()
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, "policy.csv")
+        with open(path, "w") as file:
+            file.write("p, data1_admin, data1, read\n")
+            for i in range(10):
+                file.write("g, user%d, data1_admin\n" % i)
+            file.write("g, alice, data1_admin\n")
+
+        e.adapter = casbin.persist.adapters.asyncio.AsyncFileAdapter(path)
+        seen = []
+
+        async def enforce_while_loading():
+            while not load.done():
+                seen.append(e.enforce("alice", "data2", "read"))
+                await asyncio.sleep(0)
+
+        load = asyncio.ensure_future(e.load_policy(chunk_size=1))
+        await enforce_while_loading()
+        await load
+
+        # the previous policy is used until the new one is complete
+        self.assertGreater(len(seen), 1)
+        self.assertTrue(all(seen))
+        self.assertIsNot(e.get_role_manager(), rm)
+        self.assertFalse(e.enforce("alice", "data2", "read"))
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+        self.assertEqual(await e.get_implicit_roles_for_user("alice"), ["data1_admin"])
+
+        with ThreadPoolExecutor(1) as executor:
+            await e.load_policy(executor=executor)
+        self.assertTrue(e.enforce("alice", "data1", "read"))
+        self.assertEqual(await e.get_implicit_roles_for_user("alice"), ["data1_admin"])
+
+        with self.assertRaises(ValueError):
+            await e.load_policy(chunk_size=0)
+
+    async def test_load_policy_stream(self):
+        class StreamingAdapter(casbin.persist.adapters.asyncio.AsyncFileAdapter):
+            async def load_policy(self, model):
+                raise AssertionError("the policy should be streamed")
+
+            async def aiter_policy(self, batch_size=1000):
+                yield [("p", ["data2_admin", "data2", "read"]), ("g", ["alice", "data2_admin"])]
+                yield [("p3", ["unknown"]), ("g", ["bob", "data2_admin"])]
+
+        e = self.get_enforcer(get_examples("rbac_model.conf"), StreamingAdapter(""))
+        await e.load_policy()
+        self.assertEqual(e.get_policy(), [["data2_admin", "data2", "read"]])
+        self.assertTrue(e.enforce("alice", "data2", "read"))
+        self.assertTrue(e.enforce("bob", "data2", "read"))
+        self.assertFalse(e.enforce("alice", "data1", "read"))
+
     async def test_model_set_load(self):
         e = self.get_enforcer(
             get_examples("basic_model.conf"),
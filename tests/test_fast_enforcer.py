@@ -19,6 +19,7 @@ from unittest import TestCase
 
 import casbin
 from casbin import FastPolicy
+from casbin.persist.adapters.string_adapter import StringAdapter
 
 
 def get_examples(path):
@@ -60,6 +61,27 @@ class TestFastEnforcer(TestCaseBase):
         avg_t_e2 = sum(t_e2_list) / N
         assert avg_t_e1 > avg_t_e2 * 5
 
+    def test_enforce_with_subject_index(self) -> None:
+        requests = [
+            ("staffUser1001", "/orgs/1/sites/site001", "App001.Module001.Action1001"),
+            ("staffUser1001", "/orgs/1/sites/site001", "App001.Module001.Action1050"),
+            ("staffUser1001", "/orgs/2/sites/site001", "App001.Module001.Action1001"),
+            ("alice", "data1", "read"),
+        ]
+        for cache_key_order in (None, [2, 1]):
+            results = []
+            for enabled in (False, True):
+                e = self.get_enforcer(
+                    get_examples("performance/rbac_with_pattern_large_scale_model.conf"),
+                    get_examples("performance/rbac_with_pattern_large_scale_policy.csv"),
+                    cache_key_order,
+                )
+                e.enable_subject_index(enabled)
+                results.append([e.enforce(*request) for request in requests])
+            self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], [False, False, False, False])
+        self.assertTrue(e.enforce("staff001", "/orgs/{orgID}/sites/{siteID}", "App001.Module001.Action1001"))
+
     def test_creates_proper_policy(self) -> None:
         e = self.get_enforcer(
             get_examples("basic_model.conf"),
@@ -103,3 +125,15 @@ class TestFastEnforcer(TestCaseBase):
 
         self.assertTrue(e.enforce("alice", "data1", "read"))
         self.assertFalse(e.enforce("alice2", "data1", "read"))
+
+    def test_enforce_with_effect_and_filter(self) -> None:
+        e = self.get_enforcer(
+            get_examples("rbac_with_deny_model.conf"),
+            StringAdapter("p, x, data1, read, deny\np, y, data2, read, allow"),
+            [1, 2],
+        )
+
+        # the filtered rules have the same size but not the same effects
+        self.assertFalse(e.enforce("x", "data1", "read"))
+        self.assertTrue(e.enforce("y", "data2", "read"))
+        self.assertFalse(e.enforce("x", "data1", "read"))
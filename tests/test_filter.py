@@ -94,6 +94,60 @@ class TestFilteredFileAdapter(TestCase):
         self.assertTrue(e.has_policy(["admin", "domain1", "data1", "read"]))
         self.assertTrue(e.has_policy(["admin", "domain2", "data2", "read"]))
 
+    def test_increment_filtered_policy_skips_loaded_rules(self):
+        adapter = FilteredFileAdapter(get_examples("rbac_with_domains_policy.csv"))
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), adapter)
+        filter = Filter()
+        filter.P = ["", "domain1"]
+        filter.G = ["", "", "domain1"]
+        e.load_filtered_policy(filter)
+
+        filter.P = ["admin"]
+        filter.G = ["", "", "domain2"]
+        added = e.load_increment_filtered_policy(filter)
+        self.assertEqual(
+            added,
+            {
+                "p": [["admin", "domain2", "data2", "read"], ["admin", "domain2", "data2", "write"]],
+                "g": [["bob", "admin", "domain2"]],
+            },
+        )
+        self.assertEqual(len(e.get_policy()), 4)
+        self.assertTrue(e.enforce("alice", "domain1", "data1", "read"))
+        self.assertTrue(e.enforce("bob", "domain2", "data2", "write"))
+
+        self.assertEqual(e.load_increment_filtered_policy(filter), {})
+        self.assertEqual(len(e.get_policy()), 4)
+
+    def test_increment_filtered_policy_keeps_priority(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "priority_policy.csv")
+            with open(path, "w") as file:
+                file.write("p, 10, alice, data1, read, allow\n")
+                file.write("p, 5, bob, data1, read, deny\n")
+                file.write("p, 1, alice, data1, read, deny\n")
+
+            e = casbin.Enforcer(get_examples("priority_model_explicit.conf"), FilteredFileAdapter(path))
+            filter = Filter()
+            filter.P = ["", "alice", "", "", "allow"]
+            filter.G = []
+            e.load_filtered_policy(filter)
+            self.assertTrue(e.enforce("alice", "data1", "read"))
+
+            filter.P = ["", "", "", "", "deny"]
+            e.load_increment_filtered_policy(filter)
+            self.assertEqual(
+                e.get_policy(),
+                [
+                    ["1", "alice", "data1", "read", "deny"],
+                    ["5", "bob", "data1", "read", "deny"],
+                    ["10", "alice", "data1", "read", "allow"],
+                ],
+            )
+            self.assertFalse(e.enforce("alice", "data1", "read"))
+
     def test_filtered_policy_invalid_filter(self):
         adapter = FilteredFileAdapter(get_examples("rbac_with_domains_policy.csv"))
         e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), adapter)
@@ -315,3 +369,41 @@ class TestFilteredFileAdapter(TestCase):
                 os.unlink(temp_path)
             except OSError:
                 pass
+
+    def test_load_filtered_policy_with_index(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "policy.csv")
+            with open(path, "w") as file:
+                file.write("# tenants\n")
+                for i in range(50):
+                    file.write("p, admin, domain%d, data%d, read\n" % (i, i))
+                    file.write("g, user%d, admin, domain%d\n" % (i, i))
+                file.write("p, admin, domain1, data1, write")
+
+            filters = []
+            for p, g in [(["", "domain1"], ["", "", "domain1"]), (["admin", "domain7"], []), (["", "nowhere"], [])]:
+                filter = Filter()
+                filter.P = p
+                filter.G = g
+                filters.append(filter)
+
+            adapter = FilteredFileAdapter(path, use_index=True)
+            for filter in filters:
+                e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), adapter)
+                e.load_filtered_policy(filter)
+                expected = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), FilteredFileAdapter(path))
+                expected.load_filtered_policy(filter)
+                self.assertEqual(e.get_policy(), expected.get_policy())
+                self.assertEqual(e.get_grouping_policy(), expected.get_grouping_policy())
+            self.assertTrue(os.path.isfile(path + ".idx"))
+
+            # the sidecar is rebuilt when the policy file changes
+            with open(path, "a") as file:
+                file.write("\np, admin, domain1, data9, read")
+            e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), FilteredFileAdapter(path, use_index=True))
+            e.load_filtered_policy(filters[0])
+            self.assertTrue(e.has_policy(["admin", "domain1", "data9", "read"]))
+            self.assertTrue(e.enforce("user1", "domain1", "data1", "write"))
+            self.assertFalse(e.has_policy(["admin", "domain2", "data2", "read"]))
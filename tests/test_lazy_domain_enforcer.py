@@ -0,0 +1,105 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+import casbin
+from casbin.persist.adapters import FilteredFileAdapter
+from tests.test_enforcer import get_examples
+
+
+class TestLazyDomainEnforcer(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "tenants.csv")
+        with open(self.path, "w") as file:
+            for i in range(10):
+                file.write("p, admin, domain%d, data%d, read\n" % (i, i))
+                file.write("g, user%d, admin, domain%d\n" % (i, i))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_enforcer(self, **kwargs):
+        return casbin.LazyDomainEnforcer(
+            get_examples("rbac_with_domains_model.conf"), FilteredFileAdapter(self.path), **kwargs
+        )
+
+    def test_load_on_demand(self):
+        e = self.get_enforcer()
+        self.assertEqual(e.get_enforcer().get_policy(), [])
+
+        self.assertTrue(e.enforce("user1", "domain1", "data1", "read"))
+        self.assertFalse(e.enforce("user1", "domain2", "data2", "read"))
+        self.assertTrue(e.enforce("user1", "domain1", "data1", "read"))
+        self.assertEqual(e.get_loaded_domains(), ["domain2", "domain1"])
+        self.assertEqual(
+            e.get_enforcer().get_policy(),
+            [["admin", "domain1", "data1", "read"], ["admin", "domain2", "data2", "read"]],
+        )
+        self.assertEqual(
+            e.get_metrics(), {"hits": 1, "misses": 2, "loads": 2, "evictions": 0, "domains": 2, "rules": 4}
+        )
+
+    def test_eviction(self):
+        e = self.get_enforcer(max_domains=2)
+        for i in range(4):
+            self.assertTrue(e.enforce("user%d" % i, "domain%d" % i, "data%d" % i, "read"))
+
+        self.assertEqual(e.get_loaded_domains(), ["domain2", "domain3"])
+        self.assertEqual(
+            e.get_enforcer().get_policy(),
+            [["admin", "domain2", "data2", "read"], ["admin", "domain3", "data3", "read"]],
+        )
+        self.assertEqual(e.get_enforcer().get_roles_for_user_in_domain("user0", "domain0"), [])
+        self.assertEqual(e.get_metrics()["evictions"], 2)
+
+        # evicted domains are loaded again when needed
+        self.assertTrue(e.enforce("user0", "domain0", "data0", "read"))
+        self.assertTrue(e.evict_domain("domain0"))
+        self.assertFalse(e.evict_domain("domain0"))
+        self.assertEqual(e.get_loaded_domains(), ["domain3"])
+
+    def test_rule_budget(self):
+        e = self.get_enforcer(max_rules=4)
+        for i in range(3):
+            e.enforce("user%d" % i, "domain%d" % i, "data%d" % i, "read")
+        self.assertEqual(e.get_loaded_domains(), ["domain1", "domain2"])
+        self.assertEqual(e.get_metrics()["rules"], 4)
+
+    def test_concurrent_enforce(self):
+        e = self.get_enforcer(max_domains=3)
+        errors = []
+
+        def worker(offset):
+            for n in range(50):
+                i = (n + offset) % 10
+                if not e.enforce("user%d" % i, "domain%d" % i, "data%d" % i, "read"):
+                    errors.append(i)
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(e.get_loaded_domains()), 3)
+
+    def test_model_without_domain(self):
+        with self.assertRaises(ValueError):
+            casbin.LazyDomainEnforcer(get_examples("rbac_model.conf"), FilteredFileAdapter(self.path))
@@ -19,6 +19,47 @@ import casbin
 from tests.test_enforcer import get_examples, TestCaseBase
 
 
+class BatchRecordingAdapter(casbin.persist.adapters.FileAdapter):
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.calls = []
+
+    def add_policies(self, sec, ptype, rules):
+        self.calls.append(("add_policies", sec, ptype, [list(rule) for rule in rules]))
+
+    def remove_policies(self, sec, ptype, rules):
+        self.calls.append(("remove_policies", sec, ptype, [list(rule) for rule in rules]))
+
+
+class FailingBatchAdapter(BatchRecordingAdapter):
+    def __init__(self, file_path, failing_call):
+        super().__init__(file_path)
+        self.failing_call = failing_call
+
+    def add_policies(self, sec, ptype, rules):
+        super().add_policies(sec, ptype, rules)
+        return self.fail()
+
+    def remove_policies(self, sec, ptype, rules):
+        super().remove_policies(sec, ptype, rules)
+        return self.fail()
+
+    def fail(self):
+        if len(self.calls) != self.failing_call:
+            return True
+        if self.failing_call == 2:
+            raise RuntimeError("cannot save")
+        return False
+
+
+class CountingWatcher:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
 class TestManagementApi(TestCaseBase):
     def get_enforcer(self, model=None, adapter=None):
         return casbin.Enforcer(
@@ -359,6 +400,88 @@ class TestManagementApi(TestCaseBase):
             ["user1", "user2", "user3"],
         )
 
+    def test_batch(self):
+        adapter = BatchRecordingAdapter(get_examples("rbac_policy.csv"))
+        e = self.get_enforcer(get_examples("rbac_model.conf"), adapter)
+        watcher = CountingWatcher()
+        e.set_watcher(watcher)
+
+        with e.batch() as batch:
+            batch.add_grouping_policy("bob", "data2_admin")
+            batch.add_grouping_policies([["eve", "data2_admin"], ["bob", "data2_admin"]])
+            batch.add_policy("eve", "data3", "read")
+            batch.remove_policy("alice", "data1", "read")
+            batch.remove_policy("alice", "data9", "read")
+
+        self.assertEqual(
+            adapter.calls,
+            [
+                ("add_policies", "g", "g", [["bob", "data2_admin"], ["eve", "data2_admin"]]),
+                ("add_policies", "p", "p", [["eve", "data3", "read"]]),
+                ("remove_policies", "p", "p", [["alice", "data1", "read"]]),
+            ],
+        )
+        self.assertEqual(watcher.updates, 1)
+        self.assertTrue(e.enforce("bob", "data2", "read"))
+        self.assertTrue(e.enforce("eve", "data2", "write"))
+        self.assertTrue(e.enforce("eve", "data3", "read"))
+        self.assertFalse(e.enforce("alice", "data1", "read"))
+
+        with e.batch() as batch:
+            batch.remove_grouping_policy("bob", "data2_admin")
+            batch.update_policy(["eve", "data3", "read"], ["eve", "data3", "write"])
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+        self.assertFalse(e.enforce("eve", "data3", "read"))
+        self.assertTrue(e.enforce("eve", "data3", "write"))
+        self.assertEqual(watcher.updates, 2)
+
+    def test_batch_discarded_on_error(self):
+        e = self.get_enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+
+        with self.assertRaises(ValueError):
+            with e.batch() as batch:
+                batch.add_grouping_policy("bob", "data2_admin")
+                raise ValueError()
+
+        self.assertFalse(e.has_grouping_policy("bob", "data2_admin"))
+        self.assertFalse(e.enforce("bob", "data2", "read"))
+
+        batch = e.batch()
+        batch.add_grouping_policy("alice", "data2_admin")
+        self.assertFalse(batch.commit())
+        with self.assertRaises(RuntimeError):
+            batch.add_policy("alice", "data1", "write")
+
+    def test_batch_undone_on_adapter_error(self):
+        for failing_call in (2, 3):
+            adapter = FailingBatchAdapter(get_examples("rbac_policy.csv"), failing_call)
+            e = self.get_enforcer(get_examples("rbac_model.conf"), adapter)
+
+            batch = e.batch()
+            batch.add_grouping_policy("bob", "data2_admin")
+            batch.remove_policy("alice", "data1", "read")
+            batch.add_policy("eve", "data3", "read")
+            if failing_call == 2:
+                with self.assertRaises(RuntimeError):
+                    batch.commit()
+            else:
+                self.assertFalse(batch.commit())
+
+            # the changes saved before the failing one are undone in reverse order
+            saved = [
+                ("add_policies", "g", "g", [["bob", "data2_admin"]]),
+                ("remove_policies", "p", "p", [["alice", "data1", "read"]]),
+                ("add_policies", "p", "p", [["eve", "data3", "read"]]),
+            ][:failing_call]
+            undone = [
+                ("add_policies", "p", "p", [["alice", "data1", "read"]]),
+                ("remove_policies", "g", "g", [["bob", "data2_admin"]]),
+            ][3 - failing_call :]
+            self.assertEqual(adapter.calls, saved + undone)
+            self.assertFalse(e.has_grouping_policy("bob", "data2_admin"))
+            self.assertTrue(e.enforce("alice", "data1", "read"))
+            self.assertFalse(e.enforce("eve", "data3", "read"))
+
 
 class TestManagementApiSynced(TestManagementApi):
     def get_enforcer(self, model=None, adapter=None):
@@ -0,0 +1,105 @@
+# Copyright 2026 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+import casbin
+from casbin import util
+from tests.test_enforcer import get_examples
+
+
+class TestProcessPoolEnforcer(TestCase):
+    def test_batch_enforce(self):
+        e = casbin.Enforcer(get_examples("rbac_with_domains_model.conf"), get_examples("rbac_with_domains_policy.csv"))
+        e.enable_auto_save(False)
+        requests = [
+            (sub, dom, obj, act)
+            for sub in ["alice", "bob", "admin", "eve"]
+            for dom in ["domain1", "domain2"]
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+
+        with casbin.ProcessPoolEnforcer(e, processes=2, min_batch_size=1, chunk_size=5) as pool:
+            self.assertEqual(pool.batch_enforce(requests), e.batch_enforce(requests))
+            self.assertEqual(pool.get_version(), 1)
+
+            # the snapshot is reused until the policy changes
+            pool.batch_enforce(requests)
+            self.assertEqual(pool.get_version(), 1)
+
+            e.add_grouping_policy("eve", "admin", "domain2")
+            self.assertTrue(pool.batch_enforce([("eve", "domain2", "data2", "write")])[0])
+            self.assertEqual(pool.get_version(), 2)
+
+            e.remove_policy("admin", "domain2", "data2", "write")
+            self.assertFalse(pool.batch_enforce([("eve", "domain2", "data2", "write")])[0])
+            self.assertEqual(pool.get_version(), 3)
+
+    def test_matching_func(self):
+        e = casbin.Enforcer(get_examples("rbac_with_pattern_model.conf"), get_examples("rbac_with_pattern_policy.csv"))
+        e.add_named_matching_func("g2", util.key_match2)
+        requests = [("alice", "/book/1", "GET"), ("bob", "/pen/1", "GET"), ("bob", "/book/1", "GET")]
+
+        with casbin.ProcessPoolEnforcer(e, processes=1, min_batch_size=1) as pool:
+            self.assertEqual(pool.batch_enforce(requests), [True, True, False])
+
+    def test_functions(self):
+        e = casbin.Enforcer(
+            get_examples("rbac_with_domain_pattern_model.conf"), get_examples("rbac_with_domain_pattern_policy.csv")
+        )
+        e.add_named_domain_matching_func("g", util.key_match2)
+        requests = [
+            (sub, dom, obj, act)
+            for sub in ["alice", "bob"]
+            for dom in ["domain1", "domain2"]
+            for obj in ["data1", "data2"]
+            for act in ["read", "write"]
+        ]
+        with casbin.ProcessPoolEnforcer(e, processes=1, min_batch_size=1) as pool:
+            self.assertEqual(pool.batch_enforce(requests), e.batch_enforce(requests))
+            self.assertEqual(pool.get_version(), 1)
+
+        e = casbin.Enforcer(get_examples("keymatch_custom_model.conf"), get_examples("keymatch_policy.csv"))
+        e.add_function("keyMatchCustom", util.key_match2)
+        requests = [("alice", "/alice_data/resource1", "GET"), ("cathy", "/cathy_data", "GET"), ("bob", "/x", "GET")]
+        with casbin.ProcessPoolEnforcer(e, processes=1, min_batch_size=1) as pool:
+            self.assertEqual(pool.batch_enforce(requests), e.batch_enforce(requests))
+            self.assertEqual(pool.get_version(), 1)
+
+            # functions that cannot be pickled are evaluated in the current process
+            e.add_function("keyMatchCustom", lambda key1, key2: key1 == key2)
+            pool.refresh()
+            self.assertEqual(pool.batch_enforce(requests), e.batch_enforce(requests))
+            self.assertEqual(pool.get_version(), 1)
+
+    def test_custom_role_manager(self):
+        class CustomRoleManager(casbin.rbac.default_role_manager.RoleManager):
+            def has_link(self, name1, name2, *domain):
+                return name1 == "eve" or super().has_link(name1, name2, *domain)
+
+        e = casbin.Enforcer(get_examples("rbac_model.conf"), get_examples("rbac_policy.csv"))
+        e.set_role_manager(CustomRoleManager(10))
+        e.build_role_links()
+        requests = [("eve", "data2", "read"), ("alice", "data2", "read"), ("bob", "data1", "read")]
+        with casbin.ProcessPoolEnforcer(e, processes=1, min_batch_size=1) as pool:
+            self.assertEqual(pool.batch_enforce(requests), [True, True, False])
+            self.assertEqual(pool.get_version(), 0)
+
+    def test_small_batch(self):
+        e = casbin.Enforcer(get_examples("basic_model.conf"), get_examples("basic_policy.csv"))
+        pool = casbin.ProcessPoolEnforcer(e, processes=2)
+        self.assertEqual(pool.batch_enforce([("alice", "data1", "read")]), [True])
+        self.assertEqual(pool.get_version(), 0)
+        pool.close()